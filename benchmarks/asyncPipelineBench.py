@@ -0,0 +1,64 @@
+__author__ = 'aliaksandr'
+
+import asyncio
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from benchmarks.corpus import makeUris
+from src.asyncPipeline import ParsePipeline
+from src.uriParser import parse
+
+"""
+    Parses a burst of URIs in an event loop: all of them in one synchronous loop,
+    and with the ParsePipeline inline, in a thread pool and in a process pool.
+    Reports the URIs/s and the longest stall of a 1ms ticker task running
+    in the same loop.
+    Usage: python -m benchmarks.asyncPipelineBench [count] [batchSize]
+"""
+
+
+async def _ticker(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def _measure(name, uris, consume):
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.get_running_loop().create_task(_ticker(lags, stop))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    count = await consume()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    print('%-10s %10.0f uris/s   max loop stall %8.1f ms' % (name, count / elapsed, max(lags) * 1000))
+
+
+async def _pipeline(uris, batchSize, executor=None):
+    count = 0
+    async for _ in ParsePipeline(batchSize, executor=executor).parse(uris):
+        count += 1
+    return count
+
+
+async def _run(uris, batchSize):
+    async def synchronous():
+        return len([parse(uri) for uri in uris])
+    await _measure('sync', uris, synchronous)
+    await _measure('inline', uris, lambda: _pipeline(uris, batchSize))
+    with ThreadPoolExecutor(2) as executor:
+        await _measure('threads', uris, lambda: _pipeline(uris, batchSize, executor))
+    with ProcessPoolExecutor(2) as executor:
+        await _measure('processes', uris, lambda: _pipeline(uris, batchSize, executor))
+
+
+def main(count=200000, batchSize=1000):
+    asyncio.run(_run(makeUris(count), batchSize))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
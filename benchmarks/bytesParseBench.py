@@ -0,0 +1,66 @@
+__author__ = 'aliaksandr'
+
+import sys
+import time
+
+from benchmarks.corpus import makeUris
+from src.uriParser import parse
+
+"""
+    Compares parsing URIs received as bytes by decoding them to str first
+    against parsing the bytes directly, and request lines received in a buffer
+    by decoding the URI slice against parsing a memoryview of it in place.
+    The host and the path of every URI are read. Three inputs: the short ASCII
+    URIs of the corpus, the same URIs with a long query and with non-ASCII
+    paths. Best of five interleaved runs.
+    Usage: python -m benchmarks.bytesParseBench [count]
+"""
+
+
+def loop(func, items):
+    def run():
+        for item in items:
+            parsed = func(item)
+            parsed.host
+            parsed.path
+    return run
+
+
+def compare(title, items, variants, repeat=5):
+    best = dict((name, float('inf')) for name, _ in variants)
+    for _ in range(repeat):
+        for name, func in variants:
+            run = loop(func, items)
+            start = time.perf_counter()
+            run()
+            best[name] = min(best[name], time.perf_counter() - start)
+    baseline = best[variants[0][0]]
+    print(title)
+    for name, _ in variants:
+        print('    %-22s %10.0f uris/s   x%.2f' % (name, len(items) / best[name], baseline / best[name]))
+
+
+def main(count=100000):
+    uris = makeUris(count)
+    inputs = [
+        ('short ASCII', uris),
+        ('long query', [uri + ('&' if '?' in uri else '?') + '&'.join('k%d=v%d' % (i, i) for i in range(150))
+                        for uri in uris[:count // 10]]),
+        ('non-ASCII path', [uri.replace('/', '/caf\xe9-мир/', 3) for uri in uris]),
+    ]
+    for title, texts in inputs:
+        lines = [text.encode('utf-8') for text in texts]
+        compare(title + ', bytes', lines, [
+            ('decode + str', lambda line: parse(line.decode('utf-8'))),
+            ('bytes -> memoryview', parse),
+            ('bytes -> bytes', lambda line: parse(line, True)),
+        ])
+        requests = [(memoryview(b'GET ' + line + b' HTTP/1.1'), len(line) + 4) for line in lines]
+        compare(title + ', request line buffer', requests, [
+            ('decode slice + str', lambda request: parse(str(request[0][4:request[1]], 'utf-8'))),
+            ('memoryview in place', lambda request: parse(request[0][4:request[1]])),
+        ])
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
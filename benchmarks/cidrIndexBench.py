@@ -0,0 +1,72 @@
+__author__ = 'aliaksandr'
+
+import ipaddress
+import random
+import sys
+import time
+
+from src.batchParser import parseMany
+from src.cidrIndex import CidrIndex
+
+"""
+    Finds the network containing the host of every URI: CidrIndex.lookupMany over
+    a parsed batch against a loop over ipaddress.ip_network objects.
+    The loop is timed on the first 200 URIs only.
+    Usage: python -m benchmarks.cidrIndexBench [networks] [uris]
+"""
+
+
+def makeNetworks(count, rnd):
+    return ['%d.%d.%d.0/%d' % (rnd.randint(1, 223), rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(8, 24))
+            for _ in range(count)]
+
+
+def makeUris(count, rnd):
+    uris = []
+    for _ in range(count):
+        if rnd.random() < 0.1:
+            uris.append('http://[2001:db8::%x]:8080/path' % rnd.randint(0, 65535))
+        else:
+            uris.append('http://%d.%d.%d.%d/path?id=1' % tuple(rnd.randint(1, 223) for _ in range(4)))
+    return uris
+
+
+def linear(networks, hosts):
+    result = []
+    for host in hosts:
+        address = ipaddress.ip_address(host)
+        found = None
+        for network in networks:
+            if address.version == network.version and address in network:
+                found = network
+                break
+        result.append(found)
+    return result
+
+
+def main(networks=20000, count=200000):
+    rnd = random.Random(42)
+    cidrs = makeNetworks(networks, rnd)
+    batch = parseMany(makeUris(count, rnd))
+
+    start = time.perf_counter()
+    index = CidrIndex(cidrs)
+    index.lookup('0.0.0.0')
+    print('build:      %8.1f ms' % ((time.perf_counter() - start) * 1000))
+
+    start = time.perf_counter()
+    index.lookupMany(batch)
+    indexed = (time.perf_counter() - start) / count
+    print('CidrIndex:  %10.0f hosts/s' % (1 / indexed))
+
+    objects = [ipaddress.ip_network(cidr, strict=False) for cidr in cidrs]
+    hosts = batch.strings('host')[:200]
+    start = time.perf_counter()
+    linear(objects, hosts)
+    looped = (time.perf_counter() - start) / len(hosts)
+    print('ip_network: %10.0f hosts/s' % (1 / looped))
+    print('speedup:    x%.0f' % (looped / indexed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
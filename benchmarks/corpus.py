@@ -0,0 +1,61 @@
+__author__ = 'aliaksandr'
+
+import random
+
+"""
+    Deterministic synthetic URIs for the benchmarks
+"""
+
+_TLDS = ('com', 'org', 'net', 'io', 'co.uk', 'de')
+_WORDS = ('news', 'item', 'user', 'api', 'static', 'search', 'view', 'index', 'img', 'v1')
+
+
+def makeUris(count, seed=42):
+    rnd = random.Random(seed)
+    uris = []
+    for i in range(count):
+        uris.append('http://user%d@host%d.example.com:%d/path/%d/item%d?id=%d&ref=%d#section%d' % (
+            rnd.randint(0, 999), rnd.randint(0, 99999), rnd.randint(1024, 65535), i,
+            rnd.randint(0, 999), rnd.randint(0, 10 ** 6), rnd.randint(0, 999), rnd.randint(0, 9)))
+    return uris
+
+
+"""
+    Yields count URIs of a mix that covers the parser branches: plain http(s)
+    URIs, userinfo and ports, IPv4 and IPv6 hosts, long queries, fragments,
+    relative references and non-http schemes. The same seed gives the same
+    URIs, so sizes from 1k to 10M can be generated without keeping them.
+"""
+def iterCorpus(count, seed=42):
+    rnd = random.Random(seed)
+    randint = rnd.randint
+    choice = rnd.choice
+    for i in range(count):
+        kind = i % 10
+        path = '/%s/%d/%s%d' % (choice(_WORDS), randint(0, 999), choice(_WORDS), randint(0, 99999))
+        host = 'www%d.site%d.%s' % (randint(0, 3), randint(0, 9999), choice(_TLDS))
+        if kind < 3:
+            yield 'http://%s%s' % (host, path)
+        elif kind == 3:
+            yield 'https://user%d:secret@%s:%d%s?id=%d' % (randint(0, 999), host, randint(1024, 65535), path, i)
+        elif kind == 4:
+            yield 'http://[2001:db8:%x::%x]:%d%s' % (randint(0, 65535), randint(0, 65535), randint(80, 9000), path)
+        elif kind == 5:
+            yield 'http://%d.%d.%d.%d%s?q=%d' % (randint(1, 223), randint(0, 255), randint(0, 255),
+                                                randint(1, 254), path, i)
+        elif kind == 6:
+            query = '&'.join('%s%d=%s%d' % (choice(_WORDS), index, choice(_WORDS), randint(0, 10 ** 6))
+                             for index in range(randint(8, 24)))
+            yield 'https://%s%s?%s' % (host, path, query)
+        elif kind == 7:
+            yield 'https://%s%s?page=%d#section%d' % (host, path, randint(1, 50), randint(0, 9))
+        elif kind == 8:
+            yield choice((path, '..' + path, '.' + path + '?ref=%d' % i, '?page=%d' % i, '#top%d' % i,
+                          '//cdn.%s%s' % (host, path)))
+        else:
+            yield choice(('ftp://files.%s%s' % (host, path), 'mailto:user%d@%s' % (i, host),
+                          'ws://%s:%d/socket' % (host, randint(1024, 65535))))
+
+
+def makeCorpus(count, seed=42):
+    return list(iterCorpus(count, seed))
@@ -0,0 +1,42 @@
+__author__ = 'aliaksandr'
+
+import sys
+import time
+
+from benchmarks.corpus import makeUris
+from src.uriDedup import UriBloomFilter, UriHashSet, uriHashes
+
+"""
+    Deduplicates a crawl frontier with a set of URI strings, a UriHashSet and a
+    UriBloomFilter (1% false positives): memory held and batch throughput.
+    Every URI is added twice, the hashing is timed separately.
+    Usage: python -m benchmarks.dedupBench [count] [batch]
+"""
+
+
+def main(count=500000, batch=10000):
+    uris = makeUris(count)
+    start = time.perf_counter()
+    hashes = uriHashes(uris)
+    print('canonical hash:  %10.0f uris/s' % (count / (time.perf_counter() - start)))
+
+    start = time.perf_counter()
+    seen = set()
+    for uri in uris + uris:
+        seen.add(uri)
+    elapsed = time.perf_counter() - start
+    memory = sys.getsizeof(seen) + sum(sys.getsizeof(uri) for uri in seen)
+    print('set of strings:  %10.0f adds/s %8.1f MB' % (2 * count / elapsed, memory / 2.0 ** 20))
+
+    for name, store in (('UriHashSet', UriHashSet(count)), ('UriBloomFilter', UriBloomFilter(count, 0.01))):
+        start = time.perf_counter()
+        for _ in range(2):
+            for offset in range(0, count, batch):
+                store.addHashes(hashes[offset:offset + batch])
+        elapsed = time.perf_counter() - start
+        table = store._table if name == 'UriHashSet' else store._words
+        print('%-16s %10.0f adds/s %8.1f MB' % (name + ':', 2 * count / elapsed, table.nbytes / 2.0 ** 20))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
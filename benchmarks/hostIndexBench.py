@@ -0,0 +1,86 @@
+__author__ = 'aliaksandr'
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.hostIndex import HostIndex
+
+"""
+    Builds a HostIndex from a blocklist of 1M domain rules, saves and loads it,
+    and matches hosts against it. The baseline is a loop of endswith checks,
+    timed over the first 10k rules only and scaled to the whole list.
+    Usage: python -m benchmarks.hostIndexBench [rules] [hosts]
+"""
+
+TLDS = ['com', 'net', 'org', 'io', 'de', 'co.uk', 'ru']
+
+
+def makeRules(count, rnd):
+    rules = []
+    for index in range(count):
+        label = ''.join(rnd.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rnd.randint(4, 12)))
+        rules.append(('.' if index % 3 == 0 else '') + label + '.' + rnd.choice(TLDS))
+    return rules
+
+
+def makeHosts(rules, count, rnd):
+    hosts = []
+    for _ in range(count):
+        if rnd.random() < 0.5:
+            hosts.append('www.' + rnd.choice(rules).lstrip('.'))
+        else:
+            hosts.append('cdn%d.unlisted-site.com' % rnd.randint(0, 999))
+    return hosts
+
+
+def endswithLoop(rules, hosts):
+    suffixes = [rule if rule.startswith('.') else '.' + rule for rule in rules]
+    result = []
+    for host in hosts:
+        found = None
+        for rule, suffix in zip(rules, suffixes):
+            if host == rule or host.endswith(suffix):
+                found = rule
+                break
+        result.append(found)
+    return result
+
+
+def main(count=1000000, lookups=200000):
+    rnd = random.Random(42)
+    rules = makeRules(count, rnd)
+    hosts = makeHosts(rules, lookups, rnd)
+
+    start = time.perf_counter()
+    index = HostIndex(rules)
+    print('build:   %8.2f s' % (time.perf_counter() - start))
+    handle, path = tempfile.mkstemp()
+    os.close(handle)
+    try:
+        start = time.perf_counter()
+        index.save(path)
+        print('save:    %8.2f s (%d MB)' % (time.perf_counter() - start, os.path.getsize(path) >> 20))
+        start = time.perf_counter()
+        loaded = HostIndex.load(path)
+        print('load:    %8.2f s' % (time.perf_counter() - start))
+    finally:
+        os.remove(path)
+
+    index = loaded
+    start = time.perf_counter()
+    index.lookupMany(hosts)
+    indexed = (time.perf_counter() - start) / lookups
+    print('index:   %10.0f hosts/s' % (1 / indexed))
+    sample = min(count, 10000)
+    start = time.perf_counter()
+    endswithLoop(rules[:sample], hosts[:100])
+    looped = (time.perf_counter() - start) / 100 * count / sample
+    print('endswith:%10.0f hosts/s' % (1 / looped))
+    print('speedup: x%.0f' % (looped / indexed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,45 @@
+__author__ = 'aliaksandr'
+
+import sys
+import time
+
+import src.instrumentation as instrumentation
+from benchmarks.corpus import makeUris
+from src.uriHandler import UriHandler
+
+"""
+    Measures UriHandler.getHost and normalize before the instrumentation is
+    enabled, while it is enabled and after it is disabled, best of three runs.
+    Usage: python -m benchmarks.instrumentationBench [count]
+"""
+
+
+def timeIt(name, uris, repeat=3):
+    handler = UriHandler()
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for uri in uris:
+            handler.getHost(uri)
+            handler.normalize(uri)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print('%-10s %10.0f uris/s' % (name, len(uris) / elapsed))
+    return elapsed
+
+
+def main(count=100000):
+    uris = makeUris(count)
+    before = timeIt('before', uris)
+    instrumentation.enable()
+    enabled = timeIt('enabled', uris)
+    instrumentation.disable()
+    after = timeIt('disabled', uris)
+    print('enabled:   x%.2f' % (enabled / before))
+    print('disabled:  x%.2f' % (after / before))
+    for name, stats in sorted(instrumentation.stats().items()):
+        print('%-10s %8d calls %8.1f regex/call %6.2f us/call' %
+              (name, stats.calls, stats.regex / stats.calls, stats.seconds / stats.calls * 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
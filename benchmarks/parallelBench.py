@@ -0,0 +1,35 @@
+__author__ = 'aliaksandr'
+
+import sys
+import time
+
+from benchmarks.corpus import makeUris
+from src.parallelParser import parseParallel
+from src.uriParser import parse
+
+"""
+    Measures parseParallel throughput with 1, 2, 4 and 8 worker processes
+    against a plain loop in the current process.
+    Usage: python -m benchmarks.parallelBench [count] [chunkSize]
+"""
+
+
+def timeIt(func):
+    start = time.perf_counter()
+    count = func()
+    return count / (time.perf_counter() - start)
+
+
+def main(count=1000000, chunkSize=10000):
+    uris = makeUris(count)
+    serial = timeIt(lambda: sum(1 for uri in uris if parse(uri)))
+    print('serial:            %10.0f uris/s' % serial)
+    for workers in (1, 2, 4, 8):
+        for ordered in (True, False):
+            rate = timeIt(lambda: sum(1 for _ in parseParallel(uris, workers, chunkSize, ordered)))
+            print('%d workers %-9s %10.0f uris/s  x%.2f' % (
+                workers, 'ordered' if ordered else 'unordered', rate, rate / serial))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,78 @@
+__author__ = 'aliaksandr'
+
+import random
+import re
+import sys
+import time
+
+from src.pathRouter import PathRouter
+
+"""
+    Dispatches paths against 5k route templates: PathRouter against trying
+    one compiled regex per route until one matches.
+    Usage: python -m benchmarks.pathRouterBench [routes] [paths]
+"""
+
+RESOURCES = ['users', 'orders', 'items', 'carts', 'invoices', 'products', 'reviews', 'sessions']
+
+
+def makeRoutes(count, rnd):
+    routes = set()
+    while len(routes) < count:
+        segments = ['api', 'v%d' % rnd.randint(1, 5), 'svc%d' % rnd.randint(0, count // 20)]
+        for depth in range(rnd.randint(1, 3)):
+            segments.append(rnd.choice(RESOURCES) + str(depth))
+            if rnd.random() < 0.6:
+                segments.append('{id%d}' % depth)
+        routes.add('/' + '/'.join(segments))
+    return sorted(routes)
+
+
+def makePaths(routes, count, rnd):
+    paths = []
+    for _ in range(count):
+        path = re.sub(r'\{[^}]+\}', lambda _: str(rnd.randint(1, 10 ** 6)), rnd.choice(routes))
+        paths.append(path if rnd.random() < 0.9 else path + '/unknown')
+    return paths
+
+
+def compileRegexes(routes):
+    return [(route, re.compile('^' + re.sub(r'\\\{([^}]+)\\\}', r'(?P<\1>[^/]+)', re.escape(route)) + '$'))
+            for route in routes]
+
+
+def linear(regexes, paths):
+    result = []
+    for path in paths:
+        found = None
+        for route, regex in regexes:
+            match = regex.match(path)
+            if match:
+                found = (route, match.groupdict())
+                break
+        result.append(found)
+    return result
+
+
+def main(count=5000, lookups=100000):
+    rnd = random.Random(42)
+    routes = makeRoutes(count, rnd)
+    paths = makePaths(routes, lookups, rnd)
+    router = PathRouter(routes)
+    regexes = compileRegexes(routes)
+    sample = paths[:1000]
+    assert [match and (match.template, match.params) for match in router.matchMany(sample)] == linear(regexes, sample)
+
+    start = time.perf_counter()
+    router.matchMany(paths)
+    trie = (time.perf_counter() - start) / len(paths)
+    print('PathRouter: %10.0f paths/s' % (1 / trie))
+    start = time.perf_counter()
+    linear(regexes, sample)
+    scan = (time.perf_counter() - start) / len(sample)
+    print('regex scan: %10.0f paths/s' % (1 / scan))
+    print('speedup:    x%.0f' % (scan / trie))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,56 @@
+__author__ = 'aliaksandr'
+
+import random
+import sys
+import time
+from urllib.parse import parse_qsl, urlencode
+
+from src.queryCodec import decodeQuery, encodeQuery
+
+"""
+    Compares the query codec with urllib.parse.parse_qsl and urlencode on
+    tracking-style URLs with many parameters.
+    Usage: python -m benchmarks.queryCodecBench [params] [repeat]
+"""
+
+
+def makePairs(count, seed=42):
+    rnd = random.Random(seed)
+    pairs = []
+    for i in range(count):
+        value = rnd.choice(['%d' % rnd.randint(0, 10 ** 9), 'plain_value-%d' % i,
+                            'needs encoding %d/&' % i, 'caf\xe9 %d' % i])
+        pairs.append(('p%d' % i, value))
+    return pairs
+
+
+def timeIt(name, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print('%-24s %9.1f us' % (name, elapsed * 10 ** 6))
+    return elapsed
+
+
+def main(params=500, repeat=200):
+    pairs = makePairs(params)
+    query = urlencode(pairs)
+    assert encodeQuery(pairs, plus=True) == query
+    assert decodeQuery(query, separators='&').items() == parse_qsl(query, keep_blank_values=True)
+    last = pairs[-1][0]
+    first = pairs[0][0]
+
+    print('%d parameters, %d chars' % (params, len(query)))
+    ours = timeIt('encodeQuery', lambda: encodeQuery(pairs, plus=True), repeat)
+    theirs = timeIt('urlencode', lambda: urlencode(pairs), repeat)
+    print('encode speedup:          x%.2f' % (theirs / ours))
+    ours = timeIt('decodeQuery', lambda: decodeQuery(query, separators='&'), repeat)
+    theirs = timeIt('parse_qsl', lambda: parse_qsl(query, keep_blank_values=True), repeat)
+    print('decode speedup:          x%.2f' % (theirs / ours))
+    timeIt('lazy get (first key)', lambda: decodeQuery(query, separators='&', lazy=True).get(first), repeat)
+    timeIt('lazy get (last key)', lambda: decodeQuery(query, separators='&', lazy=True).get(last), repeat)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
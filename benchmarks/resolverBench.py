@@ -0,0 +1,49 @@
+__author__ = 'aliaksandr'
+
+import random
+import sys
+import time
+from urllib.parse import urljoin
+
+from src.uriResolver import Resolver
+
+"""
+    Resolves the links of a page with 5k links against its base URI:
+    one Resolver per page against urllib.parse.urljoin per link.
+    Usage: python -m benchmarks.resolverBench [links] [pages]
+"""
+
+BASE = 'https://www.example.com/news/2015/05/article-title.html?page=2'
+
+
+def makeLinks(count, seed=42):
+    rnd = random.Random(seed)
+    forms = ['/section/%d/index.html', 'item-%d.html', '../archive/%d/', './img/%d.png', '?page=%d',
+             '#comment-%d', '//cdn.example.net/static/%d.js', 'https://other.example.org/path/%d',
+             '../../tags/%d?sort=new#top', 'related/%d/../%d.html']
+    links = []
+    for _ in range(count):
+        form = rnd.choice(forms)
+        links.append(form % ((rnd.randint(0, 10 ** 6),) * form.count('%d')))
+    return links
+
+
+def timeIt(name, func, pages):
+    start = time.perf_counter()
+    for _ in range(pages):
+        func()
+    elapsed = (time.perf_counter() - start) / pages
+    print('%-12s %8.2f ms per page' % (name, elapsed * 1000))
+    return elapsed
+
+
+def main(links=5000, pages=20):
+    refs = makeLinks(links)
+    assert Resolver(BASE).resolveMany(refs) == [urljoin(BASE, ref) for ref in refs]
+    resolver = timeIt('Resolver', lambda: Resolver(BASE).resolveMany(refs), pages)
+    urllib = timeIt('urljoin', lambda: [urljoin(BASE, ref) for ref in refs], pages)
+    print('speedup:     x%.2f' % (urllib / resolver))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,37 @@
+__author__ = 'aliaksandr'
+
+import sys
+import tracemalloc
+
+from benchmarks.corpus import makeUris
+from src.uriParser import parse
+
+"""
+    Compares the memory held by the span based ParsedUri against the same
+    components materialized as tuples of strings.
+    Usage: python -m benchmarks.spanMemoryBench [count]
+"""
+
+
+def measure(uris, build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [build(uri) for uri in uris]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return after - before
+
+
+def main(count=100000):
+    uris = makeUris(count)
+    spans = measure(uris, parse)
+    strings = measure(uris, lambda uri: parse(uri).components())
+    print('uris:          %d' % count)
+    print('spans:         %d bytes (%.1f per uri)' % (spans, spans / count))
+    print('materialized:  %d bytes (%.1f per uri)' % (strings, strings / count))
+    print('ratio:         %.2f' % (strings / spans))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,35 @@
+__author__ = 'aliaksandr'
+
+import sys
+import time
+
+from benchmarks.corpus import makeUris
+from src.uriParser import parse
+
+"""
+    Measures the overhead of the strict validation over the lenient parsing
+    of the same (valid) URIs, best of the interleaved runs of both modes.
+    Usage: python -m benchmarks.strictParseBench [count] [repeat]
+"""
+
+
+def timeOnce(uris, strict):
+    start = time.perf_counter()
+    for uri in uris:
+        parse(uri, strict=strict)
+    return time.perf_counter() - start
+
+
+def main(count=200000, repeat=5):
+    uris = makeUris(count)
+    lenient = strict = float('inf')
+    for _ in range(repeat):
+        lenient = min(lenient, timeOnce(uris, False))
+        strict = min(strict, timeOnce(uris, True))
+    print('%-10s %10.0f uris/s' % ('lenient', count / lenient))
+    print('%-10s %10.0f uris/s' % ('strict', count / strict))
+    print('overhead:  x%.2f' % (strict / lenient))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,182 @@
+__author__ = 'aliaksandr'
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from benchmarks.corpus import iterCorpus
+from src.uriHandler import UriHandler
+from src.uriParser import UriValidationError, parse
+from src.surt import surtKeys
+from src.uriResolver import Resolver
+
+"""
+    Benchmark suite of the UriHandler hot paths over the synthetic corpus:
+    a microbenchmark per handler method and end-to-end batch benchmarks.
+    Every benchmark is the best of --repeat runs, reported in operations per second.
+    The results are written as JSON with the details of the machine, and
+    compared against a baseline file: the exit status is 1 if a benchmark is
+    slower than the baseline by more than --threshold (0.2 is 20%).
+    Absolute ops/s depend on the machine, so the results are compared relative
+    to the 'reference' benchmark, plain Python string and dict work that does
+    not use this package and is run in the same session; --absolute compares
+    the ops/s as they are, which only makes sense on the machine of the baseline.
+    Usage: python -m benchmarks.suite [--size N] [--output results.json]
+                                      [--baseline baseline.json] [--threshold 0.2]
+                                      [--absolute]
+"""
+
+REFERENCE = 'reference'
+
+BASE = 'https://www.example.com/news/2015/05/article.html?page=2'
+PARAMS = {'utm_source': 'bench', 'page': 3}
+
+
+def microBenchmarks(handler):
+    return [
+        ('parse', handler.parse),
+        ('getScheme', handler.getScheme),
+        ('getAuthority', handler.getAuthority),
+        ('getHost', handler.getHost),
+        ('getPort', handler.getPort),
+        ('getUserInformation', handler.getUserInformation),
+        ('getPath', handler.getPath),
+        ('getQuery', handler.getQuery),
+        ('getFragment', handler.getFragment),
+        ('appendQuery', lambda uri: handler.appendQuery(uri, PARAMS)),
+        ('replaceQuery', lambda uri: handler.replaceQuery(uri, PARAMS)),
+        ('replacePath', lambda uri: handler.replacePath(uri, '/new/path')),
+        ('normalize', handler.normalize),
+        ('getAbsoluteURI', lambda uri: handler.getAbsoluteURI(uri, BASE)),
+    ]
+
+
+def batchBenchmarks(handler):
+    return [
+        ('batch.components', lambda uris: [handler.parse(uri).components() for uri in uris]),
+        ('batch.normalizeMany', handler.normalizeMany),
+        ('batch.resolveMany', Resolver(BASE).resolveMany),
+        ('batch.strictParse', lambda uris: [_strictParse(uri) for uri in uris]),
+        ('batch.parseMany', handler.parseMany),
+        ('batch.surtKeys', lambda uris: surtKeys(handler.parseMany(uris))),
+    ]
+
+
+"""
+    machine independent work of about the size of a parse, splits the URI and
+    counts its characters in a dict
+"""
+def _reference(uri):
+    counts = {}
+    for part in uri.split('/'):
+        counts[part] = counts.get(part, 0) + len(part.lower())
+    return counts
+
+
+def machine():
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+            'machine': platform.machine(), 'processor': platform.processor(),
+            'platform': platform.platform(), 'cpus': os.cpu_count()}
+
+
+def _strictParse(uri):
+    try:
+        return parse(uri, strict=True)
+    except UriValidationError:
+        return None
+
+
+def timeBest(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(size, repeat, names=None):
+    handler = UriHandler()
+    uris = list(iterCorpus(size))
+    results = {}
+    for name, method in [(REFERENCE, _reference)] + microBenchmarks(handler):
+        if names and name not in names and name != REFERENCE:
+            continue
+
+        def loop(method=method):
+            for uri in uris:
+                method(uri)
+        results[name] = size / timeBest(loop, repeat)
+    for name, method in batchBenchmarks(handler):
+        if names and name not in names:
+            continue
+        results[name] = size / timeBest(lambda method=method: method(uris), repeat)
+    return results
+
+
+"""
+    returns the ratio of every benchmark of both results to its baseline,
+    divided by the ratio of the reference benchmark unless absolute is set
+"""
+def ratios(results, baseline, absolute=False):
+    scale = 1.0
+    if not absolute and REFERENCE in results and REFERENCE in baseline:
+        scale = results[REFERENCE] / baseline[REFERENCE]
+    return dict((name, results[name] / expected / scale)
+                for name, expected in baseline.items() if name in results and name != REFERENCE)
+
+
+"""
+    returns the list of (name, baseline, current, ratio) of the benchmarks
+    slower than the baseline by more than the threshold
+"""
+def compare(results, baseline, threshold, absolute=False):
+    regressions = []
+    for name, ratio in sorted(ratios(results, baseline, absolute).items()):
+        if ratio < 1 - threshold:
+            regressions.append((name, baseline[name], results[name], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='UriHandler benchmarks')
+    parser.add_argument('--size', type=int, default=10000, help='number of URIs of the corpus')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of every benchmark, the best one counts')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare against the results of this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown, 0.2 is 20%%')
+    parser.add_argument('--absolute', action='store_true',
+                        help='compare the ops/s as they are, not relative to the reference benchmark')
+    parser.add_argument('names', nargs='*', help='run only these benchmarks')
+    args = parser.parse_args(argv)
+
+    results = run(args.size, args.repeat, set(args.names))
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as source:
+            recorded = json.load(source)
+        baseline = recorded['results']
+        if args.absolute and recorded.get('machine') != machine():
+            print('WARNING: the baseline was recorded on another machine: %s' % recorded.get('machine'))
+    relative = ratios(results, baseline, args.absolute)
+    for name, opsPerSecond in sorted(results.items()):
+        line = '%-22s %12.0f ops/s' % (name, opsPerSecond)
+        if name in relative:
+            line += '   x%.2f of baseline' % relative[name]
+        print(line)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'machine': machine(), 'size': args.size, 'repeat': args.repeat, 'results': results},
+                      output, indent=2, sort_keys=True)
+            output.write('\n')
+    regressions = compare(results, baseline, args.threshold, args.absolute)
+    for name, expected, current, ratio in regressions:
+        print('REGRESSION %s: %.0f ops/s, baseline %.0f ops/s (x%.2f)' % (name, current, expected, ratio))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
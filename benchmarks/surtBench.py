@@ -0,0 +1,45 @@
+__author__ = 'aliaksandr'
+
+import random
+import sys
+import time
+
+from src.batchParser import parseMany
+from src.surt import surtKey, surtKeys
+
+"""
+    Computes SURT keys for a crawl-like corpus (many pages per host):
+    surtKey per URI against surtKeys over a parsed batch (best of three runs).
+    Usage: python -m benchmarks.surtBench [count] [hosts]
+"""
+
+
+def makeUris(count, hosts, seed=42):
+    rnd = random.Random(seed)
+    names = ['www.site%d.%s' % (index, rnd.choice(['com', 'org', 'net', 'co.uk'])) for index in range(hosts)]
+    uris = []
+    for index in range(count):
+        query = '?id=%d&lang=en&ref=%d' % (index, rnd.randint(0, 99)) if index % 4 == 0 else ''
+        uris.append('http://%s/section/%d/page%d.html%s' % (rnd.choice(names), rnd.randint(0, 99),
+                                                            rnd.randint(0, 9999), query))
+    return uris
+
+
+def main(count=500000, hosts=5000):
+    uris = makeUris(count, hosts)
+    start = time.perf_counter()
+    single = [surtKey(uri) for uri in uris]
+    elapsed = time.perf_counter() - start
+    print('surtKey:          %10.0f keys/s' % (count / elapsed))
+    batch = parseMany(uris)
+    elapsed = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        keys = surtKeys(batch)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print('surtKeys (batch): %10.0f keys/s' % (count / elapsed))
+    assert keys == single
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,54 @@
+__author__ = 'aliaksandr'
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import makeUris
+from src.uriIndex import UriIndex, writeIndex
+from src.uriParser import parse
+
+"""
+    Writes the URIs to an index file, then reads the host of random URIs
+    from the mapped index and by parsing the URIs again, and sums a column
+    of the offsets of the whole index.
+    Usage: python -m benchmarks.uriIndexBench [count] [lookups]
+"""
+
+
+def main(count=1000000, lookups=200000):
+    uris = makeUris(count)
+    handle, path = tempfile.mkstemp()
+    os.close(handle)
+    try:
+        start = time.perf_counter()
+        writeIndex(path, uris)
+        elapsed = time.perf_counter() - start
+        print('write      %10.0f uris/s  %6.1f MB' % (count / elapsed, os.path.getsize(path) / 1e6))
+        start = time.perf_counter()
+        index = UriIndex(path)
+        print('open       %10.2f ms' % ((time.perf_counter() - start) * 1000))
+        positions = [random.randrange(count) for _ in range(lookups)]
+
+        start = time.perf_counter()
+        hosts = [index.host(position) for position in positions]
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        parsed = [parse(uris[position]).host for position in positions]
+        reparsed = time.perf_counter() - start
+        assert hosts == parsed
+        print('index.host %10.0f lookups/s' % (lookups / indexed))
+        print('parse.host %10.0f lookups/s' % (lookups / reparsed))
+
+        start = time.perf_counter()
+        total = sum(int(index.lengths('path').sum()) for _ in range(10))
+        print('lengths    %10.0f uris/s (%d)' % (10 * count / (time.perf_counter() - start), total))
+        del index
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
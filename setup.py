@@ -0,0 +1,15 @@
+__author__ = 'aliaksandr'
+
+from setuptools import setup
+
+# the modules are imported as src.<module> throughout, so they are installed
+# as the top-level package src
+setup(
+    name='pythonUtils',
+    version='0.1',
+    description='URI parsing and processing utilities',
+    packages=['src'],
+    python_requires='>=3.7',
+    install_requires=['numpy'],
+    entry_points={'console_scripts': ['urihandler = src.cli:main']},
+)
@@ -0,0 +1,209 @@
+__author__ = 'aliaksandr'
+
+import asyncio
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from src.parallelParser import _parseChunk, _unpackChunk
+from src.uriParser import parse
+
+StageStats = namedtuple('StageStats', ['items', 'batches', 'seconds', 'maxLatency', 'itemsPerSecond'])
+
+STAGES = ('read', 'parse', 'emit')
+
+_END = object()
+_READ_SIZE = 1 << 16
+
+
+class ParsePipeline(object):
+    """
+        Parses a stream of URIs in an asyncio program without stalling the event loop.
+        The source is an async iterator of URIs, an asyncio.StreamReader with
+        one URI per line, or a plain iterable.
+        The URIs are gathered in micro-batches of at most batchSize URIs, a batch
+        is sent when it is full or maxDelay seconds after its first URI came.
+        Without an executor the batches are parsed in the event loop, which runs
+        the other tasks between two batches. With a thread or process pool
+        executor the batches are parsed there, up to queueSize at a time.
+        All the queues between the stages hold at most queueSize batches, so a
+        slow consumer stops the reading of the source (backpressure).
+        The ParsedUri objects are yielded in the input order.
+        With strict=True the URIs are parsed in the strict mode, the first
+        invalid one raises UriValidationError from the async iterator.
+    """
+
+    def __init__(self, batchSize=1000, maxDelay=0.01, executor=None, queueSize=4, strict=False):
+        if batchSize < 1 or queueSize < 1:
+            raise ValueError('batchSize and queueSize must be positive')
+        if maxDelay < 0:
+            raise ValueError('maxDelay must not be negative')
+        self.batchSize = batchSize
+        self.maxDelay = maxDelay
+        self.executor = executor
+        self.queueSize = queueSize
+        self.strict = strict
+        self._records = dict((stage, [0, 0, 0.0, 0.0]) for stage in STAGES)
+
+    """
+        Returns a dict of StageStats by stage, summed over all the runs of the pipeline:
+            read  - the URIs and batches read, seconds until the source ended,
+                    maxLatency is the longest time a batch took to fill
+            parse - the URIs and batches parsed, seconds spent parsing them
+                    (including the wait for the executor), maxLatency is the slowest batch
+            emit  - the URIs and batches yielded, seconds of the whole run, maxLatency
+                    is the longest time from the batch being filled to its first URI yielded
+    """
+    def stats(self):
+        return dict((stage, StageStats(items, batches, seconds, maxLatency, items / seconds if seconds else 0.0))
+                    for stage, (items, batches, seconds, maxLatency) in self._records.items())
+
+    """
+        async generator of the ParsedUri objects of the URIs of the source
+    """
+    async def parse(self, source):
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue(self.batchSize * self.queueSize)
+        batches = asyncio.Queue(self.queueSize)
+        results = asyncio.Queue(self.queueSize)
+        tasks = [loop.create_task(self._read(source, items)),
+                 loop.create_task(self._batch(items, batches)),
+                 loop.create_task(self._parse(loop, batches, results))]
+        started = time.perf_counter()
+        try:
+            while True:
+                entry = await results.get()
+                if entry is _END:
+                    return
+                if isinstance(entry, Exception):
+                    raise entry
+                filled, future = entry
+                parsed = await future
+                self._add('emit', len(parsed), time.perf_counter() - filled, 0.0)
+                for uri in parsed:
+                    yield uri
+        finally:
+            for task in tasks:
+                task.cancel()
+            while not results.empty():
+                entry = results.get_nowait()
+                if isinstance(entry, tuple):
+                    entry[1].cancel()
+            self._records['emit'][2] += time.perf_counter() - started
+
+    async def _read(self, source, items):
+        try:
+            if isinstance(source, asyncio.StreamReader):
+                source = _lines(source)
+            if hasattr(source, '__aiter__'):
+                async for uri in source:
+                    await items.put(uri)
+            else:
+                for uri in source:
+                    await items.put(uri)
+            await items.put(_END)
+        except Exception as error:
+            await items.put(error)
+
+    async def _batch(self, items, batches):
+        started = time.perf_counter()
+        while True:
+            item = await items.get()
+            first = time.perf_counter()
+            batch = []
+            if item is not _END and not isinstance(item, Exception):
+                batch.append(item)
+                item = await self._fill(items, batch, first + self.maxDelay)
+            if batch:
+                filled = time.perf_counter()
+                self._add('read', len(batch), filled - first, 0.0)
+                await batches.put((filled, batch))
+            if item is not None:
+                self._records['read'][2] += time.perf_counter() - started
+                await batches.put(item)
+                return
+
+    """
+        adds the URIs to the batch until it is full or the deadline passes,
+        returns the end marker or the error of the source if it came first
+    """
+    async def _fill(self, items, batch, deadline):
+        while len(batch) < self.batchSize:
+            if items.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                try:
+                    item = await asyncio.wait_for(items.get(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+            else:
+                item = items.get_nowait()
+            if item is _END or isinstance(item, Exception):
+                return item
+            batch.append(item)
+        return None
+
+    async def _parse(self, loop, batches, results):
+        while True:
+            entry = await batches.get()
+            if entry is _END or isinstance(entry, Exception):
+                await results.put(entry)
+                return
+            filled, batch = entry
+            if self.executor is not None:
+                await results.put((filled, loop.create_task(self._offload(loop, batch))))
+                continue
+            future = loop.create_future()
+            start = time.perf_counter()
+            try:
+                future.set_result(_parseBatch(batch, self.strict))
+            except Exception as error:
+                future.set_exception(error)
+            self._add('parse', len(batch), time.perf_counter() - start)
+            await results.put((filled, future))
+            # lets the other tasks of the loop run between two batches
+            await asyncio.sleep(0)
+
+    async def _offload(self, loop, batch):
+        start = time.perf_counter()
+        if isinstance(self.executor, ProcessPoolExecutor):
+            # only the packed offsets come back from the worker process
+            packed = await loop.run_in_executor(self.executor, _parseChunk, batch, self.strict)
+            parsed = list(_unpackChunk(batch, packed))
+        else:
+            parsed = await loop.run_in_executor(self.executor, _parseBatch, batch, self.strict)
+        self._add('parse', len(batch), time.perf_counter() - start)
+        return parsed
+
+    def _add(self, stage, items, latency, seconds=None):
+        record = self._records[stage]
+        record[0] += items
+        record[1] += 1
+        record[2] += latency if seconds is None else seconds
+        record[3] = max(record[3], latency)
+
+
+def _parseBatch(batch, strict):
+    return [parse(uri, strict=strict) for uri in batch]
+
+
+"""
+    async generator of the non blank lines of the reader, decoded as UTF-8,
+    the reader is read in blocks
+"""
+async def _lines(reader):
+    rest = b''
+    while True:
+        block = await reader.read(_READ_SIZE)
+        if not block:
+            break
+        lines = (rest + block).split(b'\n')
+        rest = lines.pop()
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line.decode('utf-8', 'replace')
+    rest = rest.strip()
+    if rest:
+        yield rest.decode('utf-8', 'replace')
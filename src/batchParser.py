@@ -0,0 +1,108 @@
+__author__ = 'aliaksandr'
+
+from array import array
+
+import numpy
+
+from src.uriParser import parse, ParsedUri, COMPONENTS
+
+_COLUMN = dict((name, index) for index, name in enumerate(COMPONENTS))
+
+
+class ParsedBatch(object):
+    """
+        Columnar result of parseMany.
+        All the URIs are concatenated into one buffer, uriStarts holds the
+        offset of every URI in that buffer (n + 1 values, the last one is the
+        total length) and spans is an (n, 18) int32 array with the (start, end)
+        offsets of every component relative to its URI, in the order of COMPONENTS.
+    """
+
+    def __init__(self, buffer, uriStarts, spans):
+        self.buffer = buffer
+        self.uriStarts = uriStarts
+        self.spans = spans
+        self._codes = None
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __getitem__(self, index):
+        return ParsedUri(self.uri(index), tuple(self.spans[index].tolist()))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def uri(self, index):
+        return self.buffer[self.uriStarts[index]:self.uriStarts[index + 1]]
+
+    """
+        returns the absolute (starts, ends) offsets of the component in the buffer
+    """
+    def column(self, component):
+        index = _COLUMN[component] * 2
+        base = self.uriStarts[:-1]
+        return base + self.spans[:, index], base + self.spans[:, index + 1]
+
+    def lengths(self, component):
+        index = _COLUMN[component] * 2
+        return self.spans[:, index + 1] - self.spans[:, index]
+
+    """
+        returns the component of every URI as a list of strings
+    """
+    def strings(self, component):
+        buffer = self.buffer
+        starts, ends = self.column(component)
+        return [buffer[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+    """
+        returns a boolean mask of the URIs whose component equals the value,
+        compared with vectorized operations over the code points of the buffer
+    """
+    def mask(self, component, value):
+        starts, ends = self.column(component)
+        result = (ends - starts) == len(value)
+        if not value:
+            return result
+        candidates = numpy.flatnonzero(result)
+        if not len(candidates):
+            return result
+        codes = self.codes()
+        expected = numpy.frombuffer(value.encode('utf-32-le'), dtype=numpy.uint32)
+        positions = starts[candidates, None] + numpy.arange(len(value))
+        result[candidates] = (codes[positions] == expected).all(axis=1)
+        return result
+
+    """
+        the buffer as an array of code points, offsets in the spans index it directly
+    """
+    def codes(self):
+        if self._codes is None:
+            self._codes = numpy.frombuffer(self.buffer.encode('utf-32-le'), dtype=numpy.uint32)
+        return self._codes
+
+
+"""
+    Parses every URI of the iterable and returns the columnar ParsedBatch.
+    Accepts lists, generators and NumPy string arrays.
+    With strict=True UriValidationError is raised for the first invalid URI,
+    see src.uriParser.parse
+"""
+def parseMany(uris, strict=False):
+    if isinstance(uris, numpy.ndarray):
+        if uris.dtype.kind == 'S':
+            uris = numpy.char.decode(uris, 'utf-8')
+        uris = uris.ravel().tolist()
+    parts = []
+    starts = array('q', [0])
+    spans = array('i')
+    total = 0
+    for uri in uris:
+        parts.append(uri)
+        total += len(uri)
+        starts.append(total)
+        spans.extend(parse(uri, strict=strict).spans())
+    spans = numpy.frombuffer(spans, dtype=numpy.int32).reshape(-1, len(COMPONENTS) * 2)
+    return ParsedBatch(''.join(parts), numpy.frombuffer(starts, dtype=numpy.int64), spans)
@@ -0,0 +1,177 @@
+__author__ = 'aliaksandr'
+
+import ipaddress
+import socket
+from bisect import bisect_right
+
+import numpy
+
+from src.batchParser import ParsedBatch
+from src.uriParser import ParsedUri
+
+
+class CidrIndex(object):
+    """
+        Index of IPv4 and IPv6 networks that finds the network containing a host.
+        networks is an iterable of CIDR strings (or ipaddress networks) or of
+        (network, value) pairs, the value is what the lookups return for the
+        hosts of that network (by default the network in CIDR notation).
+        When networks overlap the most specific one wins.
+        The networks are flattened into sorted disjoint intervals once, every
+        lookup is a binary search; the IPv4 intervals are also kept as NumPy
+        arrays, so lookupMany searches all the IPv4 hosts of a batch at once.
+    """
+
+    def __init__(self, networks=()):
+        self._networks = []
+        self._tables = None
+        for network in networks:
+            if isinstance(network, tuple):
+                self.add(*network)
+            else:
+                self.add(network)
+
+    """
+        adds a network, the index is rebuilt on the next lookup
+    """
+    def add(self, network, value=None):
+        network = ipaddress.ip_network(network, strict=False)
+        if value is None:
+            value = str(network)
+        first = int(network.network_address)
+        self._networks.append((network.version, first, first + network.num_addresses - 1, value))
+        self._tables = None
+
+    def __len__(self):
+        return len(self._networks)
+
+    """
+        returns the value of the network containing the host, or default.
+        host is a ParsedUri, a host string or an already packed (version, address)
+    """
+    def lookup(self, host, default=None):
+        packed = host if isinstance(host, tuple) else packHost(host)
+        if packed is None:
+            return default
+        starts, ends, values = self._table(packed[0])[:3]
+        index = bisect_right(starts, packed[1]) - 1
+        if index < 0 or packed[1] > ends[index]:
+            return default
+        return values[index]
+
+    def __contains__(self, host):
+        return self.lookup(host, _MISSING) is not _MISSING
+
+    """
+        returns the list of lookup results for a ParsedBatch or an iterable of
+        ParsedUri objects or host strings
+    """
+    def lookupMany(self, hosts, default=None):
+        versions, addresses = packHosts(hosts)
+        result = [default] * len(addresses)
+        ipv4 = numpy.flatnonzero(versions == 4)
+        starts, ends, values, startArray, endArray = self._table(4)
+        if len(ipv4) and values:
+            packed = numpy.array([addresses[index] for index in ipv4.tolist()], dtype=numpy.uint32)
+            found = numpy.searchsorted(startArray, packed, side='right') - 1
+            inside = (found >= 0) & (packed <= endArray[found])
+            for index, position in zip(ipv4[inside].tolist(), found[inside].tolist()):
+                result[index] = values[position]
+        starts, ends, values = self._table(6)[:3]
+        if values:
+            for index in numpy.flatnonzero(versions == 6).tolist():
+                address = addresses[index]
+                position = bisect_right(starts, address) - 1
+                if position >= 0 and address <= ends[position]:
+                    result[index] = values[position]
+        return result
+
+    def _table(self, version):
+        if self._tables is None:
+            starts, ends, values = _flatten([network for network in self._networks if network[0] == 4])
+            self._tables = {4: (starts, ends, values,
+                                numpy.array(starts, dtype=numpy.uint32), numpy.array(ends, dtype=numpy.uint32)),
+                            6: _flatten([network for network in self._networks if network[0] == 6])}
+        return self._tables[version]
+
+
+_MISSING = object()
+
+
+"""
+    turns nested and disjoint networks into sorted disjoint intervals,
+    every interval has the value of the most specific network covering it.
+    returns the lists of the starts, the ends and the values
+"""
+def _flatten(networks):
+    starts = []
+    ends = []
+    values = []
+
+    def emit(first, last, value):
+        if first <= last:
+            starts.append(first)
+            ends.append(last)
+            values.append(value)
+
+    # the enclosing networks come before the networks they contain
+    networks.sort(key=lambda network: (network[1], -network[2]))
+    stack = []
+    cursor = 0
+    for _, first, last, value in networks:
+        while stack and stack[-1][0] < first:
+            end, enclosing = stack.pop()
+            emit(cursor, end, enclosing)
+            cursor = end + 1
+        if stack:
+            emit(cursor, first - 1, stack[-1][1])
+        stack.append((last, value))
+        cursor = first
+    while stack:
+        end, enclosing = stack.pop()
+        emit(cursor, end, enclosing)
+        cursor = end + 1
+    return starts, ends, values
+
+
+"""
+    Decodes an IPv4 host or an IPv6 literal into (4, address) or (6, address),
+    the address is the integer value of the packed network order octets.
+    host is a ParsedUri or a host string, a domain name gives None
+"""
+def packHost(host):
+    if isinstance(host, ParsedUri):
+        host = host.host
+    # the parser only leaves a ':' in the host of an IPv6 literal
+    if ':' in host:
+        try:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, host.strip('[]')), 'big')
+        except (OSError, ValueError):
+            return None
+    if not host[:1].isdigit():
+        return None
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, host), 'big')
+    except (OSError, ValueError):
+        return None
+
+
+"""
+    Decodes the hosts of a ParsedBatch or of an iterable of ParsedUri objects
+    or host strings. Returns a uint8 array with the version of every host
+    (0 for a domain name) and the list of the addresses (0 for a domain name)
+"""
+def packHosts(hosts):
+    if isinstance(hosts, ParsedBatch):
+        hosts = hosts.strings('host')
+    versions = []
+    addresses = []
+    for host in hosts:
+        packed = packHost(host)
+        if packed is None:
+            versions.append(0)
+            addresses.append(0)
+        else:
+            versions.append(packed[0])
+            addresses.append(packed[1])
+    return numpy.array(versions, dtype=numpy.uint8), addresses
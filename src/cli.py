@@ -0,0 +1,148 @@
+__author__ = 'aliaksandr'
+
+import argparse
+import sys
+import time
+from itertools import islice
+
+"""
+    Command line tool that reads URIs, one per line, from the files or stdin
+    and writes the chosen components of every URI as TSV or JSON Lines:
+
+        urihandler -f host,path access.txt
+        urihandler -f normalized --format jsonl --workers 4 < uris.txt
+
+    The input is processed in chunks of lines, by worker processes with --workers,
+    and every chunk is written at once. Only argparse is imported at start up,
+    the parser, the normalizer, json and the process pool when they are needed.
+"""
+
+FIELDS = ('uri', 'scheme', 'separator', 'authority', 'userinfo',
+          'host', 'port', 'path', 'query', 'fragment', 'normalized')
+
+
+def _arguments():
+    parser = argparse.ArgumentParser(prog='urihandler', description='Extracts the components of URIs, one per line')
+    parser.add_argument('files', nargs='*', help='input files, stdin if none or -')
+    parser.add_argument('-f', '--fields', default='scheme,host,port,path,query,fragment',
+                        help='comma separated output fields: %s' % ', '.join(FIELDS))
+    parser.add_argument('--format', choices=('tsv', 'jsonl'), default='tsv', help='output format')
+    parser.add_argument('--header', action='store_true', help='write the field names first (tsv)')
+    parser.add_argument('-o', '--output', help='output file, stdout by default')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='worker processes')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='lines per chunk')
+    parser.add_argument('--strict', action='store_true', help='skip the URIs that do not follow RFC3986')
+    parser.add_argument('--stats', action='store_true', help='print the URIs/s to stderr at the end')
+    return parser
+
+
+def main(argv=None):
+    parser = _arguments()
+    args = parser.parse_args(argv)
+    fields = tuple(field.strip() for field in args.fields.split(',') if field.strip())
+    for field in fields:
+        if field not in FIELDS:
+            parser.error('unknown field: %r' % field)
+    if not fields:
+        parser.error('no fields')
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error('--workers and --chunk-size must be positive')
+
+    started = time.perf_counter()
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        if args.header and args.format == 'tsv':
+            output.write(('\t'.join(fields) + '\n').encode('utf-8'))
+        chunks = _chunks(_lines(args.files or ['-']), args.chunk_size)
+        task = (fields, args.format, args.strict)
+        count = invalid = 0
+        for data, uris, skipped in _process(chunks, task, args.workers):
+            output.write(data)
+            count += uris
+            invalid += skipped
+        output.flush()
+    except BrokenPipeError:
+        # the reader of stdout is gone, e.g. urihandler ... | head
+        return 1
+    finally:
+        if args.output:
+            output.close()
+    if args.stats:
+        elapsed = time.perf_counter() - started
+        message = '%d URIs in %.3fs, %.0f URIs/s' % (count, elapsed, count / elapsed if elapsed else 0.0)
+        if args.strict:
+            message += ', %d invalid skipped' % invalid
+        print(message, file=sys.stderr)
+    return 0
+
+
+def _lines(paths):
+    for path in paths:
+        if path == '-':
+            for line in sys.stdin.buffer:
+                yield line
+            continue
+        with open(path, 'rb') as source:
+            for line in source:
+                yield line
+
+
+def _chunks(lines, size):
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+"""
+    yields the (output bytes, URIs, invalid URIs) of every chunk in the input order
+"""
+def _process(chunks, task, workers):
+    if workers == 1:
+        for chunk in chunks:
+            yield _processChunk(chunk, *task)
+        return
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        # at most 2 * workers chunks in flight, the input is read lazily
+        for chunk in chunks:
+            pending.append(executor.submit(_processChunk, chunk, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _processChunk(lines, fields, format, strict):
+    from src.uriParser import UriValidationError, parse
+    normalize = None
+    if 'normalized' in fields:
+        from src.uriNormalizer import normalize
+    if format == 'jsonl':
+        import json
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+    rows = []
+    invalid = 0
+    for line in lines:
+        uri = line.decode('utf-8', 'surrogateescape').strip()
+        if not uri:
+            continue
+        try:
+            parsed = parse(uri, strict=strict)
+        except UriValidationError:
+            invalid += 1
+            continue
+        values = [normalize(uri) if field == 'normalized' else getattr(parsed, field) for field in fields]
+        if format == 'jsonl':
+            rows.append(dumps(dict(zip(fields, values))))
+        else:
+            rows.append('\t'.join(value.replace('\t', '%09') for value in values))
+    rows.append('')
+    return '\n'.join(rows).encode('utf-8', 'surrogateescape'), len(rows) - 1, invalid
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+__author__ = 'aliaksandr'
+
+import pickle
+
+from src.uriParser import ParsedUri
+
+_FORMAT = 'HostIndex/2'
+
+# the row of the suffixes that are only on the way to a rule,
+# None in the payload lists means no rule
+_PATH = 0
+
+# the kinds of the rules of a row, a bit each
+_EXACT = 1
+_WILDCARD = 2
+_BOTH = 4
+
+
+class HostIndex(object):
+    """
+        Matches hosts against domain rules and returns the payload of the rule.
+        A rule is one of:
+            example.com     - the host example.com only
+            *.example.com   - every subdomain of example.com, but not example.com
+            .example.com    - example.com and every subdomain
+        rules is an iterable of rules or of (rule, payload) pairs, by default
+        the payload is the rule itself. Hosts and rules are compared lowercase.
+        When several rules match the most specific one wins.
+        The index is a trie of the reversed labels stored flat: every node is
+        keyed by its domain suffix in one dict and points to its row in the
+        payload lists. A lookup walks the labels of the host from the right
+        and stops at the first suffix that is not in the trie, so its time
+        depends on the number of labels, not on the number of rules.
+    """
+
+    def __init__(self, rules=()):
+        self._nodes = {}
+        self._exact = [None]
+        self._wildcard = [None]
+        self._kinds = [0]
+        self._rules = 0
+        for rule in rules:
+            if isinstance(rule, tuple):
+                self.add(*rule)
+            else:
+                self.add(rule)
+
+    def add(self, rule, payload=None):
+        if payload is None:
+            payload = rule
+        domain = rule.lower()
+        exact = wildcard = True
+        kind = _BOTH
+        if domain.startswith('*.'):
+            domain = domain[2:]
+            exact = False
+            kind = _WILDCARD
+        elif domain.startswith('.'):
+            domain = domain[1:]
+        else:
+            wildcard = False
+            kind = _EXACT
+        if not domain:
+            raise ValueError('invalid domain rule: %r' % rule)
+        row = self._node(domain)
+        if not self._kinds[row] & kind:
+            self._kinds[row] |= kind
+            self._rules += 1
+        if exact:
+            self._exact[row] = payload
+        if wildcard:
+            self._wildcard[row] = payload
+
+    def _node(self, domain):
+        nodes = self._nodes
+        row = nodes.get(domain)
+        if row:
+            return row
+        row = len(self._exact)
+        nodes[domain] = row
+        self._exact.append(None)
+        self._wildcard.append(None)
+        self._kinds.append(0)
+        # the parents of the node up to the first one already in the trie
+        dot = domain.find('.')
+        while dot != -1:
+            suffix = domain[dot + 1:]
+            if suffix in nodes:
+                break
+            nodes[suffix] = _PATH
+            dot = domain.find('.', dot + 1)
+        return row
+
+    """
+        returns the number of rules, a rule added again is counted once
+    """
+    def __len__(self):
+        return self._rules
+
+    """
+        returns the payload of the most specific rule matching the host, or default.
+        host is a host string or a ParsedUri
+    """
+    def lookup(self, host, default=None):
+        if isinstance(host, ParsedUri):
+            host = host.host
+        host = host.lower()
+        nodes = self._nodes
+        wildcard = self._wildcard
+        found = default
+        end = len(host)
+        while True:
+            dot = host.rfind('.', 0, end)
+            row = nodes.get(host[dot + 1:])
+            if row is None:
+                return found
+            if dot == -1:
+                break
+            if wildcard[row] is not None:
+                found = wildcard[row]
+            end = dot
+        exact = self._exact[row]
+        if exact is not None:
+            return exact
+        return found
+
+    def __contains__(self, host):
+        return self.lookup(host, _MISSING) is not _MISSING
+
+    """
+        returns the list of lookup results for a ParsedBatch or an iterable of
+        ParsedUri objects or host strings
+    """
+    def lookupMany(self, hosts, default=None):
+        if hasattr(hosts, 'strings'):
+            hosts = hosts.strings('host')
+        lookup = self.lookup
+        return [lookup(host, default) for host in hosts]
+
+    """
+        writes the index to the file, load reads it back without adding the rules again
+    """
+    def save(self, path):
+        with open(path, 'wb') as output:
+            pickle.dump((_FORMAT, self._nodes, self._exact[1:], self._wildcard[1:], self._kinds[1:], self._rules),
+                        output, pickle.HIGHEST_PROTOCOL)
+
+    """
+        reads an index written by save. The file is unpickled, which can run
+        arbitrary code: load only the files you trust, for rules from other
+        sources build the index from the rules themselves
+    """
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as source:
+            data = pickle.load(source)
+        if not isinstance(data, tuple) or data[0] != _FORMAT:
+            raise ValueError('%s is not a saved HostIndex' % path)
+        index = cls()
+        index._nodes = data[1]
+        index._exact.extend(data[2])
+        index._wildcard.extend(data[3])
+        index._kinds.extend(data[4])
+        index._rules = data[5]
+        return index
+
+
+_MISSING = object()
@@ -0,0 +1,166 @@
+__author__ = 'aliaksandr'
+
+import functools
+import re
+import threading
+import time
+from collections import namedtuple
+
+from src.uriHandler import UriHandler
+
+MethodStats = namedtuple('MethodStats', ['calls', 'regex', 'seconds', 'lengths'])
+
+# the modules whose module level patterns are counted
+_MODULES = ('src.uriParser', 'src.uriNormalizer', 'src.queryCodec', 'src.queryRewriter',
+            'src.uriBuilder', 'src.uriResolver')
+_PATTERN = type(re.compile(''))
+
+_lock = threading.Lock()
+_regex = [0]
+_records = {}
+_originals = {}
+_patched = []
+_sink = [None]
+
+"""
+    Opt-in instrumentation of the public UriHandler methods:
+
+        import src.instrumentation as instrumentation
+        instrumentation.enable()
+        ...
+        instrumentation.stats()['getHost'].calls
+
+    enable replaces the methods of the UriHandler class by wrappers that count
+    the calls, the regex evaluations and the time of every method, and the lengths
+    of its first argument. disable puts the original functions back, so a handler
+    that is not instrumented runs exactly the code it runs without this module.
+    The regex evaluations are the calls of the module level patterns of the parser,
+    normalizer, query codec, query rewriter, builder and resolver, which are
+    replaced by counting proxies while enabled.
+    The regex evaluations and the time of a method include the ones of the methods
+    it calls, e.g. getHost includes parse. Concurrent calls in several threads add
+    their regex evaluations to each other.
+"""
+
+
+class _CountingPattern(object):
+    """
+        Proxy of a compiled pattern that counts its evaluations
+    """
+    __slots__ = ('pattern',)
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def __getattr__(self, name):
+        return getattr(self.pattern, name)
+
+
+def _counted(name):
+    def evaluate(self, *args, **kwargs):
+        _regex[0] += 1
+        return getattr(self.pattern, name)(*args, **kwargs)
+    evaluate.__name__ = name
+    return evaluate
+
+
+for _name in ('match', 'fullmatch', 'search', 'sub', 'subn', 'split', 'findall', 'finditer'):
+    setattr(_CountingPattern, _name, _counted(_name))
+
+
+"""
+    Turns the instrumentation on, sink is called after every instrumented call
+    with (method name, input length or None, seconds, regex evaluations).
+    Calling it again only replaces the sink
+"""
+def enable(sink=None):
+    _sink[0] = sink
+    if _originals:
+        return
+    for name, value in sorted(vars(UriHandler).items()):
+        if not name.startswith('_') and callable(value):
+            _originals[name] = value
+            setattr(UriHandler, name, _wrap(name, value))
+    for moduleName in _MODULES:
+        module = __import__(moduleName, fromlist=['_'])
+        for name, value in sorted(vars(module).items()):
+            if isinstance(value, _PATTERN):
+                counting = _CountingPattern(value)
+            elif isinstance(value, tuple) and any(isinstance(item, _PATTERN) for item in value):
+                # the grammars of the parser are tuples of patterns
+                counting = tuple(_CountingPattern(item) if isinstance(item, _PATTERN) else item for item in value)
+            else:
+                continue
+            _patched.append((module, name, value))
+            setattr(module, name, counting)
+
+
+"""
+    Turns the instrumentation off and restores the original methods and patterns,
+    the collected stats are kept until reset
+"""
+def disable():
+    for name, method in _originals.items():
+        setattr(UriHandler, name, method)
+    _originals.clear()
+    for module, name, value in _patched:
+        setattr(module, name, value)
+    del _patched[:]
+    _sink[0] = None
+
+
+def isEnabled():
+    return bool(_originals)
+
+
+def reset():
+    with _lock:
+        _records.clear()
+
+
+"""
+    Returns a snapshot of the stats: a dict of MethodStats by method name, for the
+    methods called since the last reset. lengths is the histogram of the input
+    lengths, a dict of counts by bucket: the bucket n holds the lengths below n
+    and at least n / 2 (0 holds the empty inputs)
+"""
+def stats():
+    with _lock:
+        return dict((name, MethodStats(calls, regex, seconds,
+                                       dict(((1 << bucket) if bucket else 0, count)
+                                            for bucket, count in enumerate(lengths) if count)))
+                    for name, (calls, regex, seconds, lengths) in _records.items())
+
+
+def _wrap(name, method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        regex = _regex[0]
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _record(name, args, time.perf_counter() - start, _regex[0] - regex)
+    return wrapper
+
+
+def _record(name, args, seconds, regex):
+    length = None
+    if args and isinstance(args[0], (str, bytes)):
+        length = len(args[0])
+    with _lock:
+        record = _records.get(name)
+        if record is None:
+            record = _records[name] = [0, 0, 0.0, []]
+        record[0] += 1
+        record[1] += regex
+        record[2] += seconds
+        if length is not None:
+            lengths = record[3]
+            bucket = length.bit_length()
+            if bucket >= len(lengths):
+                lengths.extend([0] * (bucket + 1 - len(lengths)))
+            lengths[bucket] += 1
+    sink = _sink[0]
+    if sink is not None:
+        sink(name, length, seconds, regex)
@@ -0,0 +1,106 @@
+__author__ = 'aliaksandr'
+
+import gzip
+import mmap
+import re
+import time
+from collections import namedtuple
+
+from src.uriHandler import UriHandler
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+LogStats = namedtuple('LogStats', ['lines', 'uris', 'skipped', 'bytes', 'seconds', 'mbPerSecond'])
+
+
+class LogReader(object):
+    """
+        Streams the URIs of an access log and yields them parsed as ParsedUri.
+        Plain files are memory-mapped and read line by line, gzip files are
+        decompressed as a stream, so the memory used does not depend on the file size.
+        The URI is either the whitespace delimited field number column of the line
+        (6 is the request target in the common/combined log format),
+        or the group 'uri' (or the first group) of the pattern.
+        Lines without the URI field are skipped.
+    """
+
+    def __init__(self, path, column=6, pattern=None, handler=None, encoding='utf-8'):
+        self.path = path
+        self.column = column
+        self.pattern = None
+        if pattern is not None:
+            if isinstance(pattern, str):
+                pattern = pattern.encode(encoding)
+            self.pattern = re.compile(pattern)
+        self.handler = handler or UriHandler()
+        self.encoding = encoding
+        self._lines = 0
+        self._uris = 0
+        self._skipped = 0
+        self._bytes = 0
+        self._seconds = 0.0
+
+    def __iter__(self):
+        started = time.perf_counter()
+        try:
+            with open(self.path, 'rb') as file:
+                if file.read(2) == _GZIP_MAGIC:
+                    file.seek(0)
+                    with gzip.GzipFile(fileobj=file) as stream:
+                        for parsed in self._parseLines(stream):
+                            yield parsed
+                    return
+                file.seek(0, 2)
+                if not file.tell():
+                    return
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for parsed in self._parseLines(iter(mapped.readline, b'')):
+                        yield parsed
+        finally:
+            self._seconds += time.perf_counter() - started
+
+    def _parseLines(self, lines):
+        extract = self._extractMatch if self.pattern is not None else self._extractColumn
+        parse = self.handler.parse
+        encoding = self.encoding
+        for line in lines:
+            self._lines += 1
+            self._bytes += len(line)
+            field = extract(line)
+            if not field:
+                self._skipped += 1
+                continue
+            self._uris += 1
+            yield parse(field.decode(encoding, 'replace'))
+
+    def _extractColumn(self, line):
+        fields = line.split(None, self.column + 1)
+        if len(fields) <= self.column:
+            return None
+        return fields[self.column]
+
+    def _extractMatch(self, line):
+        match = self.pattern.search(line)
+        if not match:
+            return None
+        if 'uri' in self.pattern.groupindex:
+            return match.group('uri')
+        if self.pattern.groups:
+            return match.group(1)
+        return match.group(0)
+
+    """
+        returns the counters of the lines read so far and the throughput in MB/s
+        of the (uncompressed) log data
+    """
+    def stats(self):
+        seconds = self._seconds
+        rate = self._bytes / seconds / 2 ** 20 if seconds else 0.0
+        return LogStats(self._lines, self._uris, self._skipped, self._bytes, seconds, rate)
+
+
+"""
+    Shortcut for iterating over LogReader(path, ...)
+"""
+def readLogUris(path, column=6, pattern=None, handler=None):
+    return iter(LogReader(path, column, pattern, handler))
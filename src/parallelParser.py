@@ -0,0 +1,71 @@
+__author__ = 'aliaksandr'
+
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+from src.uriParser import parse, ParsedUri
+
+_SPAN_COUNT = 18
+
+
+"""
+    Parses the URIs of the iterable in a pool of worker processes.
+    The input is split into chunks of chunkSize URIs, every worker sends back
+    only the packed int32 offsets of its chunk, the ParsedUri objects are
+    rebuilt over the strings the caller already holds.
+    Results are yielded in the input order, or in the order the chunks complete
+    if ordered is False.
+    At most 2 * workers chunks are in flight, so the input is consumed lazily.
+    With strict=True UriValidationError is raised for the first invalid URI
+    of the chunk that has it, see src.uriParser.parse
+"""
+def parseParallel(uris, workers=None, chunkSize=10000, ordered=True, strict=False):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunkSize < 1:
+        raise ValueError('workers and chunkSize must be positive')
+    uris = iter(uris)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        maxPending = 2 * workers
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < maxPending:
+                chunk = list(islice(uris, chunkSize))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append((chunk, executor.submit(_parseChunk, chunk, strict)))
+            if not pending:
+                return
+            if ordered:
+                chunk, future = pending.popleft()
+            else:
+                done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                for index, (chunk, future) in enumerate(pending):
+                    if future in done:
+                        del pending[index]
+                        break
+            for parsed in _unpackChunk(chunk, future.result()):
+                yield parsed
+
+
+"""
+    runs in the worker process, returns the offsets of all the URIs of the chunk as bytes
+"""
+def _parseChunk(chunk, strict=False):
+    spans = array('i')
+    for uri in chunk:
+        spans.extend(parse(uri, strict=strict).spans())
+    return spans.tobytes()
+
+
+def _unpackChunk(chunk, packed):
+    spans = array('i')
+    spans.frombytes(packed)
+    for index, uri in enumerate(chunk):
+        start = index * _SPAN_COUNT
+        yield ParsedUri(uri, spans[start:start + _SPAN_COUNT])
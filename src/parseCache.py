@@ -0,0 +1,88 @@
+__author__ = 'aliaksandr'
+
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+from src.uriParser import parse, ParsedUri
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'size', 'bytes'])
+
+_PARSED_SIZE = sys.getsizeof(ParsedUri('', (0,) * 18))
+
+
+class ParseCache(object):
+    """
+        Bounded LRU cache of ParsedUri objects keyed by the URI string.
+        The cache is limited by the number of entries, by the approximate number
+        of bytes held, or both (0 means no limit).
+        ParsedUri is an immutable tuple that raises AttributeError on any
+        assignment, so every caller gets the same cached instance and it is
+        safe to share between callers and threads.
+    """
+
+    def __init__(self, maxEntries=0, maxBytes=0, parser=parse):
+        if maxEntries < 0 or maxBytes < 0:
+            raise ValueError('cache limits must not be negative')
+        if not maxEntries and not maxBytes:
+            raise ValueError('either maxEntries or maxBytes must be set')
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self._parser = parser
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bytes = 0
+
+    """
+        returns the cached ParsedUri for the uri, parsing and storing it on a miss.
+        bytearray and memoryview are mutable, they are parsed but never cached
+    """
+    def get(self, uri):
+        if not isinstance(uri, (str, bytes)):
+            return self._parser(uri)
+        with self._lock:
+            parsed = self._entries.get(uri)
+            if parsed is not None:
+                self._entries.move_to_end(uri)
+                self._hits += 1
+                return parsed
+            self._misses += 1
+        # parsing happens outside of the lock, concurrent misses of the same
+        # uri may parse it twice but only one result is stored
+        parsed = self._parser(uri)
+        size = _entrySize(uri)
+        if self.maxBytes and size > self.maxBytes:
+            return parsed
+        with self._lock:
+            if uri not in self._entries:
+                self._entries[uri] = parsed
+                self._bytes += size
+                self._evict()
+        return parsed
+
+    def _evict(self):
+        entries = self._entries
+        while entries and ((self.maxEntries and len(entries) > self.maxEntries) or
+                           (self.maxBytes and self._bytes > self.maxBytes)):
+            uri, _ = entries.popitem(last=False)
+            self._bytes -= _entrySize(uri)
+            self._evictions += 1
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, len(self._entries), self._bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _entrySize(uri):
+    return sys.getsizeof(uri) + _PARSED_SIZE
@@ -0,0 +1,136 @@
+__author__ = 'aliaksandr'
+
+from collections import namedtuple
+
+from src.uriParser import ParsedUri
+
+RouteMatch = namedtuple('RouteMatch', ['template', 'payload', 'params'])
+
+
+class _Node(object):
+    __slots__ = ('static', 'param', 'wildcard', 'route')
+
+    def __init__(self):
+        self.static = {}
+        self.param = None
+        self.wildcard = None
+        self.route = None
+
+
+class PathRouter(object):
+    """
+        Matches paths against route templates made of '/' separated segments:
+            users       - a static segment
+            {id}        - a parameter, matches one segment
+            {rest*}, *  - a wildcard, matches the rest of the path (can be empty),
+                          it has to be the last segment
+        e.g. /api/v1/users/{id}/orders or /static/{file*}.
+        The templates are compiled into a trie of segments with static,
+        parameter and wildcard edges, a match walks it segment by segment,
+        so its time depends on the number of segments of the path and not
+        on the number of routes. A static segment is preferred to a parameter
+        and a parameter to a wildcard, the next edge is tried if the preferred
+        one leads to no route.
+    """
+
+    def __init__(self, routes=()):
+        self._root = _Node()
+        self._count = 0
+        for route in routes:
+            if isinstance(route, tuple):
+                self.add(*route)
+            else:
+                self.add(route)
+
+    """
+        adds the template, payload is returned with the matches (the template by default).
+        raises ValueError for a template that matches the same paths as an added one
+    """
+    def add(self, template, payload=None):
+        if payload is None:
+            payload = template
+        node = self._root
+        names = []
+        segments = _segments(template)
+        for position, segment in enumerate(segments):
+            if segment == '*' or (segment.startswith('{') and segment.endswith('*}')):
+                if position != len(segments) - 1:
+                    raise ValueError('wildcard has to be the last segment: %r' % template)
+                names.append(segment[1:-2] or None)
+                if node.wildcard is not None:
+                    raise ValueError('duplicate route: %r' % template)
+                node.wildcard = (template, payload, tuple(names))
+                self._count += 1
+                return self
+            if segment.startswith('{') and segment.endswith('}'):
+                names.append(segment[1:-1])
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                child = node.static.get(segment)
+                if child is None:
+                    child = node.static[segment] = _Node()
+                node = child
+        if node.route is not None:
+            raise ValueError('duplicate route: %r' % template)
+        node.route = (template, payload, tuple(names))
+        self._count += 1
+        return self
+
+    def __len__(self):
+        return self._count
+
+    """
+        returns the RouteMatch of the path with the parameters as a dict, or None.
+        path is a path string or a ParsedUri
+    """
+    def match(self, path):
+        if isinstance(path, ParsedUri):
+            path = path.path
+        segments = _segments(path)
+        values = []
+        route = _walk(self._root, segments, 0, values)
+        if route is None:
+            return None
+        template, payload, names = route
+        return RouteMatch(template, payload, dict((name, value) for name, value in zip(names, values) if name))
+
+    """
+        matches all the paths (or ParsedUri objects) of the iterable, returns a list
+    """
+    def matchMany(self, paths):
+        match = self.match
+        return [match(path) for path in paths]
+
+
+def _walk(node, segments, position, values):
+    if position == len(segments):
+        if node.route is not None:
+            return node.route
+        if node.wildcard is not None:
+            values.append('')
+            return node.wildcard
+        return None
+    segment = segments[position]
+    child = node.static.get(segment)
+    if child is not None:
+        route = _walk(child, segments, position + 1, values)
+        if route is not None:
+            return route
+    if node.param is not None and segment:
+        values.append(segment)
+        route = _walk(node.param, segments, position + 1, values)
+        if route is not None:
+            return route
+        values.pop()
+    if node.wildcard is not None:
+        values.append('/'.join(segments[position:]))
+        return node.wildcard
+    return None
+
+
+def _segments(path):
+    if path.startswith('/'):
+        return path[1:].split('/')
+    return path.split('/')
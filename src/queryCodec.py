@@ -0,0 +1,252 @@
+__author__ = 'aliaksandr'
+
+import re
+
+_UNRESERVED = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~'
+_PLAIN_RE = re.compile('[A-Za-z0-9._~-]*')
+_PERCENT_RUN_RE = re.compile('(?:%[0-9A-Fa-f]{2})+')
+
+# str.translate tables over the latin-1 view of the utf-8 bytes:
+# every octet but the unreserved ones becomes %XX
+_QUOTE_TABLE = dict((octet, '%%%02X' % octet) for octet in range(256) if chr(octet) not in _UNRESERVED)
+_QUOTE_PLUS_TABLE = dict(_QUOTE_TABLE)
+_QUOTE_PLUS_TABLE[ord(' ')] = '+'
+
+
+class QueryDict(object):
+    """
+        Ordered multidict of the query parameters, keeps every pair in the order
+        of the query, repeated keys included.
+        With lazy=True the query is split only as far as needed: get(key)
+        stops scanning at the first pair with that key.
+    """
+
+    def __init__(self, query='', separators='&;', unquote=True, plus=True, lazy=False):
+        self._query = query
+        self._pos = 0
+        self._pairs = []
+        self._index = {}
+        self._unquote = unquote
+        self._plus = plus
+        self._separators = separators
+        if len(separators) == 1:
+            self._next = _singleSeparator(separators)
+        else:
+            self._next = _anySeparator(separators)
+        if not lazy:
+            self._splitAll()
+
+    """
+        splits the whole query at once, the path taken when the query is not lazy
+    """
+    def _splitAll(self):
+        query = self._query
+        separators = self._separators
+        if len(separators) == 1:
+            parts = query.split(separators)
+        else:
+            for separator in separators[1:]:
+                if separator in query:
+                    query = query.replace(separator, separators[0])
+            parts = query.split(separators[0])
+        pairs = self._pairs
+        index = self._index
+        decode = self._unquote
+        plus = self._plus
+        for part in parts:
+            if not part:
+                continue
+            name, _, value = part.partition('=')
+            if decode and ('%' in part or (plus and '+' in part)):
+                name = unquote(name, plus)
+                value = unquote(value, plus)
+            pairs.append((name, value))
+            values = index.get(name)
+            if values is None:
+                index[name] = [value]
+            else:
+                values.append(value)
+        self._pos = len(query) + 1
+
+    """
+        splits the query until the pair with the key is found,
+        or to the end if key is None
+    """
+    def _scan(self, key):
+        query = self._query
+        end = len(query)
+        pos = self._pos
+        nextSeparator = self._next
+        pairs = self._pairs
+        index = self._index
+        while pos <= end:
+            stop = nextSeparator(query, pos)
+            if stop == -1:
+                stop = end
+            part = query[pos:stop]
+            pos = stop + 1
+            if not part:
+                continue
+            name, _, value = part.partition('=')
+            if self._unquote:
+                name = unquote(name, self._plus)
+                value = unquote(value, self._plus)
+            pairs.append((name, value))
+            if name in index:
+                index[name].append(value)
+            else:
+                index[name] = [value]
+            if name == key:
+                self._pos = pos
+                return
+        self._pos = pos
+
+    def _complete(self):
+        if self._pos <= len(self._query):
+            self._scan(None)
+
+    def get(self, key, default=None):
+        values = self._index.get(key)
+        if values is None:
+            if self._pos > len(self._query):
+                return default
+            self._scan(key)
+            values = self._index.get(key)
+            if values is None:
+                return default
+        return values[0]
+
+    def getAll(self, key):
+        self._complete()
+        return list(self._index.get(key, ()))
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        self._complete()
+        return len(self._pairs)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, QueryDict):
+            return self.items() == other.items()
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return 'QueryDict(%r)' % self.items()
+
+    """
+        returns the distinct keys in the order of their first appearance
+    """
+    def keys(self):
+        self._complete()
+        return list(self._index)
+
+    def items(self):
+        self._complete()
+        return list(self._pairs)
+
+    def values(self):
+        self._complete()
+        return [value for _, value in self._pairs]
+
+    """
+        returns a plain dict, the last value of a repeated key wins
+    """
+    def toDict(self):
+        self._complete()
+        return dict(self._pairs)
+
+
+_MISSING = object()
+
+
+def _singleSeparator(separator):
+    def find(query, pos):
+        return query.find(separator, pos)
+    return find
+
+
+def _anySeparator(separators):
+    pattern = re.compile('[%s]' % re.escape(separators))
+
+    def find(query, pos):
+        match = pattern.search(query, pos)
+        if match is None:
+            return -1
+        return match.start()
+    return find
+
+
+"""
+    Splits the query string into a QueryDict
+"""
+def decodeQuery(query, separators='&;', unquote=True, plus=True, lazy=False):
+    return QueryDict(query, separators, unquote, plus, lazy)
+
+
+"""
+    Builds the query string from a dict, a QueryDict or an iterable of (key, value) pairs.
+    A list or tuple value repeats the key for every item, other values are
+    converted with str(). With quote=True keys and values are percent-encoded,
+    plus=True encodes the space as '+'
+"""
+def encodeQuery(params, delimiter='&', quote=True, plus=False):
+    if hasattr(params, 'items'):
+        pairs = params.items()
+    else:
+        pairs = params
+    parts = []
+    append = parts.append
+    for key, value in pairs:
+        if isinstance(value, (list, tuple)):
+            values = value
+        else:
+            values = (value,)
+        for value in values:
+            if not isinstance(value, str):
+                value = str(value)
+            if quote:
+                append(quoteComponent(key, plus) + '=' + quoteComponent(value, plus))
+            else:
+                append(key + '=' + value)
+    return delimiter.join(parts)
+
+
+"""
+    percent-encodes everything but the unreserved characters of RFC3986
+"""
+def quoteComponent(text, plus=False):
+    if _PLAIN_RE.match(text).end() == len(text):
+        return text
+    return text.encode('utf-8').decode('latin-1').translate(_QUOTE_PLUS_TABLE if plus else _QUOTE_TABLE)
+
+
+"""
+    decodes the percent-encodings (as utf-8) and, with plus=True, '+' as space
+"""
+def unquote(text, plus=True):
+    if plus and '+' in text:
+        text = text.replace('+', ' ')
+    if '%' not in text:
+        return text
+    return _PERCENT_RUN_RE.sub(_decodeRun, text)
+
+
+def _decodeRun(match):
+    return bytes.fromhex(match.group(0).replace('%', '')).decode('utf-8', 'replace')
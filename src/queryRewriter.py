@@ -0,0 +1,121 @@
+__author__ = 'aliaksandr'
+
+import re
+
+from src.uriParser import parse
+
+_SEPARATOR_RE = re.compile('([&;])')
+
+TRACKING_PREFIXES = ('utm_',)
+TRACKING_PARAMETERS = ('fbclid', 'gclid', 'dclid', 'gclsrc', 'msclkid', 'yclid', 'igshid',
+                       'mc_cid', 'mc_eid', '_ga', '_gl', 'mkt_tok')
+
+
+class QueryRewriter(object):
+    """
+        Rewrites the query of URIs with a compiled set of rules:
+            drop - parameter names to remove
+            dropPrefixes - name prefixes to remove (e.g. 'utm_')
+            keepOnly - if set, every other parameter is removed
+            rename - {old name: new name}
+        drop and dropPrefixes are applied first, then keepOnly, then rename.
+        Names are compared as they are written in the URI, without decoding.
+        Every query is split once, the order and the separators of the kept
+        parameters do not change. If no rule matches the URI is returned as is.
+        hits counts how many parameters every rule matched.
+    """
+
+    def __init__(self, drop=(), dropPrefixes=(), keepOnly=None, rename=None):
+        self.drop = frozenset(drop)
+        self.dropPrefixes = tuple(dropPrefixes)
+        self.keepOnly = None if keepOnly is None else frozenset(keepOnly)
+        self.rename = dict(rename or {})
+        self.hits = {}
+        for name in self.drop:
+            self.hits['drop:' + name] = 0
+        for prefix in self.dropPrefixes:
+            self.hits['dropPrefix:' + prefix] = 0
+        for name in self.rename:
+            self.hits['rename:' + name] = 0
+        if self.keepOnly is not None:
+            self.hits['keepOnly'] = 0
+        # with keepOnly every query has to be checked, otherwise a query that
+        # does not mention any of the names is left alone without being split
+        self._detect = None
+        if self.keepOnly is None:
+            names = [re.escape(name) for name in sorted(self.drop | set(self.rename))]
+            names += [re.escape(prefix) + '[^=&;]*' for prefix in self.dropPrefixes]
+            if names:
+                self._detect = re.compile('(?<=[?&;])(?:%s)(?:[=&;]|$)' % '|'.join(names))
+
+    """
+        returns the uri with the rewritten query, or the uri itself if nothing matched
+    """
+    def rewrite(self, uri):
+        parsed = parse(uri)
+        queryStart = parsed.queryStart
+        queryEnd = parsed.queryEnd
+        if queryStart == queryEnd:
+            return uri
+        if self.keepOnly is None and (self._detect is None or
+                                      not self._detect.search(uri, queryStart, queryEnd)):
+            return uri
+        query = self._rewriteQuery(uri[queryStart:queryEnd])
+        if query is None:
+            return uri
+        if not query:
+            return uri[:queryStart - 1] + uri[queryEnd:]
+        return uri[:queryStart] + query + uri[queryEnd:]
+
+    """
+        rewrites all the URIs of the iterable lazily
+    """
+    def rewriteMany(self, uris):
+        rewrite = self.rewrite
+        for uri in uris:
+            yield rewrite(uri)
+
+    def _rewriteQuery(self, query):
+        pieces = _SEPARATOR_RE.split(query)
+        drop = self.drop
+        prefixes = self.dropPrefixes
+        keepOnly = self.keepOnly
+        rename = self.rename
+        hits = self.hits
+        kept = []
+        changed = False
+        for index in range(0, len(pieces), 2):
+            part = pieces[index]
+            name, equals, value = part.partition('=')
+            if name in drop:
+                hits['drop:' + name] += 1
+                changed = True
+                continue
+            if prefixes and name.startswith(prefixes):
+                for prefix in prefixes:
+                    if name.startswith(prefix):
+                        hits['dropPrefix:' + prefix] += 1
+                        break
+                changed = True
+                continue
+            if keepOnly is not None and name not in keepOnly:
+                hits['keepOnly'] += 1
+                changed = True
+                continue
+            if name in rename:
+                hits['rename:' + name] += 1
+                part = rename[name] + equals + value
+                changed = True
+            if kept:
+                kept.append(pieces[index - 1])
+            kept.append(part)
+        if not changed:
+            return None
+        return ''.join(kept)
+
+
+"""
+    QueryRewriter that removes the common analytics and click tracking parameters
+"""
+def trackingRewriter(drop=TRACKING_PARAMETERS, dropPrefixes=TRACKING_PREFIXES):
+    return QueryRewriter(drop=drop, dropPrefixes=dropPrefixes)
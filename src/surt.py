@@ -0,0 +1,119 @@
+__author__ = 'aliaksandr'
+
+import re
+
+from src.uriNormalizer import DEFAULT_PORTS
+from src.uriParser import parse
+
+_IPV4_RE = re.compile(r'[0-9]+(?:\.[0-9]+){3}')
+
+
+"""
+    Returns the SURT (Sort-friendly URI Reordering Transform) key of the URI:
+    the scheme, the userinfo and the fragment are dropped, the host is
+    lowercased, stripped of 'www.' and its labels are reversed, a port other
+    than the default one of the scheme is kept, and the query parameters are
+    sorted, e.g. http://www.Example.com/path?b=2&a=1 -> com,example)/path?a=1&b=2
+    All the pages of a site get keys with the same prefix.
+    IP addresses are not reversed, IPv6 literals keep their brackets.
+"""
+def surtKey(uri):
+    parsed = parse(uri)
+    return _prefixOf(parsed) + _surtPath(parsed.uri, parsed.pathStart, parsed.pathEnd,
+                                         parsed.queryStart, parsed.queryEnd)
+
+
+"""
+    Returns the list of the SURT keys of a ParsedBatch or of an iterable of URIs.
+    The host part of the key is computed once for every distinct text from the
+    scheme to the end of the authority, the batch offsets are read as columns
+"""
+def surtKeys(uris):
+    if not hasattr(uris, 'spans'):
+        return [surtKey(uri) for uri in uris]
+    buffer = uris.buffer
+    base = uris.uriStarts[:-1]
+    spans = uris.spans
+    columns = [(base + spans[:, index]).tolist() for index in (0, 5, 12, 13, 15)]
+    prefixes = {}
+    keys = []
+    append = keys.append
+    for schemeStart, authorityEnd, pathStart, pathEnd, queryEnd in zip(*columns):
+        authority = buffer[schemeStart:authorityEnd]
+        prefix = prefixes.get(authority)
+        if prefix is None:
+            prefix = prefixes[authority] = _prefixOf(parse(authority))
+        if pathEnd == queryEnd:
+            append(prefix + (buffer[pathStart:pathEnd] or '/'))
+        else:
+            append(prefix + _surtPath(buffer, pathStart, pathEnd, pathEnd + 1, queryEnd))
+    return keys
+
+
+"""
+    reverses the labels of the host as in a SURT key: www.example.com -> com,example
+"""
+def surtHost(host):
+    host = host.lower().rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    if ':' in host or _IPV4_RE.fullmatch(host):
+        return host
+    return ','.join(reversed(host.split('.')))
+
+
+"""
+    Inverse of surtKey, builds an URI from the key with the given scheme.
+    The dropped parts (www., userinfo, fragment, default port, parameter order) are not restored
+"""
+def surtToUri(key, scheme='http'):
+    end = key.find(')')
+    if end == -1:
+        raise ValueError('not a SURT key: %r' % key)
+    host = key[:end]
+    port = ''
+    if host.startswith('['):
+        close = host.find(']')
+        host, port = host[:close + 1], host[close + 1:]
+    else:
+        colon = host.find(':')
+        if colon != -1:
+            host, port = host[:colon], host[colon:]
+        if not _IPV4_RE.fullmatch(host):
+            host = '.'.join(reversed(host.split(',')))
+    return scheme + '://' + host + port + key[end + 1:]
+
+
+"""
+    Returns the sorted list of the (start, stop) key ranges that hold all the
+    keys of the domain (and of its subdomains), for range scans over stores
+    sorted by SURT key. A key k belongs to the domain if start <= k < stop
+    for one of the ranges.
+"""
+def surtRanges(domain, subdomains=True):
+    prefix = surtHost(domain)
+    ranges = [(prefix + ')', prefix + '*'), (prefix + ':', prefix + ';')]
+    if subdomains:
+        ranges.append((prefix + ',', prefix + '-'))
+    return sorted(ranges)
+
+
+def _prefixOf(parsed):
+    host = surtHost(parsed.host)
+    # the character before the host tells an IPv6 literal
+    if parsed.hostStart and parsed.uri.startswith('[', parsed.hostStart - 1):
+        host = '[' + host + ']'
+    port = parsed.port
+    if port and DEFAULT_PORTS.get(parsed.scheme.lower()) != port:
+        host += ':' + port
+    return host + ')'
+
+
+def _surtPath(uri, pathStart, pathEnd, queryStart, queryEnd):
+    path = uri[pathStart:pathEnd] or '/'
+    if queryStart == queryEnd:
+        return path
+    query = uri[queryStart:queryEnd]
+    if '&' in query:
+        query = '&'.join(sorted(query.split('&')))
+    return path + '?' + query
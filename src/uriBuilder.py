@@ -0,0 +1,161 @@
+__author__ = 'aliaksandr'
+
+from src.uriHandler import UriHandler
+from src.uriParser import _FRAGMENT_RE, _SCHEME_RE, parse
+
+_handler = UriHandler()
+
+
+class UriBuilder(object):
+    """
+        Mutable URI made of separate components: scheme, separator, authority,
+        path, query and fragment (query and fragment are None when there is no
+        '?' or '#'). The append* and replace* methods give the same result as the
+        UriHandler methods with the same name applied one after another, but
+        they change only the affected component and the URI is rendered once
+        by build().
+        In the few cases where an edit changes how the rest of the URI is split
+        (e.g. an authority that looks like a scheme) the URI is parsed again.
+        Leading whitespace of the initial URI is dropped.
+    """
+
+    def __init__(self, uri=''):
+        self._load(parse(uri.lstrip()))
+
+    """
+        Creates the builder from a ParsedUri without parsing the URI again
+    """
+    @classmethod
+    def fromParsed(cls, parsed):
+        if parsed.schemeStart:
+            return cls(parsed.uri)
+        builder = cls.__new__(cls)
+        builder._load(parsed)
+        return builder
+
+    def _load(self, parsed):
+        uri = parsed.uri
+        self.scheme = parsed.scheme
+        self.separator = parsed.separator
+        self.authority = parsed.authority
+        self.path = parsed.path
+        self.query = None
+        if uri.startswith('?', parsed.pathEnd):
+            self.query = parsed.query
+        self.fragment = None
+        if parsed.queryEnd < len(uri):
+            self.fragment = uri[parsed.queryEnd + 1:]
+
+    def _reparse(self):
+        self._load(parse(self.build()))
+        return self
+
+    def build(self):
+        parts = [self.scheme, self.separator, self.authority, self.path]
+        if self.query is not None:
+            parts.append('?')
+            parts.append(self.query)
+        if self.fragment is not None:
+            parts.append('#')
+            parts.append(self.fragment)
+        return ''.join(parts)
+
+    def __str__(self):
+        return self.build()
+
+    def __repr__(self):
+        return 'UriBuilder(%r)' % self.build()
+
+    def appendScheme(self, scheme, separator="://"):
+        if self.scheme:
+            return self
+        return self._setScheme(scheme, separator)
+
+    def replaceScheme(self, newScheme, schemeSeparator="://"):
+        if not newScheme:
+            self.scheme = self.separator = ''
+            if _SCHEME_RE.match(self.authority) or self.authority[:1].isspace():
+                return self._reparse()
+            return self
+        self.scheme = self.separator = ''
+        return self._setScheme(newScheme, schemeSeparator)
+
+    def _setScheme(self, scheme, separator):
+        match = _SCHEME_RE.match(scheme + ':')
+        if match and match.end() == len(scheme) + 1 and separator in ('://', ':'):
+            if separator == '://' or self.authority or not self.path.startswith('//'):
+                self.scheme = scheme
+                self.separator = separator
+                return self
+        # the new prefix changes how the rest of the URI is split
+        rest = self.build()
+        self.scheme = self.separator = self.authority = self.path = ''
+        self.query = self.fragment = None
+        self.path = scheme + separator + rest
+        return self._reparse()
+
+    def appendAuthority(self, auth):
+        if self.authority:
+            return self
+        return self.replaceAuthority(auth)
+
+    def replaceAuthority(self, newAuth):
+        self.authority = newAuth
+        if ('#' in newAuth or '/' in newAuth or '?' in newAuth or
+                (not self.scheme and (_SCHEME_RE.match(newAuth) or newAuth[:1].isspace())) or
+                (not newAuth and self.separator == ':' and self.path.startswith('//'))):
+            return self._reparse()
+        return self
+
+    """
+        Sets the authority built from the user information, the host and the port
+    """
+    def buildAuthority(self, userInf, host, port):
+        return self.replaceAuthority(_handler.buildAuthority(userInf, host, port))
+
+    def appendPath(self, path):
+        return self.replacePath(self.path + path)
+
+    def replacePath(self, newPath):
+        self.path = newPath
+        if (newPath and not newPath.startswith('/')) or '#' in newPath or '?' in newPath or \
+                (not self.authority and self.separator == ':' and newPath.startswith('//')):
+            return self._reparse()
+        return self
+
+    """
+        params is a dictionary of values,
+        delimiter is an optional parameter that delimits the query pairs
+    """
+    def appendQuery(self, params, delimiter='&'):
+        query = _handler.queryToString(params, delimiter)
+        if self.query:
+            self.query = self.query + delimiter + query
+        elif self.query is None:
+            self.query = query
+        else:
+            # an empty query keeps its '?' after the appended one
+            self.query = query + '?'
+        if '#' in query:
+            return self._reparse()
+        return self
+
+    def replaceQuery(self, params):
+        query = _handler.queryToString(params)
+        self.query = query or None
+        fragment = ''
+        if self.fragment is not None:
+            fragment = _FRAGMENT_RE.match(self.fragment).group(0)
+        self.fragment = fragment or None
+        if '#' in query:
+            return self._reparse()
+        return self
+
+    def appendFragment(self, fragment):
+        if self.fragment is None:
+            self.fragment = fragment
+        elif _FRAGMENT_RE.match(self.fragment).end():
+            self.fragment += fragment
+        else:
+            self.fragment += '#' + fragment
+        return self
@@ -0,0 +1,310 @@
+__author__ = 'aliaksandr'
+
+import math
+import struct
+from hashlib import blake2b
+
+import numpy
+
+from src.uriNormalizer import normalize
+
+# the file starts with a 64 bytes header, the uint64 table follows it, so
+# load can map the table straight from the file
+_HEADER = struct.Struct('<8sIIIIQQ')
+_HEADER_SIZE = 64
+_MAGIC = b'URIDEDUP'
+_VERSION = 1
+_HASH_SET = 1
+_BLOOM_FILTER = 2
+
+_MAX_LOAD = 0.7
+_MIX1 = numpy.uint64(0xbf58476d1ce4e5b9)
+_MIX2 = numpy.uint64(0x94d049bb133111eb)
+
+
+class UriHashSet(object):
+    """
+        Exact set of URIs that keeps only a 64 or 128 bit hash of their
+        canonical form (see canonicalUri) in an open-addressing table of
+        uint64 words with linear probing, a zero hash marks an empty slot.
+        The table grows when it is 70% full, except when it is mapped from
+        a file: create it with the expected number of URIs as capacity.
+    """
+
+    def __init__(self, capacity=1024, bits=64):
+        _checkBits(bits)
+        self.bits = bits
+        size = 8
+        while size * _MAX_LOAD < capacity:
+            size *= 2
+        self._table = numpy.zeros((size, bits // 64), dtype=numpy.uint64)
+        self._count = 0
+        self._path = None
+
+    def __len__(self):
+        return self._count
+
+    def add(self, uri):
+        return bool(self.addMany((uri,))[0])
+
+    def __contains__(self, uri):
+        return bool(self.containsMany((uri,))[0])
+
+    """
+        adds the URIs, returns a boolean array that is True for the URIs
+        that were not in the set (for the first occurrence of a repeated one)
+    """
+    def addMany(self, uris):
+        return self.addHashes(uriHashes(uris, self.bits))
+
+    """
+        returns a boolean array that is True for the URIs in the set
+    """
+    def containsMany(self, uris):
+        return self.containsHashes(uriHashes(uris, self.bits))
+
+    def addHashes(self, hashes):
+        hashes = _nonZero(hashes)
+        if (self._count + len(hashes)) > len(self._table) * _MAX_LOAD:
+            self._grow(self._count + len(hashes))
+        table = self._table
+        mask = len(table) - 1
+        added = numpy.zeros(len(hashes), dtype=bool)
+        slots = (hashes[:, 0] & numpy.uint64(mask)).astype(numpy.int64)
+        pending = numpy.arange(len(hashes))
+        # every round looks at the current slot of the pending hashes: an
+        # equal hash is a duplicate, an empty slot goes to the first hash that
+        # wants it (the others see it taken in the next round), any other
+        # hash moves them to the next slot
+        while len(pending):
+            keys = hashes[pending]
+            current = table[slots[pending]]
+            same = (current == keys).all(axis=1)
+            empty = ~current.any(axis=1)
+            done = same.copy()
+            candidates = numpy.flatnonzero(empty)
+            if len(candidates):
+                _, first = numpy.unique(slots[pending[candidates]], return_index=True)
+                winners = candidates[first]
+                table[slots[pending[winners]]] = keys[winners]
+                added[pending[winners]] = True
+                done[winners] = True
+            moved = pending[~same & ~empty]
+            slots[moved] = (slots[moved] + 1) & mask
+            pending = pending[~done]
+        self._count += int(added.sum())
+        return added
+
+    def containsHashes(self, hashes):
+        hashes = _nonZero(hashes)
+        table = self._table
+        mask = len(table) - 1
+        found = numpy.zeros(len(hashes), dtype=bool)
+        slots = (hashes[:, 0] & numpy.uint64(mask)).astype(numpy.int64)
+        pending = numpy.arange(len(hashes))
+        while len(pending):
+            current = table[slots[pending]]
+            same = (current == hashes[pending]).all(axis=1)
+            empty = ~current.any(axis=1)
+            found[pending[same]] = True
+            pending = pending[~same & ~empty]
+            slots[pending] = (slots[pending] + 1) & mask
+        return found
+
+    def _grow(self, count):
+        if isinstance(self._table, numpy.memmap):
+            raise ValueError('the mapped set is full, it can not grow')
+        table = self._table
+        grown = UriHashSet(count * 2, self.bits)
+        grown.addHashes(table[table.any(axis=1)])
+        self._table = grown._table
+
+    def save(self, path):
+        _save(path, _HASH_SET, self.bits, 0, self._count, self._table)
+
+    """
+        maps the set saved to the file, with writable=True the added URIs
+        are written to the file, flush updates its header
+    """
+    @classmethod
+    def load(cls, path, writable=False):
+        bits, _, count, table = _load(path, _HASH_SET, writable)
+        hashSet = cls.__new__(cls)
+        hashSet.bits = bits
+        hashSet._table = table.reshape(-1, bits // 64)
+        hashSet._count = count
+        hashSet._path = path if writable else None
+        return hashSet
+
+    def flush(self):
+        _flush(self._path, self._count, self._table)
+
+
+class UriBloomFilter(object):
+    """
+        Bloom filter of the canonical URIs sized for capacity URIs at the
+        given false positive rate. The bit positions are derived from the
+        64 or 128 bit hash of the URI by double hashing.
+        A Bloom filter has no false negatives, but a new URI can be reported
+        as already seen with the probability of about errorRate.
+    """
+
+    def __init__(self, capacity, errorRate=0.01, bits=64):
+        _checkBits(bits)
+        if capacity <= 0 or not 0 < errorRate < 1:
+            raise ValueError('capacity must be positive and errorRate between 0 and 1')
+        size = int(math.ceil(-capacity * math.log(errorRate) / math.log(2) ** 2 / 64))
+        self.bits = bits
+        self.hashes = max(1, int(round(size * 64 / capacity * math.log(2))))
+        self._words = numpy.zeros(size, dtype=numpy.uint64)
+        self._count = 0
+        self._path = None
+
+    """
+        the number of added URIs that the filter did not report as seen
+    """
+    def __len__(self):
+        return self._count
+
+    def add(self, uri):
+        return bool(self.addMany((uri,))[0])
+
+    def __contains__(self, uri):
+        return bool(self.containsMany((uri,))[0])
+
+    """
+        adds the URIs, returns a boolean array that is True for the URIs
+        that were not in the filter (for the first occurrence of a repeated one)
+    """
+    def addMany(self, uris):
+        return self.addHashes(uriHashes(uris, self.bits))
+
+    def containsMany(self, uris):
+        return self.containsHashes(uriHashes(uris, self.bits))
+
+    def addHashes(self, hashes):
+        words, masks = self._positions(hashes)
+        added = ~(self._words[words] & masks).all(axis=1)
+        if len(hashes) > 1:
+            _, first = numpy.unique(hashes, axis=0, return_index=True)
+            repeated = numpy.ones(len(hashes), dtype=bool)
+            repeated[first] = False
+            added &= ~repeated
+        numpy.bitwise_or.at(self._words, words.ravel(), masks.ravel())
+        self._count += int(added.sum())
+        return added
+
+    def containsHashes(self, hashes):
+        words, masks = self._positions(hashes)
+        return (self._words[words] & masks).all(axis=1)
+
+    def _positions(self, hashes):
+        first = hashes[:, 0]
+        if hashes.shape[1] > 1:
+            step = hashes[:, 1] | numpy.uint64(1)
+        else:
+            step = _mix(first) | numpy.uint64(1)
+        rounds = numpy.arange(self.hashes, dtype=numpy.uint64)
+        positions = (first[:, None] + rounds * step[:, None]) % numpy.uint64(len(self._words) * 64)
+        return (positions >> numpy.uint64(6)).astype(numpy.int64), \
+            numpy.left_shift(numpy.uint64(1), positions & numpy.uint64(63))
+
+    def save(self, path):
+        _save(path, _BLOOM_FILTER, self.bits, self.hashes, self._count, self._words)
+
+    """
+        maps the filter saved to the file, with writable=True the added URIs
+        are written to the file, flush updates its header
+    """
+    @classmethod
+    def load(cls, path, writable=False):
+        bits, hashes, count, words = _load(path, _BLOOM_FILTER, writable)
+        bloom = cls.__new__(cls)
+        bloom.bits = bits
+        bloom.hashes = hashes
+        bloom._words = words
+        bloom._count = count
+        bloom._path = path if writable else None
+        return bloom
+
+    def flush(self):
+        _flush(self._path, self._count, self._words)
+
+
+"""
+    The form of the URI that is hashed: normalized (see src.uriNormalizer)
+    and without the fragment. Only the scheme and a host after '://' are
+    lowercased, 'urn:ISBN:...' and 'urn:isbn:...' are different URIs
+"""
+def canonicalUri(uri):
+    uri = normalize(uri)
+    fragment = uri.find('#')
+    if fragment != -1:
+        return uri[:fragment]
+    return uri
+
+
+"""
+    returns the 64 or 128 bit hash of the canonical form of the URI as an int
+"""
+def uriHash(uri, bits=64):
+    _checkBits(bits)
+    return int.from_bytes(blake2b(canonicalUri(uri).encode('utf-8', 'surrogatepass'),
+                                  digest_size=bits // 8).digest(), 'little')
+
+
+"""
+    returns the hashes of the URIs as an (n, bits / 64) uint64 array
+"""
+def uriHashes(uris, bits=64):
+    _checkBits(bits)
+    size = bits // 8
+    digests = b''.join([blake2b(canonicalUri(uri).encode('utf-8', 'surrogatepass'), digest_size=size).digest()
+                        for uri in uris])
+    return numpy.frombuffer(digests, dtype='<u8').reshape(-1, bits // 64)
+
+
+def _checkBits(bits):
+    if bits not in (64, 128):
+        raise ValueError('bits must be 64 or 128')
+
+
+def _nonZero(hashes):
+    empty = ~hashes.any(axis=1)
+    if empty.any():
+        hashes = hashes.copy()
+        hashes[empty, -1] = 1
+    return hashes
+
+
+def _mix(values):
+    values = (values ^ (values >> numpy.uint64(30))) * _MIX1
+    values = (values ^ (values >> numpy.uint64(27))) * _MIX2
+    return values ^ (values >> numpy.uint64(31))
+
+
+def _save(path, kind, bits, hashes, count, array):
+    with open(path, 'wb') as output:
+        output.write(_HEADER.pack(_MAGIC, _VERSION, kind, bits, hashes, array.size, count).ljust(_HEADER_SIZE, b'\0'))
+        output.write(numpy.ascontiguousarray(array, dtype='<u8').tobytes())
+
+
+def _load(path, kind, writable):
+    with open(path, 'rb') as source:
+        header = source.read(_HEADER_SIZE)
+    if len(header) < _HEADER_SIZE:
+        raise ValueError('%s is not a saved URI set' % path)
+    magic, version, savedKind, bits, hashes, size, count = _HEADER.unpack_from(header)
+    if magic != _MAGIC or version != _VERSION or savedKind != kind:
+        raise ValueError('%s is not a saved %s' % (path, 'UriHashSet' if kind == _HASH_SET else 'UriBloomFilter'))
+    array = numpy.memmap(path, dtype='<u8', mode='r+' if writable else 'r', offset=_HEADER_SIZE, shape=(size,))
+    return bits, hashes, count, array
+
+
+def _flush(path, count, array):
+    if path is None:
+        return
+    array.flush()
+    with open(path, 'r+b') as output:
+        output.seek(_HEADER.size - 8)
+        output.write(struct.pack('<Q', count))
@@ -1,28 +1,87 @@
 __author__ = 'aliaksandr'
 
-import re
+import sys
+from functools import partial
 
-#TODO: implement validation error
+from src.parseCache import ParseCache, CacheInfo
+from src.queryCodec import decodeQuery
+from src.uriNormalizer import normalize, normalizeMany
+from src.uriParser import parse
+from src.uriResolver import Resolver
 
 
 class UriHandler:
+    """
+        cacheSize and cacheBytes turn on the LRU cache of parsed URIs,
+        limited by the number of entries and/or by the approximate memory held.
+        By default nothing is cached.
+        strict=True makes parse, the getters, parseMany, parseParallel and
+        parseAsync raise UriValidationError for the URIs that do not follow
+        RFC3986, see src.uriParser.parse
+        The calls of the methods can be counted and timed at runtime,
+        see src.instrumentation
+    """
+    def __init__(self, cacheSize=0, cacheBytes=0, strict=False):
+        self.strict = strict
+        self._cache = None
+        if cacheSize or cacheBytes:
+            self._cache = ParseCache(cacheSize, cacheBytes, partial(parse, strict=True) if strict else parse)
+
+    """
+        Parses the URI once and returns all its components as a ParsedUri
+    """
+    def parse(self, uri):
+        if self._cache is None:
+            return parse(uri, strict=self.strict)
+        return self._cache.get(uri)
+
+    """
+        Parses all the URIs of the iterable into a columnar batch of NumPy offset arrays,
+        see src.batchParser
+    """
+    def parseMany(self, uris):
+        from src.batchParser import parseMany
+        return parseMany(uris, self.strict)
+
+    """
+        Parses the URIs in a pool of worker processes and yields ParsedUri objects,
+        see src.parallelParser
+    """
+    def parseParallel(self, uris, workers=None, chunkSize=10000, ordered=True):
+        from src.parallelParser import parseParallel
+        return parseParallel(uris, workers, chunkSize, ordered, self.strict)
+
+    """
+        Parses an async iterator or an asyncio.StreamReader of URIs in micro-batches
+        and returns an async iterator of ParsedUri objects, see src.asyncPipeline
+    """
+    def parseAsync(self, source, batchSize=1000, maxDelay=0.01, executor=None):
+        from src.asyncPipeline import ParsePipeline
+        return ParsePipeline(batchSize, maxDelay, executor, strict=self.strict).parse(source)
+
+    """
+        Returns a mutable UriBuilder over the components of the uri,
+        see src.uriBuilder
+    """
+    def builder(self, uri=''):
+        from src.uriBuilder import UriBuilder
+        return UriBuilder.fromParsed(self.parse(uri))
+
+    """
+        Returns hits, misses, evictions, current size and bytes of the parse cache
+    """
+    def cacheInfo(self):
+        if self._cache is None:
+            return CacheInfo(0, 0, 0, 0, 0)
+        return self._cache.info()
+
     """
     Retrieves the authority from the URI, as described in RFC3986,
      Authority consists of userinformation@host:port and placed after scheme
     """
 
     def getAuthority(self, uri):
-        scheme = self.getScheme(uri)
-        schemeSeparator = self.getSchemeSeparator(uri)
-        auth = uri[(len(scheme) + len(schemeSeparator)):]
-        match = re.search('^[^#/\?]+([#/\?]|$)', auth)
-        if not match:
-            #throw error?
-            return ''
-        match = match.group(0)
-        if match[-1] in ['?', '/', '#']:
-            return match[:-1]
-        return match
+        return self.parse(uri).authority
 
     """
     Retrieves the host from the authority. The host is one of: IPv4, IPv6 or domain name.
@@ -30,36 +89,17 @@ class UriHandler:
     """
 
     def getHost(self, uri):
-        auth = self.getAuthority(uri)
-        userInf = self.getUserInformation(uri)
-        if not auth:
-            #throw error
-            return ''
-        if not userInf:
-            host = auth
-        else:
-            host = auth[len(userInf) + 1:]
-        if host.startswith('['):
-            endIndex = host.find(']')
-            if endIndex == -1:
-                return ''
-            return host[1:endIndex]
-        colon = host.find(':')
-        if colon == -1:
-            return host
-        return host[:colon]
-
-    def __hasIpV6Host(self, uri):
-        auth = self.getAuthority(uri)
-        userInf = self.getUserInformation(uri)
-        if not auth:
-            #throw error
-            return ''
-        if not userInf:
-            host = auth
-        else:
-            host = auth[len(userInf) + 1:]
-        return host.startswith('[')
+        return self.parse(uri).host
+
+    """
+    Decodes an IPv4 host or an IPv6 literal into (4, address) or (6, address)
+    where the address is an integer, returns None for a domain name,
+    see src.cidrIndex
+    """
+
+    def getHostAddress(self, uri):
+        from src.cidrIndex import packHost
+        return packHost(self.parse(uri))
 
     """
     Gets the user information from the uri.
@@ -69,14 +109,7 @@ class UriHandler:
     """
 
     def getUserInformation(self, uri):
-        auth = self.getAuthority(uri)
-        if not auth:
-            #throw error?
-            return ''
-        infIndex = auth.find('@')
-        if infIndex == -1:
-            return ''
-        return auth[:infIndex]
+        return self.parse(uri).userinfo
 
     """
         retrieves tne port from the URI
@@ -84,20 +117,7 @@ class UriHandler:
         also supports the IPv6 format
     """
     def getPort(self, uri):
-        auth = self.getAuthority(uri)
-        host = self.getHost(uri)
-        userInf = self.getUserInformation(uri)
-        if auth.endswith(host):
-            return ''
-        if userInf:
-            userInf += '@'
-        if self.__hasIpV6Host(uri):
-            port = auth[(len(userInf) + len(host)+2):]
-        else:
-            port = auth[(len(userInf) + len(host)):]
-        if port.startswith(':'):
-            return port[1:]
-        return port
+        return self.parse(uri).port
 
     """
         retrieves and returnes scheme of the uri,
@@ -105,23 +125,14 @@ class UriHandler:
         Accorting to RFC3986, scheme is a string until delimiter(which is ';' or '://')
     """
     def getScheme(self, uri):
-        match = re.search('^[\w\+\.-]+:', uri.strip())
-        if not match:
-            return ""
-        return match.group(0)[:-1]
+        return self.parse(uri).scheme
 
     """
         returns the separator between sheme and authority,
         if no scheme specified returns empty string
     """
     def getSchemeSeparator(self, uri):
-        scheme = self.getScheme(uri)
-        if not scheme:
-            return ''
-        separator = uri[len(scheme)]
-        if uri[len(scheme) + 1:].startswith('//'):
-            return separator + '//'
-        return separator
+        return self.parse(uri).separator
 
     """
         returns the path of the URI
@@ -130,20 +141,7 @@ class UriHandler:
         if no uri specified, returns empty string
     """
     def getPath(self, uri):
-        if not uri:
-            return ''
-        auth = self.getAuthority(uri)
-        scheme = self.getScheme(uri)
-        schemeSeparator = self.getSchemeSeparator(uri)
-        path = uri[(len(auth) + len(scheme) + len(schemeSeparator)):]
-        match = re.search('^[^#\?]+([#\?]|$)', path)
-        if not match:
-            #Todo: throw an error
-            return ''
-        path = match.group(0)
-        if path[-1] in ['?', '#']:
-            return path[:-1]
-        return path
+        return self.parse(uri).path
 
     """
         Returns the query part of URI as a string.
@@ -154,24 +152,12 @@ class UriHandler:
             it starts with '?' and finised with '# or end of the string'
     """
     def getStringQuery(self, uri):
-        if not uri:
-            return ''
-        scheme = self.getScheme(uri)
-        schemeSeparator = self.getSchemeSeparator(uri)
-        auth = self.getAuthority(uri)
-        path = self.getPath(uri)
-        path = scheme + schemeSeparator + auth + path
-        query = uri[len(path):]
-        if not query:
-            return ''
-        match = re.search('^\?([^#]+)([#]|$)', query)
-        if not match:
-            return ''
-        return match.group(1)
+        return self.parse(uri).query
 
     """
-        Returns query as a dictionary
-        if no query is specified, returns empty string
+        Returns query as a dictionary, the last value of a repeated key wins,
+        a key without '=' has an empty value
+        if no query is specified, returns empty dictionary
         According to RFC3986, the query follows after the path(which can be empty),
             it starts with '?' and finised with '# or end of the string'
     """
@@ -179,27 +165,43 @@ class UriHandler:
         query = self.getStringQuery(uri)
         if not query:
             return {}
-        params = {}
-        for part in re.split('[;&]', query):
-        #TODO: cach exception
-            (key, value) = part.split('=')
-            params[key] = value
-        return params
+        return decodeQuery(query, unquote=False).toDict()
+
+    """
+        Returns query as an ordered QueryDict that keeps repeated keys,
+        keys and values are percent-decoded.
+        With lazy=True the query is split only until the requested key is found
+    """
+    def getMultiQuery(self, uri, lazy=False):
+        return decodeQuery(self.getStringQuery(uri), lazy=lazy)
 
     """
         Returns the fragment or empty string
     """
     def getFragment(self, uri):
-        match = re.search('#([\w]*)', uri)
-        if not match:
-            return ''
-        return match.group(1)
+        return self.parse(uri).fragment
 
+    """
+        Normalizes the URI as described in RFC3986: lowercase scheme and host,
+        uppercase percent-encodings, decoded unreserved characters, no dot segments
+        and no default port. Returns the same object if the URI is already normal.
+        The scheme and the authority are added if the URI has none.
+    """
     def normalize(self, uri, authority='', scheme=''):
-        pass
+        return normalize(uri, authority, scheme)
 
+    """
+        Normalizes all the URIs of the iterable, returns a list
+    """
+    def normalizeMany(self, uris, authority='', scheme=''):
+        return normalizeMany(uris, authority, scheme)
+
+    """
+        Resolves the (relative) uri against the base uri domain, as described in RFC3986 section 5.2.
+        To resolve many references against the same base use src.uriResolver.Resolver
+    """
     def getAbsoluteURI(self, uri, domain):
-        pass
+        return Resolver(domain).resolve(uri)
 
 
     """
@@ -302,11 +304,13 @@ class UriHandler:
             auth = auth + ':' + port
         return auth
 
+    """
+        Joins the key=value pairs of the dict, the values as str(value), so a
+        list stays one value ('a=[1, 2]'); src.queryCodec.encodeQuery
+        percent-encodes and repeats the key for every item of a list
+    """
     def queryToString(self, query, delimiter='&'):
-        qString = ''
-        for key in query:
-            qString += key + '=' + str(query[key]) + delimiter
-        return qString[:-1]
+        return delimiter.join([key + '=' + str(query[key]) for key in query])
 
     def getSchemeWithSeparator(self, uri):
         return self.getScheme(uri) + self.getSchemeSeparator(uri)
@@ -324,11 +328,15 @@ class UriHandler:
         return '?' + query
 
 
-def main():
-    print("test")
+"""
+    the command line tool, see src.cli
+"""
+def main(argv=None):
+    from src.cli import main
+    return main(argv)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
 
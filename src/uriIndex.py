@@ -0,0 +1,254 @@
+__author__ = 'aliaksandr'
+
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from itertools import islice
+
+import numpy
+
+from src.uriParser import COMPONENTS, ParsedUri, parse
+
+# the file is a header followed by chunks, every chunk is a header, the
+# int64 starts of its URIs in its data (count + 1 values), the (count, 18)
+# int32 offsets of the components (as src.uriParser.ParsedUri.spans, in
+# bytes) and the UTF-8 data of its URIs padded to 8 bytes, so all the
+# arrays are aligned and mapped straight from the file
+_MAGIC = b'URIINDEX'
+_VERSION = 1
+_HEADER = struct.Struct('<8sII')
+_CHUNK_MAGIC = b'CHNK'
+_CHUNK = struct.Struct('<4sIQQ8x')
+_SPAN_COUNT = len(COMPONENTS) * 2
+_COLUMN = dict((name, index) for index, name in enumerate(COMPONENTS))
+
+
+class UriIndex(object):
+    """
+        Read-only view of an index file written by writeIndex/appendIndex.
+        The file is memory-mapped: the URI i and its components are read
+        from the map with the stored offsets, without parsing it again, and
+        the offsets of every chunk are NumPy views over the map (see chunks).
+        With verify=True the checksums of all the chunks are checked on open,
+        which reads the whole file.
+    """
+
+    def __init__(self, path, verify=False):
+        self.filePath = path
+        self._map = numpy.memmap(path, dtype=numpy.uint8, mode='r')
+        if len(self._map) < _HEADER.size:
+            raise ValueError('%s is not an URI index' % path)
+        magic, version, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('%s is not an URI index of version %d' % (path, _VERSION))
+        self.chunks = []
+        self._firsts = []
+        count = 0
+        offset = _HEADER.size
+        while offset < len(self._map):
+            chunk = IndexChunk(self._map, offset)
+            self._firsts.append(count)
+            self.chunks.append(chunk)
+            count += len(chunk)
+            offset = chunk.end
+        self._count = count
+        if verify:
+            self.verify()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        chunk, index = self._locate(index)
+        return chunk[index]
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            for parsed in chunk:
+                yield parsed
+
+    """
+        returns the URI as a string
+    """
+    def uri(self, index):
+        chunk, index = self._locate(index)
+        return _decode(chunk.uriBytes(index))
+
+    """
+        returns the component of the URI as a string
+    """
+    def component(self, index, component):
+        chunk, index = self._locate(index)
+        return _decode(chunk.componentBytes(index, component))
+
+    def host(self, index):
+        return self.component(index, 'host')
+
+    def path(self, index):
+        return self.component(index, 'path')
+
+    def query(self, index):
+        return self.component(index, 'query')
+
+    """
+        the (n, 18) offsets of all the URIs: a view over the map when the file
+        has a single chunk, otherwise a copy of the chunks joined together
+    """
+    @property
+    def spans(self):
+        if len(self.chunks) == 1:
+            return self.chunks[0].spans
+        return numpy.concatenate([chunk.spans for chunk in self.chunks]) if self.chunks else \
+            numpy.zeros((0, _SPAN_COUNT), dtype=numpy.int32)
+
+    def lengths(self, component):
+        index = _COLUMN[component] * 2
+        spans = self.spans
+        return spans[:, index + 1] - spans[:, index]
+
+    """
+        checks the checksums of all the chunks, raises ValueError for a damaged one
+    """
+    def verify(self):
+        for number, chunk in enumerate(self.chunks):
+            if not chunk.verify():
+                raise ValueError('%s: the checksum of the chunk %d does not match' % (self.filePath, number))
+
+    def _locate(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('URI index out of range')
+        number = bisect_right(self._firsts, index) - 1
+        return self.chunks[number], index - self._firsts[number]
+
+
+class IndexChunk(object):
+    """
+        One chunk of an index file, starts, spans and data are views over the map
+    """
+
+    def __init__(self, mapped, offset):
+        if offset + _CHUNK.size > len(mapped):
+            raise ValueError('truncated URI index chunk at offset %d' % offset)
+        magic, self.checksum, count, size = _CHUNK.unpack_from(mapped, offset)
+        if magic != _CHUNK_MAGIC:
+            raise ValueError('no URI index chunk at offset %d' % offset)
+        start = offset + _CHUNK.size
+        spansStart = start + (count + 1) * 8
+        dataStart = spansStart + count * _SPAN_COUNT * 4
+        self.end = dataStart + _padded(size)
+        if self.end > len(mapped):
+            raise ValueError('truncated URI index chunk at offset %d' % offset)
+        self.starts = mapped[start:spansStart].view('<i8')
+        self.spans = mapped[spansStart:dataStart].view('<i4').reshape(count, _SPAN_COUNT)
+        self.data = mapped[dataStart:dataStart + size]
+        self._payload = mapped[start:dataStart + size]
+        # memoryviews index and slice the map faster than NumPy scalars
+        self._starts = memoryview(self.starts)
+        self._spans = memoryview(self.spans)
+        self._data = memoryview(self.data)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __getitem__(self, index):
+        return ParsedUri(self.uriBytes(index), tuple(self.spans[index].tolist()))
+
+    def __iter__(self):
+        starts = self.starts.tolist()
+        data = self.data
+        for index, spans in enumerate(self.spans.tolist()):
+            yield ParsedUri(data[starts[index]:starts[index + 1]].tobytes(), tuple(spans))
+
+    def uriBytes(self, index):
+        return self._data[self._starts[index]:self._starts[index + 1]].tobytes()
+
+    def componentBytes(self, index, component):
+        start = self._starts[index]
+        column = _COLUMN[component] * 2
+        spans = self._spans
+        return self._data[start + spans[index, column]:start + spans[index, column + 1]].tobytes()
+
+    """
+        returns the absolute (starts, ends) offsets of the component in data
+    """
+    def column(self, component):
+        index = _COLUMN[component] * 2
+        base = self.starts[:-1]
+        return base + self.spans[:, index], base + self.spans[:, index + 1]
+
+    def verify(self):
+        return zlib.crc32(self._payload) == self.checksum
+
+
+"""
+    Writes the URIs (strings or UTF-8 bytes) to a new index file at path,
+    parsed in chunks of chunkSize URIs, returns the number of URIs written
+"""
+def writeIndex(path, uris, chunkSize=1000000):
+    with open(path, 'wb') as output:
+        output.write(_HEADER.pack(_MAGIC, _VERSION, 0))
+        return _writeChunks(output, uris, chunkSize)
+
+
+"""
+    Adds the URIs as new chunks at the end of the index file, which is created
+    if it does not exist. The readers opened before see only the older chunks
+"""
+def appendIndex(path, uris, chunkSize=1000000):
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return writeIndex(path, uris, chunkSize)
+    with open(path, 'r+b') as output:
+        header = output.read(_HEADER.size)
+        if len(header) < _HEADER.size or _HEADER.unpack(header)[:2] != (_MAGIC, _VERSION):
+            raise ValueError('%s is not an URI index of version %d' % (path, _VERSION))
+        output.seek(0, os.SEEK_END)
+        return _writeChunks(output, uris, chunkSize)
+
+
+def _writeChunks(output, uris, chunkSize):
+    if chunkSize < 1:
+        raise ValueError('chunkSize must be positive')
+    uris = iter(uris)
+    total = 0
+    while True:
+        chunk = list(islice(uris, chunkSize))
+        if not chunk:
+            return total
+        output.write(_packChunk(chunk))
+        total += len(chunk)
+
+
+def _packChunk(uris):
+    parts = []
+    starts = array('q', [0])
+    spans = array('i')
+    size = 0
+    for uri in uris:
+        if isinstance(uri, str):
+            uri = uri.encode('utf-8', 'surrogateescape')
+        parts.append(uri)
+        size += len(uri)
+        starts.append(size)
+        spans.extend(parse(uri, asBytes=True).spans())
+    parts.append(b'\0' * (_padded(size) - size))
+    # the file is little-endian whatever the byte order of the machine
+    if sys.byteorder == 'big':
+        starts.byteswap()
+        spans.byteswap()
+    payload = starts.tobytes() + spans.tobytes()
+    data = b''.join(parts)
+    checksum = zlib.crc32(data[:size], zlib.crc32(payload))
+    return _CHUNK.pack(_CHUNK_MAGIC, checksum, len(uris), size) + payload + data
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _decode(data):
+    return data.decode('utf-8', 'surrogateescape')
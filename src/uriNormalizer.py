@@ -0,0 +1,153 @@
+__author__ = 'aliaksandr'
+
+import re
+
+from src.uriParser import parse
+
+# a percent-encoding needs rewriting if its hex digits are lowercase or it
+# encodes an unreserved character (ALPHA / DIGIT / '-' / '.' / '_' / '~')
+_UNRESERVED_CODES = '2[DE]|3[0-9]|4[1-9A-F]|5[0-9AF]|6[1-9A-F]|7[0-9AE]'
+_PERCENT_RE = re.compile('%(?:[0-9A-Fa-f][a-f]|[a-f][0-9A-F]|' + _UNRESERVED_CODES + ')')
+_UPPER_RE = re.compile('[A-Z]')
+# the longest prefix of a host that is already normal: no uppercase letters
+# except for the hex digits of the percent-encodings that have to stay encoded
+_NORMAL_HOST_RE = re.compile('(?:[^A-Z%]|%(?!' + _UNRESERVED_CODES + ')[0-9A-F]{2}|%(?![0-9A-Fa-f]{2}))*')
+_HOST_FIX_RE = re.compile('%[0-9A-Fa-f]{2}|[A-Z]+')
+_DOT_SEGMENT_RE = re.compile(r'/\.\.?(?:/|$)')
+
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+_LOWER = dict((code, code + 32) for code in range(ord('A'), ord('Z') + 1))
+
+DEFAULT_PORTS = {
+    'http': '80',
+    'https': '443',
+    'ws': '80',
+    'wss': '443',
+    'ftp': '21',
+    'ssh': '22',
+    'telnet': '23',
+    'ldap': '389',
+    'rtsp': '554',
+}
+
+
+"""
+    Normalizes the URI as described in RFC3986 section 6.2.2 and 6.2.3:
+    lowercases the scheme and the host, uppercases the hex digits of the
+    percent-encodings, decodes the percent-encoded unreserved characters,
+    removes the dot segments of an absolute path and drops the default port
+    of the scheme (and an empty port). The host and the port are only
+    changed after '://', the rest of 'urn:ISBN:0451450523' is kept as is.
+    The scheme and the authority are added to the URI if it has none.
+    An URI that is already normal is detected in one scan and returned as is.
+"""
+def normalize(uri, authority='', scheme=''):
+    if not uri:
+        return uri
+    if uri[:1].isspace() or uri[-1:].isspace():
+        uri = uri.strip()
+    parsed = parse(uri)
+    if scheme and parsed.schemeEnd == parsed.schemeStart:
+        uri = scheme + '://' + uri
+        parsed = parse(uri)
+    if authority and parsed.authorityEnd == parsed.authorityStart:
+        start = parsed.authorityStart
+        uri = uri[:start] + authority + uri[start:]
+        parsed = parse(uri)
+    # without '://' the text after the scheme is opaque (urn:ISBN:..., news:...),
+    # it has no host to lowercase nor port to drop
+    hasAuthority = parsed.separatorEnd - parsed.separatorStart == 3
+    dropPort = hasAuthority and _dropsPort(uri, parsed)
+    if not (dropPort or
+            _UPPER_RE.search(uri, parsed.schemeStart, parsed.schemeEnd) or
+            hasAuthority and _NORMAL_HOST_RE.match(uri, parsed.hostStart, parsed.hostEnd).end() != parsed.hostEnd or
+            _PERCENT_RE.search(uri) or
+            (uri.startswith('/', parsed.pathStart, parsed.pathEnd) and
+             _DOT_SEGMENT_RE.search(uri, parsed.pathStart, parsed.pathEnd))):
+        return uri
+    return _rebuild(uri, parsed, hasAuthority, dropPort)
+
+
+"""
+    normalizes all the URIs of the iterable, returns a list
+"""
+def normalizeMany(uris, authority='', scheme=''):
+    return [normalize(uri, authority, scheme) for uri in uris]
+
+
+"""
+    RFC3986 section 5.2.4, removes the '.' and '..' segments from the path
+"""
+def removeDotSegments(path):
+    if '.' not in path:
+        return path
+    absolute = path.startswith('/')
+    segments = path.split('/')
+    if absolute:
+        del segments[0]
+    output = []
+    for segment in segments:
+        if segment == '..':
+            if output:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    if segments[-1] in ('.', '..'):
+        output.append('')
+    if absolute:
+        return '/' + '/'.join(output)
+    return '/'.join(output)
+
+
+def _dropsPort(uri, parsed):
+    portStart = parsed.portStart
+    if portStart == parsed.authorityStart:
+        return False
+    if parsed.portEnd == portStart:
+        # an empty port after ':'
+        return uri.startswith(':', portStart - 1)
+    port = DEFAULT_PORTS.get(uri[parsed.schemeStart:parsed.schemeEnd].lower())
+    return port is not None and parsed.portEnd - portStart == len(port) and uri.startswith(port, portStart)
+
+
+def _rebuild(uri, parsed, hasAuthority, dropPort):
+    hostStart = parsed.hostStart
+    hostEnd = parsed.hostEnd
+    pathStart = parsed.pathStart
+    pathEnd = parsed.pathEnd
+    authEnd = parsed.authorityEnd
+    afterHost = parsed.portStart - 1 if dropPort else authEnd
+    parts = [uri[:parsed.schemeEnd].translate(_LOWER),
+             _fixPercent(uri[parsed.schemeEnd:hostStart]),
+             _HOST_FIX_RE.sub(_fixHost, uri[hostStart:hostEnd]) if hasAuthority else _fixPercent(uri[hostStart:hostEnd]),
+             _fixPercent(uri[hostEnd:afterHost])]
+    path = _fixPercent(uri[pathStart:pathEnd])
+    if path.startswith('/'):
+        path = removeDotSegments(path)
+    parts.append(path)
+    parts.append(_fixPercent(uri[pathEnd:]))
+    return ''.join(parts)
+
+
+def _fixPercent(part):
+    if '%' not in part:
+        return part
+    return _PERCENT_RE.sub(_fixTriplet, part)
+
+
+def _fixTriplet(match):
+    triplet = match.group(0)
+    char = chr(int(triplet[1:], 16))
+    if char in _UNRESERVED:
+        return char
+    return triplet.upper()
+
+
+def _fixHost(match):
+    part = match.group(0)
+    if not part.startswith('%'):
+        return part.translate(_LOWER)
+    char = chr(int(part[1:], 16))
+    if char in _UNRESERVED:
+        return char.translate(_LOWER)
+    return part.upper()
@@ -0,0 +1,566 @@
+__author__ = 'aliaksandr'
+
+import ipaddress
+import re
+from collections import namedtuple
+
+_SCHEME_RE = re.compile(r'[\w\+\.-]+:')
+_AUTHORITY_RE = re.compile(r'[^#/\?]*')
+_PATH_RE = re.compile(r'[^#\?]*')
+_QUERY_RE = re.compile(r'[^#]*')
+_FRAGMENT_RE = re.compile(r'\w*')
+
+# the same grammar for ASCII bytes-like input, where bytes patterns and
+# str.lstrip() treat every character as the str ones do. Buffers with octets
+# >= 0x80 are decoded and scanned as str, see _parseBuffer
+_BYTES_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+_SCHEME_BRE = re.compile(br'[\w\+\.-]+:')
+_AUTHORITY_BRE = re.compile(br'[^#/\?]*')
+_PATH_BRE = re.compile(br'[^#\?]*')
+_QUERY_BRE = re.compile(br'[^#]*')
+_FRAGMENT_BRE = re.compile(br'\w*')
+_NON_ASCII_BRE = re.compile(b'[\x80-\xff]')
+_SCHEME_CHARS_BRE = re.compile(br'[\w\+\.-]*')
+
+_QUOTED = [bytes([octet]) if octet < 0x80 else ('%%%02X' % octet).encode('ascii') for octet in range(256)]
+
+# the authority is matched by the second pattern after '//', by the third one
+# after a scheme without '//' and by the fourth one without a scheme, they
+# differ only in the strict grammar
+_STR_GRAMMAR = (_SCHEME_RE, _AUTHORITY_RE, _AUTHORITY_RE, _AUTHORITY_RE, _PATH_RE, _QUERY_RE, _FRAGMENT_RE,
+                '//', '@', '[', ']', ':', '?', '#')
+_BYTES_GRAMMAR = (_SCHEME_BRE, _AUTHORITY_BRE, _AUTHORITY_BRE, _AUTHORITY_BRE, _PATH_BRE, _QUERY_BRE, _FRAGMENT_BRE,
+                  b'//', b'@', b'[', b']', b':', b'?', b'#')
+_BYTES_WHITESPACE_BRE = re.compile(b'[%s]*' % re.escape(_BYTES_WHITESPACE))
+# memoryview has no find/startswith, _scanView searches the delimiters with these
+_SLASHES_BRE = re.compile(b'//')
+_AT_BRE = re.compile(b'@')
+_OPEN_BRACKET_BRE = re.compile(br'\[')
+_CLOSE_BRACKET_BRE = re.compile(br'\]')
+_COLON_BRE = re.compile(b':')
+_QUESTION_BRE = re.compile(br'\?')
+_HASH_BRE = re.compile(b'#')
+
+# RFC3986 grammar for the strict mode. Every class is compiled by re into a
+# lookup table, the patterns stop at the first character their component
+# does not allow, which is an error unless it is the delimiter of the next one.
+# A '%' has to be followed by two hex digits, the patterns match the runs of
+# plain characters between the percent-encodings, so a bad one stops the scan
+# like any other invalid character. The authority is matched as userinfo,
+# host and port at once, the spans of its parts are still found as in the
+# lenient mode
+_UNRESERVED = 'A-Za-z0-9\\-._~'
+_SUB_DELIMS = "!$&'()*+,;="
+_PCHAR = _UNRESERVED + _SUB_DELIMS + ':@'
+
+
+def _percentEncoded(chars):
+    return '[%s]*(?:%%[0-9A-Fa-f]{2}[%s]*)*' % (chars, chars)
+
+
+_SCHEME_SRE = re.compile('[A-Za-z][A-Za-z0-9+.-]*:')
+_USERINFO_SRE = re.compile(_percentEncoded(_UNRESERVED + _SUB_DELIMS + ':'))
+_REG_NAME_SRE = re.compile(_percentEncoded(_UNRESERVED + _SUB_DELIMS))
+_PORT_SRE = re.compile('[0-9]*')
+# the content of an IP literal is checked by _checkAuthority
+_AUTHORITY_SRE = re.compile('(?:%s@)?(?:\\[[^\\]/?#]*\\]|%s)(?::[0-9]*)?' % (_USERINFO_SRE.pattern, _REG_NAME_SRE.pattern))
+# without '//' the scan of the authority is the scan of the first segment of
+# the path, which can not have a ':' in a relative reference
+_SEGMENT_SRE = re.compile(_percentEncoded(_PCHAR))
+_RELATIVE_SEGMENT_SRE = re.compile(_percentEncoded(_UNRESERVED + _SUB_DELIMS + '@'))
+_PATH_SRE = re.compile(_percentEncoded(_PCHAR + '/'))
+_QUERY_SRE = re.compile(_percentEncoded(_PCHAR + '/?'))
+_FRAGMENT_SRE = _QUERY_SRE
+# the span of the fragment, as _FRAGMENT_RE for the URIs that are valid
+_FRAGMENT_SPAN_SRE = re.compile('[0-9A-Za-z_]*')
+_IPV_FUTURE_SRE = re.compile('v[0-9A-Fa-f]+\\.[%s:]+' % (_UNRESERVED + _SUB_DELIMS))
+
+_STRICT_GRAMMAR = (_SCHEME_SRE, _AUTHORITY_SRE, _SEGMENT_SRE, _RELATIVE_SEGMENT_SRE,
+                   _PATH_SRE, _QUERY_SRE, _FRAGMENT_SPAN_SRE, '//', '@', '[', ']', ':', '?', '#')
+
+COMPONENTS = ('scheme', 'separator', 'authority', 'userinfo',
+              'host', 'port', 'path', 'query', 'fragment')
+
+
+_ParsedFields = namedtuple('_ParsedFields', (
+    'uri', 'schemeStart', 'schemeEnd', 'separatorStart', 'separatorEnd',
+    'authorityStart', 'authorityEnd', 'userinfoStart', 'userinfoEnd',
+    'hostStart', 'hostEnd', 'portStart', 'portEnd',
+    'pathStart', 'pathEnd', 'queryStart', 'queryEnd',
+    'fragmentStart', 'fragmentEnd'))
+
+
+class ParsedUri(_ParsedFields):
+    """
+        Immutable record with all the components of the URI, as described in RFC3986.
+        Keeps a reference to the original string and a (start, end) pair of offsets
+        per component, the substrings are created only when a component is read.
+        Missing components are empty strings.
+        The string and the offsets are the items of a tuple, they can not be
+        reassigned, so a ParsedUri can be shared (e.g. by the parse cache).
+    """
+    __slots__ = ()
+
+    def __new__(cls, uri, spans):
+        return tuple.__new__(cls, (uri,) + tuple(spans))
+
+    def __getnewargs__(self):
+        return self[0], self[1:]
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ParsedUri is immutable, can not set %s' % name)
+
+    def __delattr__(self, name):
+        raise AttributeError('ParsedUri is immutable, can not delete %s' % name)
+
+    @property
+    def scheme(self):
+        return self.uri[self.schemeStart:self.schemeEnd]
+
+    @property
+    def separator(self):
+        return self.uri[self.separatorStart:self.separatorEnd]
+
+    @property
+    def authority(self):
+        return self.uri[self.authorityStart:self.authorityEnd]
+
+    @property
+    def userinfo(self):
+        return self.uri[self.userinfoStart:self.userinfoEnd]
+
+    @property
+    def host(self):
+        return self.uri[self.hostStart:self.hostEnd]
+
+    @property
+    def port(self):
+        return self.uri[self.portStart:self.portEnd]
+
+    @property
+    def path(self):
+        return self.uri[self.pathStart:self.pathEnd]
+
+    @property
+    def query(self):
+        return self.uri[self.queryStart:self.queryEnd]
+
+    @property
+    def fragment(self):
+        return self.uri[self.fragmentStart:self.fragmentEnd]
+
+    """
+        returns the offsets of all the components as a flat tuple of
+        (start, end) pairs in the order of COMPONENTS
+    """
+    def spans(self):
+        return self[1:]
+
+    """
+        returns all the components as a tuple of strings in the order of COMPONENTS
+    """
+    def components(self):
+        uri = self.uri
+        spans = self.spans()
+        return tuple(uri[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2))
+
+    def __eq__(self, other):
+        if not isinstance(other, ParsedUri):
+            return NotImplemented
+        return self.components() == other.components()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(self.components())
+
+    def __repr__(self):
+        return 'ParsedUri(%s)' % ', '.join('%s=%r' % pair for pair in zip(COMPONENTS, self.components()))
+
+
+_EMPTY_SPANS = (0,) * 18
+
+
+class UriValidationError(ValueError):
+    """
+        Raised by the strict parsing when the URI does not follow RFC3986.
+        offset is the position of the first invalid character and component
+        is the name of the component it belongs to.
+    """
+
+    def __init__(self, uri, offset, component):
+        ValueError.__init__(self, 'invalid %s at offset %d: %r' % (component, offset, uri))
+        self.uri = uri
+        self.offset = offset
+        self.component = component
+
+    # the error is raised in the worker processes of parseParallel too
+    def __reduce__(self):
+        return UriValidationError, (self.uri, self.offset, self.component)
+
+
+"""
+    Parses the URI in one left-to-right scan and returns a ParsedUri.
+    Every component starts where the previous one ended, so no part of the
+    string is matched twice.
+    bytes, bytearray and memoryview are parsed without decoding: by default the
+    components are zero-copy memoryview slices of the input, with asBytes=True
+    they are bytes. The components are the UTF-8 encodings of the ones of the
+    decoded str.
+    With strict=True the URI is also checked against the RFC3986 grammar during
+    the scan and UriValidationError is raised if it does not match.
+    The components of a valid URI are the same in both modes.
+"""
+def parse(uri, asBytes=False, strict=False):
+    if not isinstance(uri, str):
+        return _parseBuffer(uri, asBytes, strict)
+    if not uri:
+        return ParsedUri(uri, _EMPTY_SPANS)
+    if strict:
+        return ParsedUri(uri, _validate(uri, _scan(uri, 0, _STRICT_GRAMMAR)))
+    # the scheme is searched in the stripped uri, but the rest of the offsets
+    # are counted from the beginning of the original string
+    return ParsedUri(uri, _scan(uri, len(uri) - len(uri.lstrip()), _STR_GRAMMAR))
+
+
+"""
+    ASCII bytes and bytearray are scanned as they are. An ASCII memoryview is
+    scanned in place: over the object it shows when it shows all of it,
+    otherwise by _scanView. Nothing is copied, the components of the default
+    mode are slices of the view (bytes and bytearray are wrapped in one, which
+    does not copy them either). The octets >= 0x80 split the buffer as the
+    ASCII delimiters of the str do, except where \w or the whitespace of str
+    decide: then the buffer is decoded as UTF-8 and scanned as str.
+    This saves the decoding of the URI, not much for ASCII, which CPython
+    decodes fast: bytes parse at 85-100% of the speed of str, a memoryview of
+    a part of a buffer at 75-90% of decoding the part and parsing the str, see
+    benchmarks/bytesParseBench.py
+"""
+def _parseBuffer(data, asBytes, strict=False):
+    scanned = data
+    if isinstance(data, memoryview):
+        if data.format != 'B' or data.ndim != 1:
+            data = data.cast('B')
+        scanned = data.obj
+        if type(scanned) not in (bytes, bytearray) or len(scanned) != data.nbytes:
+            scanned = None
+    spans = _EMPTY_SPANS
+    if len(data) and strict:
+        # latin-1 keeps the offsets, the octets >= 0x80 are invalid anyway
+        text = str(data, 'latin-1')
+        spans = _validate(text, _scan(text, 0, _STRICT_GRAMMAR))
+    elif len(data):
+        lead = 0
+        if data[0] in _BYTES_WHITESPACE:
+            lead = _BYTES_WHITESPACE_BRE.match(data).end()
+        if scanned is None:
+            spans = _scanView(data, lead)
+        else:
+            spans = _scan(scanned, lead, _BYTES_GRAMMAR)
+        # an ASCII buffer answers for the views of its parts too
+        buffer = scanned if scanned is not None else data.obj
+        if not (isinstance(buffer, (bytes, bytearray)) and buffer.isascii()) and _splitsAsStr(data, lead, spans):
+            text = str(data, 'utf-8', 'surrogateescape')
+            spans = _octetOffsets(text, _scan(text, len(text) - len(text.lstrip()), _STR_GRAMMAR))
+    if asBytes:
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        return ParsedUri(data, spans)
+    if not isinstance(data, memoryview):
+        data = memoryview(data)
+    return ParsedUri(data, spans)
+
+
+"""
+    returns True if an octet >= 0x80 is where the str grammar differs from
+    the ASCII one: in the leading whitespace or the scheme, which the bytes
+    scan left at the first of these octets, or at the end of the fragment
+"""
+def _splitsAsStr(data, lead, spans):
+    match = _NON_ASCII_BRE.search(data, lead)
+    if match is None:
+        return False
+    fragmentEnd = spans[17]
+    return (_SCHEME_CHARS_BRE.match(data, lead).end() == match.start() or
+            fragmentEnd < len(data) and data[fragmentEnd] >= 0x80)
+
+
+"""
+    converts the offsets of the characters of text to the offsets of the
+    octets of its UTF-8 encoding
+"""
+def _octetOffsets(text, spans):
+    octets = {}
+    position = size = 0
+    for offset in sorted(set(spans)):
+        size += len(text[position:offset].encode('utf-8', 'surrogateescape'))
+        octets[offset] = size
+        position = offset
+    return tuple([octets[offset] for offset in spans])
+
+
+"""
+    returns the spans of all the components, the scheme starts at lead.
+    works on str and on bytes/bytearray with the grammar of the matching type
+"""
+def _scan(uri, lead, grammar):
+    (schemeRe, authorityRe, segmentRe, relativeRe, pathRe, queryRe, fragmentRe,
+     slashes, at, openBracket, closeBracket, colon, question, hash) = grammar
+    schemeStart = schemeEnd = separatorStart = separatorEnd = 0
+    match = schemeRe.match(uri, lead)
+    if match:
+        schemeStart = lead
+        schemeEnd = match.end() - 1
+        separatorStart = schemeEnd - lead
+        separatorEnd = separatorStart + 1
+        relativeRe = segmentRe
+        if uri.startswith(slashes, separatorEnd):
+            separatorEnd += 2
+            relativeRe = authorityRe
+
+    authStart = separatorEnd - separatorStart + schemeEnd - schemeStart
+    authEnd = relativeRe.match(uri, authStart).end()
+
+    userinfoEnd = hostStart = hostEnd = portStart = portEnd = authStart
+    if authEnd > authStart:
+        infIndex = uri.find(at, authStart, authEnd)
+        if infIndex > authStart:
+            userinfoEnd = infIndex
+            hostStart = infIndex + 1
+        if uri.startswith(openBracket, hostStart, authEnd):
+            endIndex = uri.find(closeBracket, hostStart, authEnd)
+            if endIndex != -1:
+                hostStart += 1
+                hostEnd = endIndex
+                portStart = _portStart(uri, authStart, authEnd, hostStart, hostEnd, endIndex + 1, colon)
+            else:
+                hostStart = authStart
+        else:
+            colonIndex = uri.find(colon, hostStart, authEnd)
+            if colonIndex == -1:
+                hostEnd = authEnd
+            else:
+                hostEnd = colonIndex
+                portStart = _portStart(uri, authStart, authEnd, hostStart, hostEnd, colonIndex, colon)
+        if portStart == authStart:
+            portEnd = authStart
+        else:
+            portEnd = authEnd
+
+    pathEnd = pathRe.match(uri, authEnd).end()
+
+    queryStart = queryEnd = pathEnd
+    if uri.startswith(question, pathEnd):
+        queryStart = pathEnd + 1
+        queryEnd = queryRe.match(uri, queryStart).end()
+
+    fragmentStart = fragmentEnd = queryEnd
+    fragIndex = uri.find(hash, queryEnd)
+    if fragIndex != -1:
+        fragmentStart = fragIndex + 1
+        fragmentEnd = fragmentRe.match(uri, fragmentStart).end()
+
+    return (schemeStart, schemeEnd, separatorStart, separatorEnd,
+            authStart, authEnd, authStart, userinfoEnd,
+            hostStart, hostEnd, portStart, portEnd,
+            authEnd, pathEnd, queryStart, queryEnd,
+            fragmentStart, fragmentEnd)
+
+
+"""
+    the port is whatever follows the host, without the leading ':'.
+    if the authority ends with the host itself, there is no port and
+    authStart is returned as the marker of the empty port
+"""
+def _portStart(uri, authStart, authEnd, hostStart, hostEnd, rest, colon):
+    if uri.endswith(uri[hostStart:hostEnd], authStart, authEnd):
+        return authStart
+    if uri.startswith(colon, rest, authEnd):
+        return rest + 1
+    return rest
+
+
+"""
+    _scan over a memoryview that is a part of a larger buffer: the same steps,
+    with the searches of the delimiters done by regular expressions, which
+    accept any buffer, so the view is not copied
+"""
+def _scanView(view, lead):
+    schemeStart = schemeEnd = separatorStart = separatorEnd = 0
+    match = _SCHEME_BRE.match(view, lead)
+    if match:
+        schemeStart = lead
+        schemeEnd = match.end() - 1
+        separatorStart = schemeEnd - lead
+        separatorEnd = separatorStart + 1
+        if _SLASHES_BRE.match(view, separatorEnd):
+            separatorEnd += 2
+
+    authStart = separatorEnd - separatorStart + schemeEnd - schemeStart
+    authEnd = _AUTHORITY_BRE.match(view, authStart).end()
+
+    userinfoEnd = hostStart = hostEnd = portStart = portEnd = authStart
+    if authEnd > authStart:
+        match = _AT_BRE.search(view, authStart, authEnd)
+        if match and match.start() > authStart:
+            userinfoEnd = match.start()
+            hostStart = userinfoEnd + 1
+        if _OPEN_BRACKET_BRE.match(view, hostStart, authEnd):
+            match = _CLOSE_BRACKET_BRE.search(view, hostStart, authEnd)
+            if match:
+                hostStart += 1
+                hostEnd = match.start()
+                portStart = _portStartView(view, authStart, authEnd, hostStart, hostEnd, hostEnd + 1)
+            else:
+                hostStart = authStart
+        else:
+            match = _COLON_BRE.search(view, hostStart, authEnd)
+            if match is None:
+                hostEnd = authEnd
+            else:
+                hostEnd = match.start()
+                portStart = _portStartView(view, authStart, authEnd, hostStart, hostEnd, hostEnd)
+        if portStart == authStart:
+            portEnd = authStart
+        else:
+            portEnd = authEnd
+
+    pathEnd = _PATH_BRE.match(view, authEnd).end()
+
+    queryStart = queryEnd = pathEnd
+    if _QUESTION_BRE.match(view, pathEnd):
+        queryStart = pathEnd + 1
+        queryEnd = _QUERY_BRE.match(view, queryStart).end()
+
+    fragmentStart = fragmentEnd = queryEnd
+    match = _HASH_BRE.search(view, queryEnd)
+    if match:
+        fragmentStart = match.end()
+        fragmentEnd = _FRAGMENT_BRE.match(view, fragmentStart).end()
+
+    return (schemeStart, schemeEnd, separatorStart, separatorEnd,
+            authStart, authEnd, authStart, userinfoEnd,
+            hostStart, hostEnd, portStart, portEnd,
+            authEnd, pathEnd, queryStart, queryEnd,
+            fragmentStart, fragmentEnd)
+
+
+def _portStartView(view, authStart, authEnd, hostStart, hostEnd, rest):
+    size = hostEnd - hostStart
+    if authEnd - size >= authStart and view[authEnd - size:authEnd] == view[hostStart:hostEnd]:
+        return authStart
+    if _COLON_BRE.match(view, rest, authEnd):
+        return rest + 1
+    return rest
+
+
+"""
+    Parses the URI in the strict mode, see parse
+"""
+def validate(uri):
+    return parse(uri, strict=True)
+
+
+"""
+    checks the spans found by _scan with the strict grammar: every component
+    has to end at the delimiter of the next one, the rest of the fragment is
+    checked from where the span of the fragment ends. returns the spans.
+    Only an IP literal host is parsed again, by _checkAuthority, on an error
+    the authority is, to find out which of its parts is invalid, and a
+    network-path reference is, see _validateNetworkPath
+"""
+def _validate(uri, spans):
+    length = len(uri)
+    (_, _, separatorStart, separatorEnd, authStart, authEnd, _, _, hostStart,
+     _, _, _, _, pathEnd, _, queryEnd, _, fragmentEnd) = spans
+
+    if separatorEnd - separatorStart == 3:
+        if authEnd < length and uri[authEnd] not in '/?#':
+            # the authority scan stopped at an invalid character,
+            # find out which of its parts it belongs to
+            end = authEnd
+            while end < length and uri[end] not in '/?#':
+                end += 1
+            _checkAuthority(uri, authStart, end)
+            raise UriValidationError(uri, authEnd, 'host')
+        if hostStart > authStart and uri[hostStart - 1] == '[':
+            _checkAuthority(uri, authStart, authEnd)
+    elif authEnd < length and uri[authEnd] not in '/?#':
+        # without '//' there is no authority, this is the beginning of the path
+        raise UriValidationError(uri, authEnd, 'path')
+    elif not separatorEnd and uri.startswith('//'):
+        return _validateNetworkPath(uri, spans)
+
+    if pathEnd < length and uri[pathEnd] not in '?#':
+        raise UriValidationError(uri, pathEnd, 'path')
+    if queryEnd < length:
+        if uri[queryEnd] != '#':
+            raise UriValidationError(uri, queryEnd, 'query')
+        invalid = _FRAGMENT_SRE.match(uri, fragmentEnd).end()
+        if invalid < length:
+            raise UriValidationError(uri, invalid, 'fragment')
+    return spans
+
+
+"""
+    a network-path reference ('//host/path'): the spans of both modes put it
+    all in the path, but what follows '//' is an authority. It is checked as
+    the same URI with a scheme, a second scan for this rare form only
+"""
+def _validateNetworkPath(uri, spans):
+    withScheme = 'x:' + uri
+    try:
+        _validate(withScheme, _scan(withScheme, 0, _STRICT_GRAMMAR))
+    except UriValidationError as error:
+        raise UriValidationError(uri, error.offset - 2, error.component)
+    pathEnd = spans[13]
+    if pathEnd < len(uri) and uri[pathEnd] not in '?#':
+        # the strict path scan stopped at the brackets of an IP literal
+        return _scan(uri, 0, _STR_GRAMMAR)
+    return spans
+
+
+def _checkAuthority(uri, authStart, authEnd):
+    hostStart = authStart
+    at = uri.find('@', authStart, authEnd)
+    if at != -1:
+        invalid = _USERINFO_SRE.match(uri, authStart, at).end()
+        if invalid < at:
+            raise UriValidationError(uri, invalid, 'userinfo')
+        hostStart = at + 1
+    if uri.startswith('[', hostStart, authEnd):
+        close = uri.find(']', hostStart, authEnd)
+        if close == -1:
+            raise UriValidationError(uri, authEnd, 'host')
+        literal = uri[hostStart + 1:close]
+        if literal.startswith(('v', 'V')):
+            if _IPV_FUTURE_SRE.fullmatch('v' + literal[1:]) is None:
+                raise UriValidationError(uri, hostStart + 1, 'host')
+        else:
+            try:
+                ipaddress.IPv6Address(literal)
+            except ValueError:
+                raise UriValidationError(uri, hostStart + 1, 'host')
+        hostEnd = close + 1
+    else:
+        hostEnd = _REG_NAME_SRE.match(uri, hostStart, authEnd).end()
+    if hostEnd < authEnd:
+        if uri[hostEnd] != ':':
+            raise UriValidationError(uri, hostEnd, 'host')
+        invalid = _PORT_SRE.match(uri, hostEnd + 1, authEnd).end()
+        if invalid < authEnd:
+            raise UriValidationError(uri, invalid, 'port')
+
+
+"""
+    percent-encodes the octets >= 0x80 as RFC3986 requires for data outside of
+    the URI character set, returns the input unchanged if it is pure ASCII
+"""
+def quoteNonAscii(data):
+    if not _NON_ASCII_BRE.search(data):
+        return data
+    return b''.join([_QUOTED[octet] for octet in data])
@@ -0,0 +1,161 @@
+__author__ = 'aliaksandr'
+
+import re
+from hashlib import blake2b
+
+import numpy
+
+from src.uriParser import ParsedUri, parse
+
+_IPV4_RE = re.compile(r'[0-9]+(?:\.[0-9]+){3}')
+# second level labels under which the country code TLDs register domains,
+# e.g. co.uk, com.au: a heuristic instead of the full public suffix list
+_SECOND_LEVEL = frozenset(('ac', 'co', 'com', 'edu', 'gov', 'net', 'org', 'ne', 'or'))
+_JUMP_MULTIPLIER = numpy.uint64(2862933555777941757)
+
+
+class UriPartitioner(object):
+    """
+        Assigns URIs to partitions by consistent hashing of one of their parts:
+            key='host'    - the lowercase host
+            key='domain'  - the registrable domain of the host (example.co.uk
+                            for www.shop.example.co.uk, see registrableDomain)
+            key='hostPort'- the host and the port
+        or a function of the ParsedUri that returns the key string.
+        partitions is the number of partitions or a sequence of node names,
+        the partition ids are the indices in that sequence.
+        mode='jump' uses the jump consistent hash: no memory, the best balance,
+        but the partitions can only be added or removed at the end.
+        mode='ring' places replicas points of every node on a hash ring, any
+        node can be removed.
+        In both modes going from N to N + 1 partitions moves about 1/(N + 1)
+        of the keys, all of them to the new partition.
+    """
+
+    def __init__(self, partitions, key='host', mode='jump', replicas=100):
+        if isinstance(partitions, int):
+            partitions = [str(index) for index in range(partitions)]
+        self.nodes = list(partitions)
+        if not self.nodes:
+            raise ValueError('at least one partition is needed')
+        if mode not in ('jump', 'ring'):
+            raise ValueError('mode must be jump or ring: %r' % mode)
+        if not callable(key) and key not in _KEYS:
+            raise ValueError('unknown key: %r' % key)
+        self.key = key
+        self.mode = mode
+        self._keyOf = key if callable(key) else _KEYS[key]
+        if mode == 'ring':
+            points = []
+            owners = []
+            for index, node in enumerate(self.nodes):
+                for replica in range(replicas):
+                    points.append(_hash('%s#%d' % (node, replica)))
+                    owners.append(index)
+            order = numpy.argsort(numpy.array(points, dtype=numpy.uint64), kind='stable')
+            self._points = numpy.array(points, dtype=numpy.uint64)[order]
+            self._owners = numpy.array(owners, dtype=numpy.int32)[order]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    """
+        returns the key the URI (a string or a ParsedUri) is partitioned by
+    """
+    def keyOf(self, uri):
+        if not isinstance(uri, ParsedUri):
+            uri = parse(uri)
+        return self._keyOf(uri)
+
+    """
+        returns the partition id of the URI
+    """
+    def partition(self, uri):
+        return int(self.partitionMany((uri,))[0])
+
+    """
+        returns an int32 array with the partition ids of a ParsedBatch or
+        of an iterable of URIs or ParsedUri objects
+    """
+    def partitionMany(self, uris):
+        return self.partitionHashes(numpy.array([_hash(key) for key in self._keys(uris)], dtype=numpy.uint64))
+
+    """
+        returns the partition ids of the 64 bit key hashes
+    """
+    def partitionHashes(self, hashes):
+        if self.mode == 'jump':
+            return jumpHash(hashes, len(self.nodes))
+        found = numpy.searchsorted(self._points, hashes, side='left')
+        found[found == len(self._points)] = 0
+        return self._owners[found]
+
+    def _keys(self, uris):
+        if hasattr(uris, 'spans'):
+            # a ParsedBatch, the named keys only need its columns
+            if self._keyOf is _hostKey:
+                return [host.lower() for host in uris.strings('host')]
+            if self._keyOf is _domainKey:
+                return [registrableDomain(host) for host in uris.strings('host')]
+            if self._keyOf is _hostPortKey:
+                return [host.lower() + ':' + port for host, port in zip(uris.strings('host'), uris.strings('port'))]
+            uris = iter(uris)
+        return self._parsedKeys(uris)
+
+    def _parsedKeys(self, uris):
+        keyOf = self._keyOf
+        for uri in uris:
+            yield keyOf(uri if isinstance(uri, ParsedUri) else parse(uri))
+
+
+"""
+    Jump consistent hash (Lamping and Veach) of every uint64 key into
+    [0, buckets), vectorized: every round advances all the keys still
+    jumping, there are about ln(buckets) rounds
+"""
+def jumpHash(keys, buckets):
+    keys = numpy.array(keys, dtype=numpy.uint64)
+    result = numpy.zeros(len(keys), dtype=numpy.int64)
+    jump = numpy.zeros(len(keys), dtype=numpy.int64)
+    active = numpy.arange(len(keys))
+    while len(active):
+        result[active] = jump[active]
+        key = keys[active] * _JUMP_MULTIPLIER + numpy.uint64(1)
+        keys[active] = key
+        jump[active] = ((result[active] + 1) * (float(1 << 31) / ((key >> numpy.uint64(33)) + 1))).astype(numpy.int64)
+        active = active[jump[active] < buckets]
+    return result.astype(numpy.int32)
+
+
+"""
+    the registrable domain of the host: the last two labels, or three when the
+    second to last one is a common second level label of a country code TLD.
+    IP addresses are returned as they are
+"""
+def registrableDomain(host):
+    host = host.lower().rstrip('.')
+    if ':' in host or _IPV4_RE.fullmatch(host):
+        return host
+    labels = host.rsplit('.', 3)
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def _hash(key):
+    return int.from_bytes(blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+
+def _hostKey(parsed):
+    return parsed.host.lower()
+
+
+def _domainKey(parsed):
+    return registrableDomain(parsed.host)
+
+
+def _hostPortKey(parsed):
+    return parsed.host.lower() + ':' + parsed.port
+
+
+_KEYS = {'host': _hostKey, 'domain': _domainKey, 'hostPort': _hostPortKey}
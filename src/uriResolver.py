@@ -0,0 +1,101 @@
+__author__ = 'aliaksandr'
+
+import re
+
+from src.uriNormalizer import removeDotSegments
+
+# RFC3986 appendix B. Unlike UriHandler.parse it tells an undefined component
+# (None) from an empty one, which reference resolution depends on
+_REFERENCE_RE = re.compile(r'(?:([^:/?#]+):)?(?://([^/?#]*))?([^?#]*)(?:\?([^#]*))?(?:#(.*))?', re.S)
+
+
+class Resolver(object):
+    """
+        Resolves references against one base URI, as described in RFC3986 section 5.2.
+        The base is split into components and its path into segments once,
+        so resolving every link of a page does not parse the base again.
+    """
+
+    def __init__(self, base):
+        scheme, authority, path, query, _ = _REFERENCE_RE.match(base).groups()
+        if not scheme:
+            raise ValueError('base URI must have a scheme: %r' % base)
+        self.base = base
+        self.scheme = scheme
+        self.authority = authority
+        self.path = removeDotSegments(path)
+        self.query = query
+        self._prefix = scheme + ':' if authority is None else scheme + '://' + authority
+        # directory of the base path, the relative paths are merged into it
+        if authority is not None and not path:
+            directory = '/'
+        else:
+            directory = self.path[:self.path.rfind('/') + 1]
+        self._directory = directory
+        self._absolute = directory.startswith('/')
+        self._segments = directory.split('/')[1 if self._absolute else 0:-1]
+
+    """
+        returns the target URI of the reference
+    """
+    def resolve(self, ref):
+        scheme, authority, path, query, fragment = _REFERENCE_RE.match(ref).groups()
+        if scheme:
+            parts = [scheme, ':']
+            if authority is not None:
+                parts.append('//')
+                parts.append(authority)
+            parts.append(removeDotSegments(path))
+        elif authority is not None:
+            parts = [self.scheme, '://', authority, removeDotSegments(path)]
+        elif not path:
+            parts = [self._prefix, self.path]
+            if query is None:
+                query = self.query
+        elif path.startswith('/'):
+            parts = [self._prefix, removeDotSegments(path)]
+        else:
+            parts = [self._prefix, self._merge(path)]
+        if query is not None:
+            parts.append('?')
+            parts.append(query)
+        if fragment is not None:
+            parts.append('#')
+            parts.append(fragment)
+        return ''.join(parts)
+
+    """
+        resolves all the references of the iterable, returns a list
+    """
+    def resolveMany(self, refs):
+        resolve = self.resolve
+        return [resolve(ref) for ref in refs]
+
+    """
+        RFC3986 section 5.2.3 merge followed by the removal of the dot segments.
+        The base directory has no dot segments, so a path without them is
+        simply appended, otherwise it is applied to a copy of the base segments
+    """
+    def _merge(self, path):
+        if '.' not in path:
+            return self._directory + path
+        output = list(self._segments)
+        segments = path.split('/')
+        for segment in segments:
+            if segment == '..':
+                if output:
+                    output.pop()
+            elif segment != '.':
+                output.append(segment)
+        if segments[-1] in ('.', '..'):
+            output.append('')
+        if self._absolute:
+            return '/' + '/'.join(output)
+        return '/'.join(output)
+
+
+"""
+    Resolves the reference against the base URI
+"""
+def resolve(base, ref):
+    return Resolver(base).resolve(ref)
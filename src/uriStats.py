@@ -0,0 +1,368 @@
+__author__ = 'aliaksandr'
+
+import math
+import struct
+from collections import Counter
+from hashlib import blake2b
+from heapq import heapify, heappop, heappush
+
+import numpy
+
+from src.uriParser import ParsedUri, parse
+
+_MAGIC = b'URISTATS'
+_VERSION = 1
+_HEADER = struct.Struct('<8sII')
+_SUMMARY = struct.Struct('<IQI')
+_ENTRY = struct.Struct('<QQI')
+_SKETCH = struct.Struct('<IIQ')
+
+COMPONENTS = ('scheme', 'host', 'port', 'path', 'query', 'queryKey', 'fragment')
+
+
+class SpaceSaving(object):
+    """
+        Space-Saving summary (Metwally et al.) of the most frequent items of a
+        stream, it keeps at most capacity counters. When a new item comes and
+        the summary is full it takes the counter of the least frequent item.
+        A count is never below the true one and at most error above it, the
+        error is at most total / capacity. Every item more frequent than
+        total / capacity is in the summary.
+        The least frequent counter is found with a heap whose entries may be
+        lower than the counts, a stale entry is pushed back with its count.
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        self._heap = []
+
+    def __len__(self):
+        return len(self._counts)
+
+    def update(self, item, count=1):
+        counts = self._counts
+        self.total += count
+        current = counts.get(item)
+        if current is not None:
+            counts[item] = current + count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+            heappush(self._heap, (count, item))
+        else:
+            minimum, victim = self._popMinimum()
+            del counts[victim]
+            del self._errors[victim]
+            counts[item] = minimum + count
+            self._errors[item] = minimum
+            heappush(self._heap, (minimum + count, item))
+
+    """
+        counts the items of the iterable, the repeated ones are counted
+        together before they update the summary
+    """
+    def updateMany(self, items):
+        update = self.update
+        for item, count in Counter(items).items():
+            update(item, count)
+
+    def _popMinimum(self):
+        heap = self._heap
+        counts = self._counts
+        while True:
+            count, item = heappop(heap)
+            current = counts[item]
+            if current == count:
+                return count, item
+            heappush(heap, (current, item))
+
+    """
+        returns the estimated count of the item and its maximal overestimation
+    """
+    def estimate(self, item):
+        count = self._counts.get(item)
+        if count is None:
+            return 0, self.minimum()
+        return count, self._errors[item]
+
+    """
+        the smallest count of the summary when it is full, the upper bound
+        of the count of any item that is not in it
+    """
+    def minimum(self):
+        if len(self._counts) < self.capacity:
+            return 0
+        return min(self._counts.values())
+
+    def errorBound(self):
+        return self.total // self.capacity
+
+    """
+        returns the list of (item, count, error) of the k most frequent items
+    """
+    def topK(self, k=10):
+        errors = self._errors
+        ranked = sorted(self._counts.items(), key=lambda entry: (-entry[1], entry[0]))[:k]
+        return [(item, count, errors[item]) for item, count in ranked]
+
+    """
+        adds the summary of another stream (Agarwal et al. mergeable summaries):
+        an item missing from a full summary is counted with its minimum
+    """
+    def merge(self, other):
+        missingHere = self.minimum()
+        missingThere = other.minimum()
+        counts = {}
+        errors = {}
+        for item in set(self._counts) | set(other._counts):
+            counts[item] = self._counts.get(item, missingHere) + other._counts.get(item, missingThere)
+            errors[item] = self._errors.get(item, missingHere) + other._errors.get(item, missingThere)
+        if len(counts) > self.capacity:
+            kept = sorted(counts.items(), key=lambda entry: -entry[1])[:self.capacity]
+            counts = dict(kept)
+            errors = dict((item, errors[item]) for item in counts)
+        self._counts = counts
+        self._errors = errors
+        self._heap = [(count, item) for item, count in counts.items()]
+        heapify(self._heap)
+        self.total += other.total
+        return self
+
+    def toBytes(self):
+        parts = [_SUMMARY.pack(self.capacity, self.total, len(self._counts))]
+        errors = self._errors
+        for item, count in self._counts.items():
+            data = item.encode('utf-8', 'surrogatepass')
+            parts.append(_ENTRY.pack(count, errors[item], len(data)))
+            parts.append(data)
+        return b''.join(parts)
+
+    @classmethod
+    def fromBytes(cls, data, offset=0):
+        return cls._read(memoryview(data), offset)[0]
+
+    @classmethod
+    def _read(cls, data, offset):
+        capacity, total, size = _SUMMARY.unpack_from(data, offset)
+        offset += _SUMMARY.size
+        summary = cls(capacity)
+        summary.total = total
+        counts = summary._counts
+        errors = summary._errors
+        for _ in range(size):
+            count, error, length = _ENTRY.unpack_from(data, offset)
+            offset += _ENTRY.size
+            item = bytes(data[offset:offset + length]).decode('utf-8', 'surrogatepass')
+            offset += length
+            counts[item] = count
+            errors[item] = error
+        summary._heap = [(count, item) for item, count in counts.items()]
+        heapify(summary._heap)
+        return summary, offset
+
+
+class CountMinSketch(object):
+    """
+        Count-Min sketch (Cormode and Muthukrishnan): depth rows of width
+        counters, an item adds to one counter of every row and its estimate
+        is the smallest of them. The estimate is never below the true count
+        and with the probability 1 - exp(-depth) at most e / width * total above it.
+        Sketches of the same size merge by adding their counters.
+    """
+
+    def __init__(self, width=2048, depth=4):
+        if width <= 0 or depth <= 0:
+            raise ValueError('width and depth must be positive')
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = numpy.zeros((depth, width), dtype=numpy.int64)
+        self._rows = numpy.arange(depth, dtype=numpy.uint64)
+
+    """
+        creates the sketch for the error epsilon * total with the probability 1 - delta
+    """
+    @classmethod
+    def fromError(cls, epsilon, delta):
+        return cls(int(math.ceil(math.e / epsilon)), int(math.ceil(math.log(1 / delta))))
+
+    def update(self, item, count=1):
+        self.updateMany((item,), (count,))
+
+    """
+        adds the items, counts is the count of every item (1 by default)
+    """
+    def updateMany(self, items, counts=None):
+        if counts is None:
+            grouped = Counter(items)
+            items = list(grouped)
+            counts = list(grouped.values())
+        columns = self._columns(items)
+        counts = numpy.asarray(counts, dtype=numpy.int64)
+        rows = numpy.broadcast_to(numpy.arange(self.depth)[:, None], columns.shape)
+        numpy.add.at(self._table, (rows.ravel(), columns.ravel()), numpy.tile(counts, self.depth))
+        self.total += int(counts.sum())
+
+    def estimate(self, item):
+        return int(self.estimateMany((item,))[0])
+
+    def estimateMany(self, items):
+        columns = self._columns(items)
+        return self._table[numpy.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def errorBound(self):
+        return int(math.ceil(math.e / self.width * self.total))
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError('only sketches of the same size can be merged')
+        self._table += other._table
+        self.total += other.total
+        return self
+
+    def _columns(self, items):
+        digests = b''.join([blake2b(item.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+                            for item in items])
+        hashes = numpy.frombuffer(digests, dtype='<u8').reshape(-1, 2)
+        # double hashing: the column of row i is h1 + i * h2
+        columns = hashes[:, 0] + self._rows[:, None] * (hashes[:, 1] | numpy.uint64(1))
+        return (columns % numpy.uint64(self.width)).astype(numpy.int64)
+
+    def toBytes(self):
+        return _SKETCH.pack(self.width, self.depth, self.total) + self._table.astype('<i8').tobytes()
+
+    @classmethod
+    def fromBytes(cls, data, offset=0):
+        return cls._read(memoryview(data), offset)[0]
+
+    @classmethod
+    def _read(cls, data, offset):
+        width, depth, total = _SKETCH.unpack_from(data, offset)
+        offset += _SKETCH.size
+        sketch = cls(width, depth)
+        sketch.total = total
+        size = width * depth * 8
+        sketch._table = numpy.frombuffer(bytes(data[offset:offset + size]), dtype='<i8').reshape(depth, width).copy()
+        return sketch, offset + size
+
+
+class UriStats(object):
+    """
+        Streaming statistics of URIs in bounded memory: a SpaceSaving summary
+        of the top values of every component (see COMPONENTS, queryKey is the
+        name of every query parameter) and, if sketch is (width, depth),
+        a CountMinSketch per component for the count of any value.
+        Summaries of several workers merge into one, toBytes/fromBytes
+        snapshot them in a compact binary form.
+    """
+
+    def __init__(self, capacity=1000, components=('host', 'path', 'queryKey'), sketch=None):
+        for component in components:
+            if component not in COMPONENTS:
+                raise ValueError('unknown component: %r' % component)
+        self.components = tuple(components)
+        self.total = 0
+        self.summaries = dict((component, SpaceSaving(capacity)) for component in components)
+        self.sketches = {}
+        if sketch is not None:
+            self.sketches = dict((component, CountMinSketch(*sketch)) for component in components)
+
+    def add(self, uri):
+        self.addMany((uri,))
+
+    """
+        adds a ParsedBatch or an iterable of URIs or ParsedUri objects
+    """
+    def addMany(self, uris):
+        if hasattr(uris, 'spans'):
+            values = dict((component, uris.strings('query' if component == 'queryKey' else component))
+                          for component in self.components)
+            count = len(uris)
+        else:
+            parsed = [uri if isinstance(uri, ParsedUri) else parse(uri) for uri in uris]
+            values = dict((component, [getattr(uri, 'query' if component == 'queryKey' else component)
+                                       for uri in parsed])
+                          for component in self.components)
+            count = len(parsed)
+        for component, items in values.items():
+            if component == 'queryKey':
+                items = _queryKeys(items)
+            grouped = Counter(items)
+            summary = self.summaries[component]
+            for item, itemCount in grouped.items():
+                summary.update(item, itemCount)
+            if component in self.sketches:
+                self.sketches[component].updateMany(list(grouped), list(grouped.values()))
+        self.total += count
+
+    """
+        returns the list of (value, count, error) of the k most frequent values of the component
+    """
+    def topK(self, component, k=10):
+        return self.summaries[component].topK(k)
+
+    """
+        returns the count of the value: from the sketch if there is one, otherwise
+        from the summary (0 for a value that is not in it)
+    """
+    def estimate(self, component, value):
+        if component in self.sketches:
+            return self.sketches[component].estimate(value)
+        return self.summaries[component].estimate(value)[0]
+
+    def merge(self, other):
+        if self.components != other.components or set(self.sketches) != set(other.sketches):
+            raise ValueError('only stats of the same components can be merged')
+        for component in self.components:
+            self.summaries[component].merge(other.summaries[component])
+            if component in self.sketches:
+                self.sketches[component].merge(other.sketches[component])
+        self.total += other.total
+        return self
+
+    def toBytes(self):
+        names = ','.join(self.components).encode('ascii')
+        parts = [_HEADER.pack(_MAGIC, _VERSION, len(names)), names,
+                 struct.pack('<QB', self.total, bool(self.sketches))]
+        for component in self.components:
+            parts.append(self.summaries[component].toBytes())
+            if self.sketches:
+                parts.append(self.sketches[component].toBytes())
+        return b''.join(parts)
+
+    @classmethod
+    def fromBytes(cls, data):
+        data = memoryview(data)
+        if len(data) < _HEADER.size:
+            raise ValueError('not a UriStats snapshot')
+        magic, version, length = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError('not a UriStats snapshot')
+        offset = _HEADER.size
+        components = bytes(data[offset:offset + length]).decode('ascii').split(',')
+        offset += length
+        total, sketched = struct.unpack_from('<QB', data, offset)
+        offset += struct.calcsize('<QB')
+        stats = cls(1, components)
+        stats.total = total
+        for component in components:
+            stats.summaries[component], offset = SpaceSaving._read(data, offset)
+            if sketched:
+                stats.sketches[component], offset = CountMinSketch._read(data, offset)
+        return stats
+
+
+def _queryKeys(queries):
+    keys = []
+    for query in queries:
+        if not query:
+            continue
+        for part in query.replace(';', '&').split('&'):
+            if part:
+                keys.append(part.partition('=')[0])
+    return keys
@@ -0,0 +1,108 @@
+__author__ = 'aliaksandr'
+
+import asyncio
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import src.asyncPipeline as apipeline
+import src.uriParser as uparser
+from src.uriHandler import UriHandler
+
+
+async def _generate(uris):
+    for uri in uris:
+        yield uri
+
+
+async def _collect(iterator):
+    return [parsed async for parsed in iterator]
+
+
+class TestAsyncPipeline(unittest.TestCase):
+    def setUp(self):
+        self.uris = ['http://user@domain%d.com:80%d/path/%d?q=%d#f' % (i, i % 10, i, i) for i in range(250)]
+        self.expected = [uparser.parse(uri) for uri in self.uris]
+
+    def run_(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+    def test_inline(self):
+        pipeline = apipeline.ParsePipeline(batchSize=16)
+        self.assertEqual(self.run_(_collect(pipeline.parse(_generate(self.uris)))), self.expected)
+        stats = pipeline.stats()
+        self.assertEqual(sorted(stats), sorted(apipeline.STAGES))
+        for stage in apipeline.STAGES:
+            self.assertEqual(stats[stage].items, 250)
+            self.assertEqual(stats[stage].batches, 16)
+            self.assertTrue(stats[stage].seconds > 0 and stats[stage].itemsPerSecond > 0)
+
+    def test_iterable(self):
+        pipeline = apipeline.ParsePipeline(batchSize=100)
+        self.assertEqual(self.run_(_collect(pipeline.parse(self.uris))), self.expected)
+        self.assertEqual(self.run_(_collect(pipeline.parse([]))), [])
+
+    def test_streamReader(self):
+        async def read():
+            reader = asyncio.StreamReader()
+            reader.feed_data(('\n'.join(self.uris[:100]) + '\n\n').encode())
+            reader.feed_data(('\r\n'.join(self.uris[100:])).encode())
+            reader.feed_eof()
+            return await _collect(apipeline.ParsePipeline(batchSize=32).parse(reader))
+        self.assertEqual(self.run_(read()), self.expected)
+
+    def test_executors(self):
+        for executor in (ThreadPoolExecutor(2), ProcessPoolExecutor(2)):
+            with executor:
+                pipeline = apipeline.ParsePipeline(batchSize=20, executor=executor)
+                self.assertEqual(self.run_(_collect(pipeline.parse(_generate(self.uris)))), self.expected)
+                self.assertEqual(pipeline.stats()['parse'].batches, 13)
+
+    def test_maxDelay(self):
+        # the source waits for the first result, a batch that never fills must still be sent
+        async def scenario():
+            received = asyncio.Event()
+
+            async def source():
+                yield 'http://a.com'
+                yield 'http://b.com'
+                await received.wait()
+                yield 'http://c.com'
+            hosts = []
+            async for parsed in apipeline.ParsePipeline(batchSize=100, maxDelay=0.01).parse(source()):
+                hosts.append(parsed.host)
+                received.set()
+            return hosts
+        self.assertEqual(self.run_(scenario()), ['a.com', 'b.com', 'c.com'])
+
+    def test_backpressure(self):
+        produced = [0]
+
+        async def source():
+            while True:
+                produced[0] += 1
+                yield 'http://domain.com/%d' % produced[0]
+
+        async def consume():
+            iterator = UriHandler().parseAsync(source(), batchSize=10)
+            first = await iterator.__anext__()
+            await asyncio.sleep(0.05)
+            await iterator.aclose()
+            return first
+        self.assertEqual(self.run_(consume()).path, '/1')
+        # the queues hold at most 4 batches each, the rest of the source is not read
+        self.assertTrue(produced[0] < 200, produced[0])
+
+    def test_sourceError(self):
+        async def source():
+            yield 'http://a.com'
+            raise IOError('connection lost')
+        with self.assertRaises(IOError):
+            self.run_(_collect(apipeline.ParsePipeline().parse(source())))
+
+    def test_invalidArguments(self):
+        self.assertRaises(ValueError, apipeline.ParsePipeline, batchSize=0)
+        self.assertRaises(ValueError, apipeline.ParsePipeline, maxDelay=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
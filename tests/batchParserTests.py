@@ -0,0 +1,60 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import numpy
+
+import src.uriHandler as uhandler
+
+URIS = ['http://user@domain.com:9000/root/child?p1=v1#frag',
+        'http://[FEDC:BA98::3210]:80/index.html',
+        'scheme:data@domain.com/root',
+        '/root?p1=v1&p2=v2#fragment',
+        'http://other.org/path',
+        '',
+        'http://domain.com']
+
+
+class TestBatchParser(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+
+    def assertMatchesGetters(self, batch, uris):
+        self.assertEqual(len(batch), len(uris))
+        self.assertEqual(batch.strings('host'), [self.uriHandler.getHost(uri) for uri in uris])
+        self.assertEqual(batch.strings('path'), [self.uriHandler.getPath(uri) for uri in uris])
+        self.assertEqual(batch.strings('port'), [self.uriHandler.getPort(uri) for uri in uris])
+        self.assertEqual(batch.strings('query'), [self.uriHandler.getStringQuery(uri) for uri in uris])
+        for index, uri in enumerate(uris):
+            self.assertEqual(batch.uri(index), uri)
+            self.assertEqual(batch[index], self.uriHandler.parse(uri))
+
+    def test_parseList(self):
+        self.assertMatchesGetters(self.uriHandler.parseMany(URIS), URIS)
+
+    def test_parseGenerator(self):
+        self.assertMatchesGetters(self.uriHandler.parseMany(uri for uri in URIS), URIS)
+
+    def test_parseNumpyArrays(self):
+        self.assertMatchesGetters(self.uriHandler.parseMany(numpy.array(URIS)), URIS)
+        self.assertMatchesGetters(self.uriHandler.parseMany(numpy.array([uri.encode() for uri in URIS])), URIS)
+
+    def test_parseEmpty(self):
+        batch = self.uriHandler.parseMany([])
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.spans.shape, (0, 18))
+
+    def test_columns(self):
+        batch = self.uriHandler.parseMany(URIS)
+        self.assertEqual(batch.spans.dtype, numpy.int32)
+        starts, ends = batch.column('host')
+        self.assertEqual(batch.buffer[starts[4]:ends[4]], 'other.org')
+        self.assertEqual(batch.lengths('port').tolist(), [4, 2, 0, 0, 0, 0, 0])
+
+    def test_mask(self):
+        batch = self.uriHandler.parseMany(URIS)
+        self.assertEqual(batch.mask('host', 'domain.com').tolist(),
+                         [True, False, True, False, False, False, True])
+        self.assertEqual(batch.mask('scheme', '').tolist(),
+                         [False, False, False, True, False, True, False])
+        self.assertFalse(batch.mask('host', 'missing.com').any())
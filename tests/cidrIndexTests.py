@@ -0,0 +1,57 @@
+__author__ = 'aliaksandr'
+
+import ipaddress
+import random
+import unittest
+
+from src.batchParser import parseMany
+from src.cidrIndex import CidrIndex
+import src.uriHandler as uhandler
+
+NETWORKS = ['10.0.0.0/8', ('10.1.0.0/16', 'inner'), '10.1.2.0/24', '192.168.0.0/16',
+            '2001:db8::/32', ('2001:db8:1::/48', 'inner6')]
+
+
+class TestCidrIndex(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+        self.index = CidrIndex(NETWORKS)
+
+    def test_getHostAddress(self):
+        self.assertEqual(self.uriHandler.getHostAddress('http://10.0.0.1:80/path'), (4, 0x0a000001))
+        self.assertEqual(self.uriHandler.getHostAddress('http://[::1]/'), (6, 1))
+        self.assertIsNone(self.uriHandler.getHostAddress('http://domain.com/'))
+        self.assertIsNone(self.uriHandler.getHostAddress('http://10.0.0.256/'))
+        self.assertIsNone(self.uriHandler.getHostAddress('/path'))
+
+    def test_mostSpecificWins(self):
+        self.assertEqual(self.index.lookup('10.0.0.1'), '10.0.0.0/8')
+        self.assertEqual(self.index.lookup('10.1.255.255'), 'inner')
+        self.assertEqual(self.index.lookup('10.1.2.3'), '10.1.2.0/24')
+        self.assertEqual(self.index.lookup('10.2.0.0'), '10.0.0.0/8')
+        self.assertEqual(self.index.lookup('2001:db8:1::5'), 'inner6')
+        self.assertEqual(self.index.lookup('2001:db8:2::5'), '2001:db8::/32')
+        self.assertIsNone(self.index.lookup('11.0.0.0'))
+        self.assertIsNone(self.index.lookup('::1'))
+        self.assertNotIn('domain.com', self.index)
+
+    def test_lookupMany(self):
+        uris = ['http://10.1.2.3/', 'http://[2001:db8::1]:80/', 'http://domain.com/', 'http://9.9.9.9', '']
+        expected = ['10.1.2.0/24', '2001:db8::/32', None, None, None]
+        self.assertEqual(self.index.lookupMany(parseMany(uris)), expected)
+        self.assertEqual(self.index.lookupMany([self.uriHandler.parse(uri) for uri in uris]), expected)
+
+    def test_matchesIpaddress(self):
+        rnd = random.Random(7)
+        networks = [ipaddress.ip_network('%d.%d.0.0/%d' % (rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(8, 24)),
+                                         strict=False) for _ in range(200)]
+        index = CidrIndex(networks)
+        hosts = ['%d.%d.%d.%d' % tuple(rnd.randint(0, 255) for _ in range(4)) for _ in range(2000)]
+        hosts += [str(network.network_address + 1) for network in networks]
+        expected = []
+        for host in hosts:
+            address = ipaddress.ip_address(host)
+            containing = [network for network in networks if address in network]
+            expected.append(str(max(containing, key=lambda network: network.prefixlen)) if containing else None)
+        self.assertEqual(index.lookupMany(hosts), expected)
+        self.assertEqual([index.lookup(host) for host in hosts], expected)
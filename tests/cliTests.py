@@ -0,0 +1,70 @@
+__author__ = 'aliaksandr'
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+import src.cli as cli
+import src.uriHandler as uhandler
+
+URIS = ['http://user@domain.com:8080/path?q=1#frag', '', 'HTTP://Domain.com:80/a/../b',
+        'mailto:someone@domain.com', 'http://a b/\tpath']
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, 'uris.txt')
+        self.output = os.path.join(self.directory, 'out.txt')
+        with open(self.input, 'w') as source:
+            source.write('\n'.join(URIS) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_(self, *args):
+        self.assertEqual(cli.main(list(args) + ['-o', self.output]), 0)
+        with open(self.output, encoding='utf-8') as result:
+            return result.read().splitlines()
+
+    def test_tsv(self):
+        self.assertEqual(self.run_(self.input, '-f', 'host,port,path', '--header'),
+                         ['host\tport\tpath', 'domain.com\t8080\t/path', 'Domain.com\t80\t/a/../b',
+                          'domain.com\t\t', 'a b\t\t/%09path'])
+
+    def test_jsonl(self):
+        rows = [json.loads(line) for line in self.run_(self.input, '--format', 'jsonl', '-f', 'uri,normalized')]
+        self.assertEqual(rows[1], {'uri': 'HTTP://Domain.com:80/a/../b', 'normalized': 'http://domain.com/b'})
+        self.assertEqual(len(rows), 4)
+
+    def test_workers(self):
+        single = self.run_(self.input, self.input, '-f', 'authority,query,fragment,normalized')
+        parallel = self.run_(self.input, self.input, '-f', 'authority,query,fragment,normalized',
+                             '--workers', '2', '--chunk-size', '2')
+        self.assertEqual(parallel, single)
+        self.assertEqual(len(single), 8)
+
+    def test_strictAndStats(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            lines = self.run_(self.input, '--strict', '--stats', '-f', 'scheme')
+        self.assertEqual(lines, ['http', 'HTTP', 'mailto'])
+        self.assertIn('3 URIs in', stderr.getvalue())
+        self.assertIn('1 invalid skipped', stderr.getvalue())
+
+    def test_unknownField(self):
+        with redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, cli.main, [self.input, '-f', 'host,nothing'])
+
+    def test_handlerMain(self):
+        self.assertEqual(uhandler.main([self.input, '-f', 'host', '-o', self.output]), 0)
+        with open(self.output) as result:
+            self.assertEqual(result.readline(), 'domain.com\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+__author__ = 'aliaksandr'
+
+import os
+import tempfile
+import unittest
+
+import src.uriHandler as uhandler
+from src.hostIndex import HostIndex
+
+RULES = ['example.com', '*.ads.example.com', ('.tracker.net', 'tracking'), 'Mixed.ORG', '.co.uk', 'bbc.co.uk']
+
+
+class TestHostIndex(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+        self.index = HostIndex(RULES)
+
+    def test_exactRule(self):
+        self.assertEqual(self.index.lookup('example.com'), 'example.com')
+        self.assertIsNone(self.index.lookup('www.example.com'))
+        self.assertEqual(self.index.lookup('MIXED.org'), 'Mixed.ORG')
+        self.assertIsNone(self.index.lookup('com'))
+        self.assertIsNone(self.index.lookup(''))
+
+    def test_wildcardRules(self):
+        self.assertIsNone(self.index.lookup('ads.example.com'))
+        self.assertEqual(self.index.lookup('x.ads.example.com'), '*.ads.example.com')
+        self.assertEqual(self.index.lookup('tracker.net'), 'tracking')
+        self.assertEqual(self.index.lookup('a.b.tracker.net'), 'tracking')
+        self.assertNotIn('tracker.network', self.index)
+
+    def test_mostSpecificWins(self):
+        self.assertEqual(self.index.lookup('bbc.co.uk'), 'bbc.co.uk')
+        self.assertEqual(self.index.lookup('www.bbc.co.uk'), '.co.uk')
+        self.assertEqual(self.index.lookup('other.co.uk'), '.co.uk')
+
+    def test_lookupMany(self):
+        uris = ['http://user@x.ads.example.com:80/path', 'http://example.com', '/relative', 'http://tracker.net/']
+        expected = ['*.ads.example.com', 'example.com', 'none', 'tracking']
+        self.assertEqual(self.index.lookupMany([self.uriHandler.parse(uri) for uri in uris], 'none'), expected)
+        self.assertEqual(self.index.lookupMany(self.uriHandler.parseMany(uris), 'none'), expected)
+
+    def test_saveLoad(self):
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            self.index.save(path)
+            loaded = HostIndex.load(path)
+        finally:
+            os.remove(path)
+        hosts = ['example.com', 'x.ads.example.com', 'a.tracker.net', 'www.bbc.co.uk', 'other.com']
+        self.assertEqual(loaded.lookupMany(hosts), self.index.lookupMany(hosts))
+        self.assertEqual(len(loaded), len(self.index))
+
+    def test_len(self):
+        self.assertEqual(len(self.index), len(RULES))
+        # the rules share the suffix example.com, every rule is counted once
+        index = HostIndex(['a.b.example.com', 'example.com', '*.example.com', '.example.com', 'example.com'])
+        self.assertEqual(len(index), 4)
+        self.assertEqual(len(HostIndex()), 0)
+
+    def test_invalidRule(self):
+        with self.assertRaises(ValueError):
+            HostIndex(['*.'])
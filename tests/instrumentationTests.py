@@ -0,0 +1,87 @@
+__author__ = 'aliaksandr'
+
+import time
+import unittest
+
+import src.instrumentation as instrumentation
+import src.uriParser as uparser
+from src.uriHandler import UriHandler
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_counts(self):
+        handler = UriHandler()
+        instrumentation.enable()
+        handler.getHost('http://domain.com/path')
+        handler.getHost('http://domain.com:8080/a/longer/path?with=query')
+        handler.normalize('HTTP://Domain.com/a/../b')
+        stats = instrumentation.stats()
+        self.assertEqual(stats['getHost'].calls, 2)
+        self.assertEqual(stats['parse'].calls, 2)
+        self.assertEqual(stats['normalize'].calls, 1)
+        self.assertTrue(stats['getHost'].regex >= stats['parse'].regex > 0)
+        self.assertTrue(stats['normalize'].regex > 0)
+        self.assertTrue(stats['getHost'].seconds >= stats['parse'].seconds > 0)
+        self.assertEqual(stats['getHost'].lengths, {32: 1, 64: 1})
+        self.assertNotIn('getPath', stats)
+
+    def test_sink(self):
+        events = []
+        instrumentation.enable(lambda *event: events.append(event))
+        UriHandler().getPath('http://domain.com/path')
+        self.assertEqual([(name, length) for name, length, _, _ in events],
+                         [('parse', 22), ('getPath', 22)])
+        self.assertTrue(all(regex > 0 for _, _, _, regex in events))
+
+    def test_resultsUnchanged(self):
+        handler = UriHandler()
+        uri = 'https://user@Domain.com:443/a/./b?x=1#frag'
+        expected = (handler.parse(uri), handler.normalize(uri), handler.getQuery(uri),
+                    handler.getAbsoluteURI('../c', uri))
+        instrumentation.enable()
+        self.assertEqual((handler.parse(uri), handler.normalize(uri), handler.getQuery(uri),
+                          handler.getAbsoluteURI('../c', uri)), expected)
+        self.assertRaises(uparser.UriValidationError, UriHandler(strict=True).parse, 'http://a b')
+
+    def test_disableRestores(self):
+        methods = dict(vars(UriHandler))
+        grammar = uparser._STR_GRAMMAR
+        instrumentation.enable()
+        self.assertTrue(instrumentation.isEnabled())
+        self.assertIsNot(vars(UriHandler)['getHost'], methods['getHost'])
+        self.assertIsNot(uparser._STR_GRAMMAR, grammar)
+        instrumentation.disable()
+        self.assertFalse(instrumentation.isEnabled())
+        self.assertEqual(dict(vars(UriHandler)), methods)
+        self.assertIs(uparser._STR_GRAMMAR, grammar)
+        UriHandler().getHost('http://domain.com/path')
+        self.assertEqual(instrumentation.stats(), {})
+
+    def test_disabledOverhead(self):
+        handler = UriHandler()
+        uris = ['http://domain%d.com/path?q=%d' % (i, i) for i in range(2000)]
+
+        def best():
+            elapsed = float('inf')
+            for _ in range(5):
+                start = time.perf_counter()
+                for uri in uris:
+                    handler.getHost(uri)
+                elapsed = min(elapsed, time.perf_counter() - start)
+            return elapsed
+
+        before = best()
+        instrumentation.enable()
+        instrumentation.disable()
+        after = best()
+        # the disabled handler runs the original functions, any difference is noise
+        self.assertFalse(hasattr(vars(UriHandler)['getHost'], '__wrapped__'))
+        self.assertTrue(after < before * 1.5, (before, after))
+
+
+if __name__ == '__main__':
+    unittest.main()
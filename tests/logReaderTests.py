@@ -0,0 +1,53 @@
+__author__ = 'aliaksandr'
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import src.logReader as lreader
+
+LOG = (b'127.0.0.1 - - [10/Oct/2000:13:55:36 -0700] "GET /apache_pb.gif?a=1 HTTP/1.0" 200 2326\n'
+       b'10.0.0.2 - frank [10/Oct/2000:13:55:37 -0700] "GET http://domain.com:8080/index.html HTTP/1.1" 200 51\n'
+       b'broken line\n'
+       b'10.0.0.3 - - [10/Oct/2000:13:55:38 -0700] "POST /api/v1/users#frag HTTP/1.1" 201 0')
+
+
+class TestLogReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def writeLog(self, name, data, compress=False):
+        path = os.path.join(self.directory, name)
+        with (gzip.open(path, 'wb') if compress else open(path, 'wb')) as file:
+            file.write(data)
+        return path
+
+    def test_readColumn(self):
+        reader = lreader.LogReader(self.writeLog('access.log', LOG))
+        parsed = list(reader)
+        self.assertEqual([p.path for p in parsed], ['/apache_pb.gif', '/index.html', '/api/v1/users'])
+        self.assertEqual(parsed[0].query, 'a=1')
+        self.assertEqual(parsed[1].host, 'domain.com')
+        self.assertEqual(parsed[1].port, '8080')
+        self.assertEqual(parsed[2].fragment, 'frag')
+        stats = reader.stats()
+        self.assertEqual((stats.lines, stats.uris, stats.skipped, stats.bytes), (4, 3, 1, len(LOG)))
+
+    def test_readPattern(self):
+        path = self.writeLog('access.log', LOG)
+        parsed = list(lreader.readLogUris(path, pattern='"[A-Z]+ (?P<uri>\\S+)'))
+        self.assertEqual([p.path for p in parsed], ['/apache_pb.gif', '/index.html', '/api/v1/users'])
+
+    def test_readGzip(self):
+        path = self.writeLog('access.log.gz', LOG, compress=True)
+        reader = lreader.LogReader(path)
+        self.assertEqual([p.path for p in reader], ['/apache_pb.gif', '/index.html', '/api/v1/users'])
+        self.assertEqual(reader.stats().bytes, len(LOG))
+
+    def test_readEmpty(self):
+        self.assertEqual(list(lreader.LogReader(self.writeLog('empty.log', b''))), [])
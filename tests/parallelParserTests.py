@@ -0,0 +1,32 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import src.parallelParser as pparser
+import src.uriHandler as uhandler
+
+
+class TestParallelParser(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+        self.uris = ['http://user%d@domain%d.com:%d/path/%d?p=%d#f%d' % (i, i % 7, 8000 + i, i, i, i)
+                     for i in range(250)]
+
+    def test_orderedResults(self):
+        results = list(pparser.parseParallel(iter(self.uris), workers=2, chunkSize=16))
+        self.assertEqual([parsed.uri for parsed in results], self.uris)
+        for parsed, uri in zip(results, self.uris):
+            self.assertEqual(parsed, self.uriHandler.parse(uri))
+
+    def test_unorderedResults(self):
+        results = list(self.uriHandler.parseParallel(self.uris, workers=2, chunkSize=16, ordered=False))
+        self.assertEqual(sorted(parsed.uri for parsed in results), sorted(self.uris))
+        for parsed in results:
+            self.assertEqual(parsed.host, self.uriHandler.getHost(parsed.uri))
+
+    def test_emptyInput(self):
+        self.assertEqual(list(pparser.parseParallel([], workers=1)), [])
+
+    def test_invalidArguments(self):
+        with self.assertRaises(ValueError):
+            list(pparser.parseParallel(self.uris, workers=0))
@@ -0,0 +1,102 @@
+__author__ = 'aliaksandr'
+
+import threading
+import unittest
+
+import src.parseCache as pcache
+import src.uriHandler as uhandler
+
+
+class TestParseCache(unittest.TestCase):
+    def test_hitsAndMisses(self):
+        cache = pcache.ParseCache(maxEntries=10)
+        first = cache.get('http://domain.com/path')
+        second = cache.get('http://domain.com/path')
+        self.assertIs(first, second)
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.size), (1, 1, 1))
+
+    def test_lruEviction(self):
+        cache = pcache.ParseCache(maxEntries=2)
+        cache.get('a')
+        cache.get('b')
+        cache.get('a')
+        cache.get('c')
+        self.assertEqual(cache.info().evictions, 1)
+        cache.get('a')
+        self.assertEqual(cache.info().hits, 2)
+        cache.get('b')
+        self.assertEqual(cache.info().misses, 4)
+
+    def test_byteBudget(self):
+        cache = pcache.ParseCache(maxBytes=1000)
+        for i in range(100):
+            cache.get('http://domain%d.com/path' % i)
+        info = cache.info()
+        self.assertTrue(info.bytes <= 1000)
+        self.assertTrue(info.evictions > 0)
+        self.assertEqual(info.size, len(cache))
+
+    def test_bytes(self):
+        cache = pcache.ParseCache(maxEntries=10)
+        self.assertEqual(bytes(cache.get(b'http://domain.com').host), b'domain.com')
+        self.assertEqual(bytes(cache.get(bytearray(b'http://domain.com')).host), b'domain.com')
+        self.assertEqual(cache.info().size, 1)
+
+    def test_invalidLimits(self):
+        with self.assertRaises(ValueError):
+            pcache.ParseCache()
+        with self.assertRaises(ValueError):
+            pcache.ParseCache(maxEntries=-1)
+
+    def test_threadSafety(self):
+        cache = pcache.ParseCache(maxEntries=50)
+        uris = ['http://domain%d.com/path' % i for i in range(100)]
+
+        def work():
+            for _ in range(20):
+                for uri in uris:
+                    self.assertEqual(cache.get(uri).host, uri[7:-5])
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, 4 * 20 * 100)
+        self.assertTrue(info.size <= 50)
+
+
+class TestCachedUriHandler(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler(cacheSize=100)
+
+    def test_cachedGetters(self):
+        uri = 'http://user@domain.com:9000/path?p1=v1#frag'
+        self.assertEqual(self.uriHandler.getHost(uri), 'domain.com')
+        self.assertEqual(self.uriHandler.getPort(uri), '9000')
+        self.assertEqual(self.uriHandler.getPath(uri), '/path')
+        info = self.uriHandler.cacheInfo()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_queryIsNotShared(self):
+        uri = 'http://domain.com/path?p1=v1'
+        query = self.uriHandler.getQuery(uri)
+        query['p2'] = 'v2'
+        self.assertEqual(self.uriHandler.getQuery(uri), {'p1': 'v1'})
+
+    def test_cachedParsedIsNotChanged(self):
+        uri = 'http://domain.com/path'
+        parsed = self.uriHandler.parse(uri)
+        for name, value in (('hostStart', 0), ('uri', 'zzz'), ('pathEnd', 0)):
+            with self.assertRaises(AttributeError):
+                setattr(parsed, name, value)
+        self.assertIs(self.uriHandler.parse(uri), parsed)
+        self.assertEqual(self.uriHandler.getHost(uri), 'domain.com')
+        self.assertEqual(self.uriHandler.getPath(uri), '/path')
+
+    def test_disabledCache(self):
+        handler = uhandler.UriHandler()
+        handler.getHost('http://domain.com')
+        self.assertEqual(handler.cacheInfo(), pcache.CacheInfo(0, 0, 0, 0, 0))
@@ -0,0 +1,54 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import src.uriHandler as uhandler
+from src.pathRouter import PathRouter
+
+ROUTES = ['/api/v1/users', '/api/v1/users/{id}', ('/api/v1/users/{id}/orders', 'orders'),
+          '/api/v1/users/me/orders', '/api/v1/{resource}/{id}/orders/{orderId}', '/static/{file*}', '/']
+
+
+class TestPathRouter(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+        self.router = PathRouter(ROUTES)
+
+    def test_staticRoutes(self):
+        self.assertEqual(self.router.match('/api/v1/users'), ('/api/v1/users', '/api/v1/users', {}))
+        self.assertEqual(self.router.match('/').template, '/')
+        self.assertIsNone(self.router.match('/api/v1'))
+        self.assertIsNone(self.router.match('/api/v1/users/'))
+
+    def test_parameters(self):
+        match = self.router.match('/api/v1/users/42/orders')
+        self.assertEqual(match.payload, 'orders')
+        self.assertEqual(match.params, {'id': '42'})
+        self.assertEqual(self.router.match('/api/v1/users/42').params, {'id': '42'})
+        self.assertEqual(self.router.match('/api/v1/items/7/orders/9').params,
+                         {'resource': 'items', 'id': '7', 'orderId': '9'})
+
+    def test_staticPreferredWithBacktracking(self):
+        self.assertEqual(self.router.match('/api/v1/users/me/orders').template, '/api/v1/users/me/orders')
+        # the static 'users' edge leads nowhere, the {resource} parameter matches
+        self.assertEqual(self.router.match('/api/v1/users/me/orders/5').params,
+                         {'resource': 'users', 'id': 'me', 'orderId': '5'})
+
+    def test_wildcard(self):
+        self.assertEqual(self.router.match('/static/css/site.css').params, {'file': 'css/site.css'})
+        self.assertEqual(self.router.match('/static').params, {'file': ''})
+        router = PathRouter(['/files/*'])
+        self.assertEqual(router.match('/files/a/b').params, {})
+
+    def test_matchParsedUri(self):
+        parsed = self.uriHandler.parse('http://domain.com/api/v1/users/42?q=1#top')
+        self.assertEqual(self.router.match(parsed).params, {'id': '42'})
+        self.assertEqual([match and match.template for match in self.router.matchMany(['/api/v1/users', '/none'])],
+                         ['/api/v1/users', None])
+
+    def test_invalidRoutes(self):
+        with self.assertRaises(ValueError):
+            self.router.add('/api/v1/users/{userId}')
+        with self.assertRaises(ValueError):
+            self.router.add('/static/{path*}/more')
+        self.assertEqual(len(self.router), len(ROUTES))
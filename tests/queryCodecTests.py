@@ -0,0 +1,63 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import src.queryCodec as qcodec
+import src.uriHandler as uhandler
+
+
+class TestQueryCodec(unittest.TestCase):
+    def test_decodeMultiValue(self):
+        query = qcodec.decodeQuery('a=1&b=2&a=3;c')
+        self.assertEqual(query.items(), [('a', '1'), ('b', '2'), ('a', '3'), ('c', '')])
+        self.assertEqual(query['a'], '1')
+        self.assertEqual(query.getAll('a'), ['1', '3'])
+        self.assertEqual(query.keys(), ['a', 'b', 'c'])
+        self.assertEqual(query.toDict(), {'a': '3', 'b': '2', 'c': ''})
+        self.assertEqual(len(query), 4)
+
+    def test_decodePercent(self):
+        query = qcodec.decodeQuery('q=caf%C3%A9+au+lait&p%20x=%2F')
+        self.assertEqual(query.items(), [('q', 'caf\xe9 au lait'), ('p x', '/')])
+        query = qcodec.decodeQuery('q=a+b%2F', unquote=False)
+        self.assertEqual(query['q'], 'a+b%2F')
+
+    def test_decodeLazy(self):
+        query = qcodec.decodeQuery('a=1&b=2&c=3&d=4', lazy=True)
+        self.assertEqual(query.get('b'), '2')
+        self.assertEqual(len(query._pairs), 2)
+        self.assertTrue('d' in query)
+        self.assertFalse('x' in query)
+        self.assertEqual(query.get('x', 'none'), 'none')
+        with self.assertRaises(KeyError):
+            query['x']
+        self.assertEqual(query, qcodec.decodeQuery('a=1&b=2&c=3&d=4'))
+
+    def test_decodeEmptyParts(self):
+        self.assertEqual(qcodec.decodeQuery('&&a=1&').items(), [('a', '1')])
+        self.assertEqual(qcodec.decodeQuery('').items(), [])
+        self.assertEqual(qcodec.decodeQuery('a=1;b=2', separators='&').items(), [('a', '1;b=2')])
+
+    def test_encode(self):
+        self.assertEqual(qcodec.encodeQuery({'a': 1, 'b': 'x y/z'}), 'a=1&b=x%20y%2Fz')
+        self.assertEqual(qcodec.encodeQuery([('a', ['1', '2']), ('caf\xe9', '~')], plus=True), 'a=1&a=2&caf%C3%A9=~')
+        self.assertEqual(qcodec.encodeQuery({'q': 'a b'}, plus=True), 'q=a+b')
+        self.assertEqual(qcodec.encodeQuery({'a': 'x y'}, ';', quote=False), 'a=x y')
+
+    def test_roundTrip(self):
+        pairs = [('k%d' % i, 'v %d/&=?' % i) for i in range(500)]
+        query = qcodec.decodeQuery(qcodec.encodeQuery(pairs))
+        self.assertEqual(query.items(), pairs)
+
+
+class TestUriHandlerQuery(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+
+    def test_getQueryWithoutValue(self):
+        self.assertEqual(self.uriHandler.getQuery('/root?a=1&flag&b=2'), {'a': '1', 'flag': '', 'b': '2'})
+
+    def test_getMultiQuery(self):
+        query = self.uriHandler.getMultiQuery('http://domain.com/?a=1&a=2#frag')
+        self.assertEqual(query.getAll('a'), ['1', '2'])
+        self.assertEqual(len(self.uriHandler.getMultiQuery('http://domain.com/')), 0)
@@ -0,0 +1,38 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import src.queryRewriter as qrewriter
+
+
+class TestQueryRewriter(unittest.TestCase):
+    def setUp(self):
+        self.rewriter = qrewriter.trackingRewriter()
+
+    def test_stripTracking(self):
+        uri = 'http://domain.com/path?id=1&utm_source=mail&fbclid=abc;page=2#frag'
+        self.assertEqual(self.rewriter.rewrite(uri), 'http://domain.com/path?id=1;page=2#frag')
+        self.assertEqual(self.rewriter.hits['dropPrefix:utm_'], 1)
+        self.assertEqual(self.rewriter.hits['drop:fbclid'], 1)
+
+    def test_dropWholeQuery(self):
+        self.assertEqual(self.rewriter.rewrite('http://domain.com/?utm_a=1&utm_b=2#f'), 'http://domain.com/#f')
+        self.assertEqual(self.rewriter.hits['dropPrefix:utm_'], 2)
+
+    def test_unchangedUriIsNotCopied(self):
+        uri = 'http://domain.com/path?id=1&notutm_source=2&xfbclid=3' + 'x' * 10
+        self.assertIs(self.rewriter.rewrite(uri), uri)
+        uri = 'http://domain.com/path#utm_source'
+        self.assertIs(self.rewriter.rewrite(uri), uri)
+        self.assertEqual(sum(self.rewriter.hits.values()), 0)
+
+    def test_keepOnlyAndRename(self):
+        rewriter = qrewriter.QueryRewriter(keepOnly=('id', 'q'), rename={'q': 'query'})
+        self.assertEqual(rewriter.rewrite('/search?q=x&id=1&session=2'), '/search?query=x&id=1')
+        self.assertEqual(rewriter.hits, {'keepOnly': 1, 'rename:q': 1})
+        uri = '/search?id=1'
+        self.assertIs(rewriter.rewrite(uri), uri)
+
+    def test_rewriteMany(self):
+        uris = ['/a?utm_x=1', '/b?x=1', '/c']
+        self.assertEqual(list(self.rewriter.rewriteMany(iter(uris))), ['/a', '/b?x=1', '/c'])
@@ -0,0 +1,52 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import src.uriHandler as uhandler
+from src.surt import surtHost, surtKey, surtKeys, surtRanges, surtToUri
+
+URIS = ['http://www.Example.com/path?b=2&a=1#top',
+        'https://user@Sub.example.com:443/',
+        'http://example.com:8080',
+        'http://10.0.0.1/a',
+        'http://[::1]:81/x?',
+        'http://examples.com/',
+        '/relative/path']
+KEYS = ['com,example)/path?a=1&b=2',
+        'com,example,sub)/',
+        'com,example:8080)/',
+        '10.0.0.1)/a',
+        '[::1]:81)/x',
+        'com,examples)/',
+        ')/relative/path']
+
+
+class TestSurt(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+
+    def test_surtKey(self):
+        self.assertEqual([surtKey(uri) for uri in URIS], KEYS)
+        self.assertEqual(surtHost('WWW.a.b.C.'), 'c,b,a')
+
+    def test_surtKeys(self):
+        self.assertEqual(surtKeys(URIS), KEYS)
+        self.assertEqual(surtKeys(self.uriHandler.parseMany(URIS + URIS)), KEYS + KEYS)
+
+    def test_surtToUri(self):
+        self.assertEqual(surtToUri(KEYS[0]), 'http://example.com/path?a=1&b=2')
+        self.assertEqual(surtToUri(KEYS[2], 'https'), 'https://example.com:8080/')
+        self.assertEqual(surtToUri(KEYS[3]), 'http://10.0.0.1/a')
+        self.assertEqual(surtToUri(KEYS[4]), 'http://[::1]:81/x')
+        for key in KEYS[:-1]:
+            self.assertEqual(surtKey(surtToUri(key)), key)
+        with self.assertRaises(ValueError):
+            surtToUri('com,example/path')
+
+    def test_surtRanges(self):
+        def inDomain(key, ranges):
+            return any(start <= key < stop for start, stop in ranges)
+        ranges = surtRanges('www.example.com')
+        self.assertEqual([inDomain(key, ranges) for key in KEYS], [True, True, True, False, False, False, False])
+        ranges = surtRanges('example.com', subdomains=False)
+        self.assertEqual([inDomain(key, ranges) for key in KEYS], [True, False, True, False, False, False, False])
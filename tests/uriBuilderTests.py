@@ -0,0 +1,57 @@
+__author__ = 'aliaksandr'
+
+import random
+import unittest
+
+import src.uriBuilder as ubuilder
+import src.uriHandler as uhandler
+
+
+class TestUriBuilder(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+
+    def test_buildChain(self):
+        uri = ubuilder.UriBuilder().appendScheme('http').appendAuthority('domain.com').appendPath('/root') \
+            .appendQuery({'k1': 'v1'}).appendFragment('frag').build()
+        self.assertEqual(uri, 'http://domain.com/root?k1=v1#frag')
+
+    def test_buildAuthority(self):
+        builder = ubuilder.UriBuilder('http://domain.com/path')
+        builder.buildAuthority('user', 'other.net', '9000')
+        self.assertEqual(builder.build(), 'http://user@other.net:9000/path')
+
+    def test_editParsed(self):
+        builder = self.uriHandler.builder('scheme://domain/path?query#frag')
+        builder.replacePath('/root/newpath').replaceScheme('http')
+        self.assertEqual(str(builder), 'http://domain/root/newpath?query#frag')
+        self.assertEqual(builder.authority, 'domain')
+
+    def test_reparseWhenSplitChanges(self):
+        builder = ubuilder.UriBuilder('/path')
+        builder.appendAuthority('localhost:8080')
+        self.assertEqual(builder.scheme, 'localhost')
+        self.assertEqual(builder.build(), self.uriHandler.appendAuthority('/path', 'localhost:8080'))
+
+    def test_matchesUriHandler(self):
+        rnd = random.Random(42)
+        operations = [('appendScheme', [('http',), ('ftp', ':')]),
+                      ('appendAuthority', [('domain.com',), ('u@h:80',)]),
+                      ('appendPath', [('/p',), ('/a/b',), ('p',)]),
+                      ('appendQuery', [({'k': 'v'},), ({'a': 1, 'b': 2}, ';')]),
+                      ('appendFragment', [('frag',), ('',), ('\xe9',)]),
+                      ('replaceScheme', [('http',), ('',), ('ftp', ':')]),
+                      ('replaceAuthority', [('domain.com',), ('',), ('user@[::1]:80',)]),
+                      ('replacePath', [('/p',), ('',), ('//x',)]),
+                      ('replaceQuery', [({'k': 'v'},), ({},)])]
+        starts = ['', 'http://domain.com/path?q=1#f', 'scheme:data@domain.com/root', '/root?x', 'domain.com', '?#',
+                  '#\u20ac ?', '\xe9:x/p#a\u20acb', 'http://d\xf6main.com/#\xe9']
+        for _ in range(2000):
+            uri = rnd.choice(starts)
+            builder = self.uriHandler.builder(uri)
+            for _ in range(rnd.randint(1, 5)):
+                name, choices = rnd.choice(operations)
+                args = rnd.choice(choices)
+                uri = getattr(self.uriHandler, name)(uri, *args)
+                getattr(builder, name)(*args)
+                self.assertEqual(builder.build(), uri)
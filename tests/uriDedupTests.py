@@ -0,0 +1,77 @@
+__author__ = 'aliaksandr'
+
+import os
+import tempfile
+import unittest
+
+from src.uriDedup import UriBloomFilter, UriHashSet, canonicalUri, uriHash, uriHashes
+
+URIS = ['http://domain.com/path/%d?q=%d' % (index, index * 7) for index in range(3000)]
+
+
+class TestUriDedup(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_canonicalHash(self):
+        self.assertEqual(uriHash('HTTP://Domain.com:80/a/./b#top'), uriHash('http://domain.com/a/b'))
+        self.assertNotEqual(uriHash('http://domain.com/a'), uriHash('http://domain.com/b'))
+        self.assertEqual(uriHash('http://domain.com/a', 128) & (2 ** 64 - 1), int(uriHashes(['http://domain.com/a'], 128)[0, 0]))
+        with self.assertRaises(ValueError):
+            uriHash('http://domain.com/a', 32)
+
+    def test_opaqueUrisAreDistinct(self):
+        # no '://', the case after 'scheme:' is significant
+        self.assertEqual(canonicalUri('URN:ISBN:0451450523'), 'urn:ISBN:0451450523')
+        self.assertNotEqual(uriHash('urn:ISBN:0451450523'), uriHash('urn:isbn:0451450523'))
+        self.assertNotEqual(uriHash('news:Comp.Infosystems'), uriHash('news:comp.infosystems'))
+        hashSet = UriHashSet(16)
+        self.assertEqual(hashSet.addMany(['urn:ISBN:0451450523', 'urn:isbn:0451450523', 'URN:ISBN:0451450523']).tolist(),
+                         [True, True, False])
+
+    def test_hashSet(self):
+        for bits in (64, 128):
+            hashSet = UriHashSet(16, bits)
+            added = hashSet.addMany(URIS[:2000] + URIS[:10])
+            self.assertEqual(added.tolist(), [True] * 2000 + [False] * 10)
+            self.assertEqual(hashSet.addMany(URIS[1500:2500]).tolist(), [False] * 500 + [True] * 500)
+            self.assertEqual(len(hashSet), 2500)
+            self.assertEqual(hashSet.containsMany(URIS).tolist(), [True] * 2500 + [False] * 500)
+            self.assertTrue(hashSet.add('http://other.com/'))
+            self.assertIn('HTTP://OTHER.COM:80/#fragment', hashSet)
+
+    def test_hashSetMapped(self):
+        hashSet = UriHashSet(len(URIS))
+        hashSet.addMany(URIS[:1000])
+        hashSet.save(self.path)
+        mapped = UriHashSet.load(self.path, writable=True)
+        self.assertEqual(len(mapped), 1000)
+        self.assertEqual(mapped.addMany(URIS[900:1100]).sum(), 100)
+        mapped.flush()
+        loaded = UriHashSet.load(self.path)
+        self.assertEqual(len(loaded), 1100)
+        self.assertEqual(loaded.containsMany(URIS).sum(), 1100)
+        with self.assertRaises(ValueError):
+            loaded.addMany(URIS[2000:])
+
+    def test_bloomFilter(self):
+        for bits in (64, 128):
+            bloom = UriBloomFilter(1000, 0.01, bits)
+            self.assertEqual(bloom.addMany(URIS[:1000] + URIS[:1]).tolist()[-1], False)
+            self.assertTrue(bloom.containsMany(URIS[:1000]).all())
+            self.assertLess(bloom.containsMany(URIS[1000:]).mean(), 0.03)
+            self.assertIn(URIS[5] + '#fragment', bloom)
+
+    def test_bloomFilterMapped(self):
+        bloom = UriBloomFilter(1000)
+        bloom.addMany(URIS[:500])
+        bloom.save(self.path)
+        loaded = UriBloomFilter.load(self.path)
+        self.assertEqual((len(loaded), loaded.hashes), (len(bloom), bloom.hashes))
+        self.assertTrue(loaded.containsMany(URIS[:500]).all())
+        with self.assertRaises(ValueError):
+            UriHashSet.load(self.path)
@@ -1,3 +1,4 @@
+import asyncio
 import random
 import unittest
 
@@ -314,6 +315,14 @@ class TestUriHandler(unittest.TestCase):
         self.assertEqual(queryParams, {'k1': 'v1', 'k2': '42', 't1': '42', 't2': 'test'})
         self.assertEqual(len(uri), len('domain.com?t1=42&t2=test&k1=v1&k2=42'))
 
+    def test_queryToString(self):
+        self.assertEqual(self.uriHandler.queryToString({}), '')
+        self.assertEqual(self.uriHandler.queryToString({'k1': 'v 1', 'k2': 42}, ';'), 'k1=v 1;k2=42')
+        # the values are converted with str, lists are not expanded
+        self.assertEqual(self.uriHandler.queryToString({'a': [1, 2]}), 'a=[1, 2]')
+        self.assertEqual(self.uriHandler.appendQuery('domain.com?t=1', {'a': [1, 2]}), 'domain.com?t=1&a=[1, 2]')
+        self.assertEqual(self.uriHandler.replaceQuery('domain.com?t=1#f', {'a': [1, 2]}), 'domain.com?a=[1, 2]#f')
+
     def test_appendFragment(self):
         uri = self.uriHandler.appendFragment('', 'fragment')
         self.assertEqual(uri, '#fragment')
@@ -364,6 +373,28 @@ class TestUriHandler(unittest.TestCase):
         uri = self.uriHandler.replaceQuery('scheme://domain/path/path?a=1&nn=11#fr', {})
         self.assertEqual(len(uri), len('scheme://domain/path/path#fr'))
 
+    def test_strictHandler(self):
+        for handler in (uhandler.UriHandler(strict=True), uhandler.UriHandler(cacheSize=10, strict=True)):
+            self.assertEqual(handler.getHost('http://domain.com:80/path'), 'domain.com')
+            with self.assertRaises(ValueError):
+                handler.getHost('http://domain.com:80x/path')
+
+    def test_strictBackends(self):
+        uris = ['http://domain.com/a', 'http://domain.com:80x/b']
+        handler = uhandler.UriHandler(strict=True)
+
+        async def collect():
+            return [parsed async for parsed in handler.parseAsync(uris)]
+        with self.assertRaises(ValueError):
+            handler.parseMany(uris)
+        with self.assertRaises(ValueError):
+            list(handler.parseParallel(uris, workers=1))
+        with self.assertRaises(ValueError):
+            asyncio.run(collect())
+        # the lenient handler accepts them
+        self.assertEqual(len(self.uriHandler.parseMany(uris)), 2)
+        self.assertEqual(len(list(self.uriHandler.parseParallel(uris, workers=1))), 2)
+
 
 # if __name__ == '__main__':
 #     suite = unittest.TestLoader().loadTestsFromTestCase(TestUriHandler)
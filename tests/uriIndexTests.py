@@ -0,0 +1,109 @@
+__author__ = 'aliaksandr'
+
+import os
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy
+
+import src.uriIndex as uindex
+from src.uriIndex import UriIndex, appendIndex, writeIndex
+import src.uriParser as uparser
+
+URIS = ['http://user@domain.com:9000/root/child?p1=v1#frag',
+        'http://[FEDC:BA98::3210]:80/index.html',
+        'https://dömain.com/päth?q=ü',
+        '/root?p1=v1&p2=v2#fragment',
+        '',
+        'http://domain.com']
+
+
+class TestUriIndex(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_randomAccess(self):
+        self.assertEqual(writeIndex(self.path, URIS), len(URIS))
+        index = UriIndex(self.path, verify=True)
+        self.assertEqual(len(index), len(URIS))
+        for number, uri in enumerate(URIS):
+            parsed = uparser.parse(uri)
+            self.assertEqual(index.uri(number), uri)
+            self.assertEqual(index.host(number), parsed.host)
+            self.assertEqual(index.path(number), parsed.path)
+            self.assertEqual(index.query(number), parsed.query)
+            self.assertEqual(index.component(number, 'fragment'), parsed.fragment)
+            self.assertEqual(index[number], uparser.parse(uri.encode('utf-8'), asBytes=True))
+        self.assertEqual(index.host(-1), 'domain.com')
+        self.assertRaises(IndexError, index.uri, len(URIS))
+
+    def test_zeroCopyColumns(self):
+        uris = ['http://domain%d.com/path/%d' % (number, number) for number in range(1000)]
+        writeIndex(self.path, uris)
+        index = UriIndex(self.path)
+        chunk = index.chunks[0]
+        self.assertTrue(numpy.shares_memory(chunk.spans, chunk.data.base))
+        self.assertFalse(chunk.spans.flags.writeable)
+        self.assertIs(index.spans, chunk.spans)
+        self.assertEqual(index.lengths('host').tolist(), [len('domain%d.com' % number) for number in range(1000)])
+        starts, ends = chunk.column('path')
+        self.assertEqual(chunk.data[starts[7]:ends[7]].tobytes(), b'/path/7')
+
+    def test_littleEndian(self):
+        writeIndex(self.path, ['http://a.com/b', 'c'])
+        with open(self.path, 'rb') as source:
+            data = source.read()
+        # header (16 bytes), chunk header (32 bytes), 3 starts, 2 x 18 spans
+        self.assertEqual(struct.unpack_from('<3q', data, 48), (0, 14, 15))
+        self.assertEqual(struct.unpack_from('<18i', data, 72), uparser.parse('http://a.com/b').spans())
+
+    def test_byteSwap(self):
+        native = uindex._packChunk(['http://a.com/b'])
+        # on a machine of the other byte order the offsets are swapped
+        other = 'big' if sys.byteorder == 'little' else 'little'
+        with mock.patch.object(sys, 'byteorder', other):
+            swapped = uindex._packChunk(['http://a.com/b'])
+        order = '>' if other == 'big' else '<'
+        self.assertEqual(struct.unpack_from(order + '2q18i', swapped, 32), struct.unpack_from('=2q18i', native, 32))
+
+    def test_append(self):
+        uris = ['http://domain.com/%d' % number for number in range(250)]
+        writeIndex(self.path, uris[:100], chunkSize=30)
+        before = UriIndex(self.path)
+        self.assertEqual(appendIndex(self.path, uris[100:], chunkSize=64), 150)
+        index = UriIndex(self.path, verify=True)
+        self.assertEqual((len(before), len(index), len(index.chunks)), (100, 250, 7))
+        self.assertEqual([index.path(number) for number in range(250)], ['/%d' % number for number in range(250)])
+        self.assertEqual([parsed.path for parsed in index], [('/%d' % number).encode() for number in range(250)])
+        self.assertEqual(index.spans.shape, (250, 18))
+
+    def test_damagedFile(self):
+        writeIndex(self.path, URIS)
+        with open(self.path, 'r+b') as output:
+            output.seek(-20, os.SEEK_END)
+            output.write(b'X')
+        self.assertRaises(ValueError, UriIndex, self.path, True)
+        with open(self.path, 'ab') as output:
+            output.write(b'CHNK')
+        self.assertRaises(ValueError, UriIndex, self.path)
+        with open(self.path, 'wb') as output:
+            output.write(b'not an index file')
+        self.assertRaises(ValueError, UriIndex, self.path)
+        self.assertRaises(ValueError, appendIndex, self.path, URIS)
+
+    def test_empty(self):
+        os.remove(self.path)
+        self.assertEqual(appendIndex(self.path, []), 0)
+        index = UriIndex(self.path)
+        self.assertEqual((len(index), index.spans.shape), (0, (0, 18)))
+
+
+if __name__ == '__main__':
+    unittest.main()
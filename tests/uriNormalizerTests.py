@@ -0,0 +1,63 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import src.uriHandler as uhandler
+import src.uriNormalizer as unormalizer
+
+
+class TestUriNormalizer(unittest.TestCase):
+    def setUp(self):
+        self.uriHandler = uhandler.UriHandler()
+
+    def test_lowercaseSchemeAndHost(self):
+        uri = self.uriHandler.normalize('HTTP://User@Example.COM/Path')
+        self.assertEqual(uri, 'http://User@example.com/Path')
+        uri = self.uriHandler.normalize('http://[FE80::1]/')
+        self.assertEqual(uri, 'http://[fe80::1]/')
+
+    def test_noAuthorityIsKept(self):
+        # without '://' there is no host, the text after the scheme keeps its case
+        self.assertEqual(self.uriHandler.normalize('urn:ISBN:0451450523'), 'urn:ISBN:0451450523')
+        self.assertEqual(self.uriHandler.normalize('news:Comp.Infosystems'), 'news:Comp.Infosystems')
+        self.assertEqual(self.uriHandler.normalize('NEWS:Comp.Infosystems'), 'news:Comp.Infosystems')
+        self.assertEqual(self.uriHandler.normalize('http:Example.com:80/%7e'), 'http:Example.com:80/~')
+
+    def test_percentEncoding(self):
+        uri = self.uriHandler.normalize('http://example.com/%7euser/%2fdata?q=%c3%a9')
+        self.assertEqual(uri, 'http://example.com/~user/%2Fdata?q=%C3%A9')
+        uri = self.uriHandler.normalize('http://E%58ample.com/')
+        self.assertEqual(uri, 'http://example.com/')
+
+    def test_dotSegments(self):
+        uri = self.uriHandler.normalize('http://example.com/a/b/c/./../../g')
+        self.assertEqual(uri, 'http://example.com/a/g')
+        uri = self.uriHandler.normalize('http://example.com/a/%2E%2E/b/.')
+        self.assertEqual(uri, 'http://example.com/b/')
+
+    def test_defaultPort(self):
+        self.assertEqual(self.uriHandler.normalize('http://example.com:80/'), 'http://example.com/')
+        self.assertEqual(self.uriHandler.normalize('https://example.com:443'), 'https://example.com')
+        self.assertEqual(self.uriHandler.normalize('http://example.com:443/'), 'http://example.com:443/')
+        self.assertEqual(self.uriHandler.normalize('http://example.com:/'), 'http://example.com/')
+        self.assertEqual(self.uriHandler.normalize('https://[::1]:443/'), 'https://[::1]/')
+
+    def test_normalUriIsNotCopied(self):
+        uri = 'http://example.com/path/' + 'x' * 10 + '?q=%2F#frag'
+        self.assertIs(self.uriHandler.normalize(uri), uri)
+        self.assertIs(self.uriHandler.normalize(''), '')
+
+    def test_defaultSchemeAndAuthority(self):
+        self.assertEqual(self.uriHandler.normalize('Domain.com/x', scheme='http'), 'http://domain.com/x')
+        self.assertEqual(self.uriHandler.normalize('/x', 'a.com', 'http'), 'http://a.com/x')
+        self.assertEqual(self.uriHandler.normalize('ftp://b.com/x', 'a.com', 'http'), 'ftp://b.com/x')
+
+    def test_normalizeMany(self):
+        uris = ['HTTP://A.com:80/./x', 'http://a.com/x']
+        self.assertEqual(self.uriHandler.normalizeMany(uris), ['http://a.com/x', 'http://a.com/x'])
+
+    def test_removeDotSegments(self):
+        self.assertEqual(unormalizer.removeDotSegments('/a/b/c/./../../g'), '/a/g')
+        self.assertEqual(unormalizer.removeDotSegments('mid/content=5/../6'), 'mid/6')
+        self.assertEqual(unormalizer.removeDotSegments('/..'), '/')
+        self.assertEqual(unormalizer.removeDotSegments('/a//b'), '/a//b')
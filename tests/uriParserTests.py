@@ -0,0 +1,169 @@
+__author__ = 'aliaksandr'
+
+import pickle
+import unittest
+
+import src.uriParser as uparser
+
+
+class TestUriParser(unittest.TestCase):
+    def test_parseEmpty(self):
+        parsed = uparser.parse('')
+        self.assertEqual(parsed.components(), ('',) * len(uparser.COMPONENTS))
+
+    def test_parseFullUri(self):
+        parsed = uparser.parse('http://user@domain.com:9000/root/child?p1=v1&p2=v2#fragment')
+        self.assertEqual(parsed.scheme, 'http')
+        self.assertEqual(parsed.separator, '://')
+        self.assertEqual(parsed.authority, 'user@domain.com:9000')
+        self.assertEqual(parsed.userinfo, 'user')
+        self.assertEqual(parsed.host, 'domain.com')
+        self.assertEqual(parsed.port, '9000')
+        self.assertEqual(parsed.path, '/root/child')
+        self.assertEqual(parsed.query, 'p1=v1&p2=v2')
+        self.assertEqual(parsed.fragment, 'fragment')
+
+    def test_parseIpV6(self):
+        parsed = uparser.parse('http://[FEDC:BA98::3210]:80/index.html')
+        self.assertEqual(parsed.host, 'FEDC:BA98::3210')
+        self.assertEqual(parsed.port, '80')
+        self.assertEqual(parsed.path, '/index.html')
+
+    def test_parseRelative(self):
+        parsed = uparser.parse('/root?q=1#frag')
+        self.assertEqual(parsed.scheme, '')
+        self.assertEqual(parsed.authority, '')
+        self.assertEqual(parsed.path, '/root')
+        self.assertEqual(parsed.query, 'q=1')
+        self.assertEqual(parsed.fragment, 'frag')
+
+    def test_parsedIsImmutable(self):
+        parsed = uparser.parse('http://domain.com')
+        with self.assertRaises(AttributeError):
+            parsed.host = 'other.com'
+        for name in ('uri', 'hostStart', 'pathEnd', 'other'):
+            with self.assertRaises(AttributeError):
+                setattr(parsed, name, 0)
+            with self.assertRaises(AttributeError):
+                delattr(parsed, name)
+        self.assertEqual((parsed.uri, parsed.host), ('http://domain.com', 'domain.com'))
+
+    def test_parsedPickles(self):
+        parsed = uparser.parse('http://user@domain.com:9000/root?q=1#frag')
+        copy = pickle.loads(pickle.dumps(parsed))
+        self.assertEqual(copy, parsed)
+        self.assertEqual(copy.spans(), parsed.spans())
+
+    def test_parsedKeepsOffsets(self):
+        uri = 'http://user@domain.com:9000/root?q=1#frag'
+        parsed = uparser.parse(uri)
+        self.assertIs(parsed.uri, uri)
+        self.assertEqual((parsed.hostStart, parsed.hostEnd), (12, 22))
+        self.assertEqual(uparser.ParsedUri(uri, parsed.spans()), parsed)
+
+    def test_parsedComponents(self):
+        parsed = uparser.parse('http://domain.com/path#frag')
+        self.assertEqual(parsed.components(), ('http', '://', 'domain.com', '', 'domain.com', '', '/path', '', 'frag'))
+
+    def test_parseBytes(self):
+        data = b'http://user@domain.com:9000/root?q=1#frag'
+        parsed = uparser.parse(data)
+        self.assertIsInstance(parsed.host, memoryview)
+        self.assertEqual(parsed.host.obj, data)
+        self.assertEqual(bytes(parsed.host), b'domain.com')
+        self.assertEqual(parsed.components(), tuple(part.encode() for part in uparser.parse(data.decode()).components()))
+
+    def test_parseBytesAsBytes(self):
+        parsed = uparser.parse(bytearray(b'http://[::1]:80/index.html'), asBytes=True)
+        self.assertEqual(parsed.host, b'::1')
+        self.assertEqual(parsed.port, b'80')
+        self.assertEqual(parsed.path, b'/index.html')
+
+    def test_parseMemoryview(self):
+        buffer = bytearray(b'GET http://domain.com/path?q=1 HTTP/1.1')
+        parsed = uparser.parse(memoryview(buffer)[4:30])
+        self.assertEqual(bytes(parsed.host), b'domain.com')
+        self.assertEqual(bytes(parsed.query), b'q=1')
+
+    def test_parseNonAsciiBytes(self):
+        data = 'http://domain.com/caf\xe9#fr\xe9'.encode('utf-8')
+        parsed = uparser.parse(data, asBytes=True)
+        self.assertEqual(uparser.quoteNonAscii(parsed.path), b'/caf%C3%A9')
+        self.assertEqual(parsed.fragment, 'fr\xe9'.encode('utf-8'))
+        self.assertEqual(uparser.quoteNonAscii(data), b'http://domain.com/caf%C3%A9#fr%C3%A9')
+
+    def test_nonAsciiStr(self):
+        # \w and str.lstrip() are not ASCII only
+        self.assertEqual(uparser.parse('http://h/#a\u20acb').fragment, 'a')
+        self.assertEqual(uparser.parse('http://h/#caf\xe9').fragment, 'caf\xe9')
+        self.assertEqual(uparser.parse('\xabx\xbb:foo').scheme, '')
+        self.assertEqual(uparser.parse('\xe9:x').scheme, '\xe9')
+        self.assertEqual(uparser.parse('\u2003http://x').scheme, 'http')
+
+    def test_bytesMatchStr(self):
+        uris = ['http://h/#caf\xe9', '\xe9:x', '\u20ac:x/y', 'http://h/p#a\u20acb c', 'http://d\xf6main.com:80/p\xe4th?q=\xfc',
+                '\xe9t\xe9.com/path', ' \t http://domain.com/x', '\xa0http://domain.com', 'http://[::1]:8\xe9/x',
+                'caf\xe9@h\xf6st:\xe9/#\U0001f600x', '\xabx\xbb:foo', '\u2003http://x', ' \u20ac:1\t @[[']
+        for uri in uris:
+            expected = tuple(part.encode('utf-8') for part in uparser.parse(uri).components())
+            data = uri.encode('utf-8')
+            self.assertEqual(uparser.parse(data, asBytes=True).components(), expected, uri)
+            self.assertEqual(tuple(bytes(part) for part in uparser.parse(data).components()), expected, uri)
+            buffer = bytearray(b'GET ' + data + b' HTTP/1.1')
+            view = memoryview(buffer)[4:4 + len(data)]
+            self.assertEqual(tuple(bytes(part) for part in uparser.parse(view).components()), expected, uri)
+
+    def test_memoryviewIsNotCopied(self):
+        buffer = bytearray(b'GET http://domain.com/path?q=1 HTTP/1.1')
+        parsed = uparser.parse(memoryview(buffer)[4:30])
+        self.assertIs(parsed.host.obj, buffer)
+        self.assertIs(uparser.parse(memoryview(buffer)).path.obj, buffer)
+        # the components are views, they show the changes of the buffer
+        buffer[11:17] = b'DOMAIN'
+        self.assertEqual(bytes(parsed.host), b'DOMAIN.com')
+
+    def test_strictKeepsSpans(self):
+        for uri in ('http://user:pw@domain.com:9000/root/child?p1=v1&p2=/?#frag',
+                    'http://[FEDC:BA98::3210]:80/index.html', 'mailto:user@domain.com',
+                    'root/child?q=1', 'http://d%41main.com/%7Euser',
+                    'mailto:a@b@c', 'urn:isbn:0-486-27557-4', 'http://u%3A:p@[v1.x]:8/?q=%2F#f%20'):
+            self.assertEqual(uparser.parse(uri, strict=True).spans(), uparser.parse(uri).spans())
+
+    def test_strictErrorPosition(self):
+        cases = (('http://dom ain.com/', 10, 'host'),
+                 ('http://domain.com:8x/', 19, 'port'),
+                 ('http://us{er@domain.com/', 9, 'userinfo'),
+                 ('http://a@b@domain.com/', 10, 'host'),
+                 ('http://[::g]/', 8, 'host'),
+                 ('http://domain.com/%zz', 18, 'path'),
+                 ('http://domain.com/?q=<1>', 21, 'query'),
+                 ('http://domain.com/#a#b', 20, 'fragment'),
+                 ('1http:/root', 5, 'path'),
+                 ('http://us%zzer@domain.com/', 9, 'userinfo'),
+                 ('http://dom%4gin.com/', 10, 'host'),
+                 ('http://domain.com/#fr%g', 21, 'fragment'),
+                 ('http://domain.com/#fr\xe9', 21, 'fragment'),
+                 ('mailto:a[b', 8, 'path'),
+                 ('//h:8x/', 5, 'port'),
+                 ('//a@b@c/', 5, 'host'),
+                 ('//[::g]/', 3, 'host'),
+                 (' http://domain.com', 0, 'path'))
+        for uri, offset, component in cases:
+            with self.assertRaises(uparser.UriValidationError) as context:
+                uparser.validate(uri)
+            self.assertEqual((context.exception.offset, context.exception.component), (offset, component), uri)
+            self.assertIs(context.exception.uri, uri)
+
+    def test_errorPickles(self):
+        try:
+            uparser.validate('http://a b')
+        except uparser.UriValidationError as error:
+            copy = pickle.loads(pickle.dumps(error))
+        self.assertEqual((copy.uri, copy.offset, copy.component, str(copy)),
+                         ('http://a b', 8, 'host', "invalid host at offset 8: 'http://a b'"))
+
+    def test_strictBytes(self):
+        self.assertEqual(uparser.parse(b'http://domain.com/a?b', asBytes=True, strict=True).query, b'b')
+        with self.assertRaises(uparser.UriValidationError) as context:
+            uparser.parse('http://domain.com/caf\xe9'.encode('utf-8'), strict=True)
+        self.assertEqual(context.exception.offset, 21)
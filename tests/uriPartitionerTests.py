@@ -0,0 +1,70 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import numpy
+
+from src.batchParser import parseMany
+from src.uriPartitioner import UriPartitioner, jumpHash, registrableDomain
+
+URIS = ['http://host%d.site%d.com:%d/path/%d' % (index, index % 300, 8000 + index % 3, index) for index in range(20000)]
+
+
+class TestUriPartitioner(unittest.TestCase):
+    def test_jumpHashReference(self):
+        def reference(key, buckets):
+            bucket, jump = -1, 0
+            while jump < buckets:
+                bucket = jump
+                key = (key * 2862933555777941757 + 1) % 2 ** 64
+                jump = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+            return bucket
+        keys = [(index * 0x9E3779B97F4A7C15) % 2 ** 64 for index in range(2000)]
+        for buckets in (1, 2, 10, 1000):
+            self.assertEqual(jumpHash(keys, buckets).tolist(), [reference(key, buckets) for key in keys])
+
+    def test_keys(self):
+        uri = 'http://user@WWW.Shop.Example.co.uk:8080/path'
+        self.assertEqual(UriPartitioner(4).keyOf(uri), 'www.shop.example.co.uk')
+        self.assertEqual(UriPartitioner(4, key='domain').keyOf(uri), 'example.co.uk')
+        self.assertEqual(UriPartitioner(4, key='hostPort').keyOf(uri), 'www.shop.example.co.uk:8080')
+        self.assertEqual(UriPartitioner(4, key=lambda parsed: parsed.scheme).keyOf(uri), 'http')
+        self.assertEqual(registrableDomain('a.b.example.com'), 'example.com')
+        self.assertEqual(registrableDomain('10.0.0.1'), '10.0.0.1')
+        with self.assertRaises(ValueError):
+            UriPartitioner(4, key='path')
+
+    def test_sameKeySamePartition(self):
+        for mode in ('jump', 'ring'):
+            partitioner = UriPartitioner(16, key='domain', mode=mode)
+            ids = partitioner.partitionMany(['http://a.example.com/1', 'http://b.example.com/2', 'http://example.com'])
+            self.assertEqual(len(set(ids.tolist())), 1)
+            self.assertEqual(partitioner.partition('http://c.example.com/'), ids[0])
+
+    def test_batchMatchesIterable(self):
+        batch = parseMany(URIS[:500])
+        for key in ('host', 'domain', 'hostPort'):
+            for mode in ('jump', 'ring'):
+                partitioner = UriPartitioner(7, key=key, mode=mode)
+                ids = partitioner.partitionMany(batch)
+                self.assertEqual(ids.dtype, numpy.int32)
+                self.assertEqual(ids.tolist(), partitioner.partitionMany(URIS[:500]).tolist())
+
+    def test_addingNodeMovesOneNth(self):
+        for mode in ('jump', 'ring'):
+            for count in (5, 20):
+                before = UriPartitioner(count, mode=mode).partitionMany(URIS)
+                after = UriPartitioner(count + 1, mode=mode).partitionMany(URIS)
+                moved = before != after
+                # every moved key goes to the new node, about 1/(N + 1) of them
+                self.assertTrue((after[moved] == count).all())
+                self.assertLess(abs(moved.mean() - 1.0 / (count + 1)), 0.35 / (count + 1), (mode, count))
+                self.assertLess(numpy.bincount(after).max(), 1.6 * len(URIS) / (count + 1))
+
+    def test_removingRingNode(self):
+        nodes = ['node-a', 'node-b', 'node-c', 'node-d']
+        before = UriPartitioner(nodes, mode='ring').partitionMany(URIS)
+        after = UriPartitioner(nodes[:1] + nodes[2:], mode='ring').partitionMany(URIS)
+        names = numpy.array(nodes)
+        kept = names[before] != 'node-b'
+        self.assertTrue((names[before][kept] == numpy.array(nodes[:1] + nodes[2:])[after][kept]).all())
@@ -0,0 +1,57 @@
+__author__ = 'aliaksandr'
+
+import unittest
+
+import src.uriHandler as uhandler
+import src.uriResolver as uresolver
+
+BASE = 'http://a/b/c/d;p?q'
+
+# RFC3986 section 5.4
+NORMAL = [('g:h', 'g:h'), ('g', 'http://a/b/c/g'), ('./g', 'http://a/b/c/g'), ('g/', 'http://a/b/c/g/'),
+          ('/g', 'http://a/g'), ('//g', 'http://g'), ('?y', 'http://a/b/c/d;p?y'), ('g?y', 'http://a/b/c/g?y'),
+          ('#s', 'http://a/b/c/d;p?q#s'), ('g#s', 'http://a/b/c/g#s'), ('g?y#s', 'http://a/b/c/g?y#s'),
+          (';x', 'http://a/b/c/;x'), ('g;x', 'http://a/b/c/g;x'), ('g;x?y#s', 'http://a/b/c/g;x?y#s'),
+          ('', 'http://a/b/c/d;p?q'), ('.', 'http://a/b/c/'), ('./', 'http://a/b/c/'), ('..', 'http://a/b/'),
+          ('../', 'http://a/b/'), ('../g', 'http://a/b/g'), ('../..', 'http://a/'), ('../../', 'http://a/'),
+          ('../../g', 'http://a/g')]
+
+ABNORMAL = [('../../../g', 'http://a/g'), ('../../../../g', 'http://a/g'), ('/./g', 'http://a/g'),
+            ('/../g', 'http://a/g'), ('g.', 'http://a/b/c/g.'), ('.g', 'http://a/b/c/.g'),
+            ('g..', 'http://a/b/c/g..'), ('..g', 'http://a/b/c/..g'), ('./../g', 'http://a/b/g'),
+            ('./g/.', 'http://a/b/c/g/'), ('g/./h', 'http://a/b/c/g/h'), ('g/../h', 'http://a/b/c/h'),
+            ('g;x=1/./y', 'http://a/b/c/g;x=1/y'), ('g;x=1/../y', 'http://a/b/c/y'),
+            ('g?y/./x', 'http://a/b/c/g?y/./x'), ('g?y/../x', 'http://a/b/c/g?y/../x'),
+            ('g#s/./x', 'http://a/b/c/g#s/./x'), ('g#s/../x', 'http://a/b/c/g#s/../x'), ('http:g', 'http:g')]
+
+
+class TestUriResolver(unittest.TestCase):
+    def setUp(self):
+        self.resolver = uresolver.Resolver(BASE)
+
+    def test_normalExamples(self):
+        for ref, target in NORMAL:
+            self.assertEqual(self.resolver.resolve(ref), target, ref)
+
+    def test_abnormalExamples(self):
+        for ref, target in ABNORMAL:
+            self.assertEqual(self.resolver.resolve(ref), target, ref)
+
+    def test_resolveMany(self):
+        refs = [ref for ref, _ in NORMAL]
+        self.assertEqual(self.resolver.resolveMany(refs), [target for _, target in NORMAL])
+
+    def test_baseWithoutPath(self):
+        self.assertEqual(uresolver.resolve('http://a', 'g'), 'http://a/g')
+        self.assertEqual(uresolver.resolve('http://a?q', '#f'), 'http://a?q#f')
+
+    def test_baseWithDotSegments(self):
+        self.assertEqual(uresolver.resolve('http://a/b/./c/../d/e', 'g'), 'http://a/b/d/g')
+
+    def test_relativeBase(self):
+        with self.assertRaises(ValueError):
+            uresolver.Resolver('/b/c')
+
+    def test_getAbsoluteURI(self):
+        uriHandler = uhandler.UriHandler()
+        self.assertEqual(uriHandler.getAbsoluteURI('../g?y', BASE), 'http://a/b/g?y')
@@ -0,0 +1,72 @@
+__author__ = 'aliaksandr'
+
+import random
+import unittest
+from collections import Counter
+
+from src.batchParser import parseMany
+from src.uriStats import CountMinSketch, SpaceSaving, UriStats
+
+
+def makeStream(count, seed=3):
+    rnd = random.Random(seed)
+    hosts = ['host%d.com' % int(rnd.paretovariate(1.2)) for _ in range(count)]
+    uris = ['http://%s/page/%d?id=%d&k%d=1' % (host, rnd.randint(0, 10 ** 6), index, index % 4)
+            for index, host in enumerate(hosts)]
+    return hosts, uris
+
+
+class TestUriStats(unittest.TestCase):
+    def test_spaceSavingBounds(self):
+        hosts, _ = makeStream(20000)
+        exact = Counter(hosts)
+        summary = SpaceSaving(40)
+        summary.updateMany(hosts[:10000])
+        for host in hosts[10000:]:
+            summary.update(host)
+        self.assertEqual(len(summary), 40)
+        self.assertEqual(summary.total, len(hosts))
+        for host, count, error in summary.topK(40):
+            self.assertTrue(count - error <= exact[host] <= count, host)
+        # every item above total / capacity is kept
+        for host, count in exact.items():
+            if count > summary.errorBound():
+                self.assertGreater(summary.estimate(host)[0], 0)
+        self.assertEqual([host for host, _, _ in summary.topK(3)], [host for host, _ in exact.most_common(3)])
+
+    def test_countMinSketch(self):
+        hosts, _ = makeStream(20000)
+        exact = Counter(hosts)
+        sketch = CountMinSketch.fromError(0.001, 0.01)
+        sketch.updateMany(hosts)
+        estimates = sketch.estimateMany(list(exact)).tolist()
+        for (host, count), estimate in zip(exact.items(), estimates):
+            self.assertTrue(count <= estimate <= count + sketch.errorBound(), host)
+        self.assertEqual(sketch.estimate('missing.com') <= sketch.errorBound(), True)
+
+    def test_uriStats(self):
+        hosts, uris = makeStream(5000)
+        stats = UriStats(100, sketch=(1024, 4))
+        stats.addMany(uris)
+        self.assertEqual(stats.total, len(uris))
+        self.assertEqual(stats.topK('host', 1)[0][:2], Counter(hosts).most_common(1)[0])
+        self.assertEqual(stats.topK('queryKey', 1)[0][:2], ('id', len(uris)))
+        self.assertEqual(stats.estimate('host', 'host1.com'), Counter(hosts)['host1.com'])
+        with self.assertRaises(ValueError):
+            UriStats(components=('userinfo', 'unknown'))
+
+    def test_mergeAndSnapshot(self):
+        hosts, uris = makeStream(6000)
+        workers = [UriStats(50, sketch=(512, 3)) for _ in range(3)]
+        for index, worker in enumerate(workers):
+            worker.addMany(parseMany(uris[index::3]))
+        merged = UriStats.fromBytes(workers[0].toBytes())
+        for worker in workers[1:]:
+            merged.merge(UriStats.fromBytes(worker.toBytes()))
+        exact = Counter(hosts)
+        self.assertEqual(merged.total, len(uris))
+        for host, count, error in merged.topK('host', 5):
+            self.assertTrue(count - error <= exact[host] <= count)
+        self.assertEqual(merged.estimate('host', 'host1.com') >= exact['host1.com'], True)
+        with self.assertRaises(ValueError):
+            UriStats.fromBytes(b'not a snapshot')